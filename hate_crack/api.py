@@ -35,6 +35,10 @@ HASHVIEW_DEFAULT_TIMEOUT = 30
 # before it sends the first response byte.
 HASHVIEW_UPLOAD_TIMEOUT = 300
 HASHVIEW_CRACKED_BATCH_SIZE = 10_000
+# Lines Hashview is likely to reject (a $HEX[...] token sent verbatim because
+# its bytes hold a CR/LF) go up in their own batches of at most this many, so
+# a rejection bisects a small batch instead of re-sending a 10k-line one.
+HASHVIEW_SUSPECT_BATCH_SIZE = 256
 
 
 class _RateLimiter:
@@ -1920,8 +1924,89 @@ class HashviewAPI:
             "combined_file": combined_file,
         }
 
+    def _post_cracked_lines(self, url, headers, lines):
+        """POST one batch of ``hash:plain`` lines and return the decoded JSON."""
+        resp = self.session.post(
+            url,
+            data=b"\n".join(lines),
+            headers=headers,
+            timeout=HASHVIEW_UPLOAD_TIMEOUT,
+        )
+        resp.raise_for_status()
+        try:
+            return resp.json()
+        except (json.JSONDecodeError, ValueError):
+            raise Exception(f"Invalid API response: {resp.text[:200]}")
+
+    def _upload_cracked_bisecting(
+        self, url, headers, lines, keys, label, on_accept, rejected, passthrough
+    ):
+        """Upload ``lines``, bisecting around the ones Hashview rejects.
+
+        A single line Hashview rejects rolls back its whole batch, and the
+        error names that one hash. Dropping it and re-sending the rest costs a
+        full re-upload per bad line -- quadratic when a batch holds many. So
+        the named line is dropped and the remainder is split in half, each
+        half uploaded on its own: a half with no bad line goes up in one
+        request, and k bad lines cost O(k log n) small requests rather than k
+        re-sends of the whole batch. A rejection naming a hash that is not in
+        the batch splits it all the same, down to a single line that is then
+        counted as rejected, so the loop always terminates.
+
+        ``on_accept`` receives each accepted response. With ``passthrough``
+        set, a non-dict response to the first request is returned to the
+        caller as-is (the legacy single-request contract); anywhere else it is
+        an error. Returns None otherwise.
+        """
+        pending = [(list(lines), list(keys))]
+        first = True
+        while pending:
+            line_batch, key_batch = pending.pop()
+            if not line_batch:
+                continue
+            json_response = self._post_cracked_lines(url, headers, line_batch)
+            if not isinstance(json_response, dict):
+                if first and passthrough:
+                    append_to_cache(key_batch)
+                    return json_response
+                raise Exception(
+                    f"Hashview API returned a non-object response for "
+                    f"{label}: {json_response!r}"
+                )
+            first = False
+            if json_response.get("type") == "Error":
+                rejected_hash = _extract_rejected_hash(json_response.get("msg", ""))
+                if rejected_hash is None:
+                    raise Exception(
+                        f"Hashview API Error: "
+                        f"{json_response.get('msg', 'Unknown error')}"
+                    )
+                kept_lines, kept_keys = [], []
+                for line, key in zip(line_batch, key_batch):
+                    line_hash = line.split(b":", 1)[0].decode("ascii", "ignore")
+                    if line_hash.lower() == rejected_hash.lower():
+                        rejected.append(line_hash)
+                        continue
+                    kept_lines.append(line)
+                    kept_keys.append(key)
+                if len(kept_lines) == len(line_batch) and len(line_batch) == 1:
+                    rejected.append(
+                        line_batch[0].split(b":", 1)[0].decode("ascii", "ignore")
+                    )
+                    continue
+                mid = (len(kept_lines) + 1) // 2
+                # Pushed second-half first so the first half is sent first.
+                pending.append((kept_lines[mid:], kept_keys[mid:]))
+                pending.append((kept_lines[:mid], kept_keys[:mid]))
+                continue
+            append_to_cache(key_batch)
+            on_accept(json_response)
+        return None
+
     def upload_cracked_hashes(self, file_path, hash_type="1000", *, validate=True):
         valid_lines = []
+        suspect_lines = []
+        suspect_keys = []
         skipped = []
         skipped_cached = 0
         new_keys = []
@@ -1958,12 +2043,16 @@ class HashviewAPI:
                     if not ok:
                         skipped.append((lineno, hash_value, reason))
                         continue
-                valid_lines.append(
-                    hash_value.encode("ascii", "ignore")
-                    + b":"
-                    + _wire_field_bytes(hash_type, plaintext)
-                )
-                new_keys.append(key)
+                wire_field = _wire_field_bytes(hash_type, plaintext)
+                line = hash_value.encode("ascii", "ignore") + b":" + wire_field
+                if wire_field.startswith(b"$HEX["):
+                    # Not inlined, so it only imports on a Hashview that
+                    # decodes $HEX[...] itself; an older one rejects it.
+                    suspect_lines.append(line)
+                    suspect_keys.append(key)
+                else:
+                    valid_lines.append(line)
+                    new_keys.append(key)
 
         if skipped_cached:
             print(f"↷ Skipped {skipped_cached} hash(es) already uploaded previously")
@@ -1978,7 +2067,7 @@ class HashviewAPI:
             if len(skipped) > 10:
                 print(f"    ... and {len(skipped) - 10} more")
 
-        if not valid_lines:
+        if not valid_lines and not suspect_lines:
             if skipped_cached:
                 # At least one line was already-uploaded-and-cached, so this
                 # is not "nothing valid" -- it's "nothing left to upload
@@ -2011,77 +2100,62 @@ class HashviewAPI:
         summable_fields = ("verified", "updated", "count")
         list_fields = ("unmatched",)
         rejected_by_server = []
+
+        def merge(json_response):
+            for field in summable_fields:
+                if isinstance(json_response.get(field), (int, float)):
+                    aggregated[field] = aggregated.get(field, 0) + json_response[field]
+            for field in list_fields:
+                if isinstance(json_response.get(field), list):
+                    aggregated.setdefault(field, [])
+                    aggregated[field].extend(json_response[field])
+            for key, value in json_response.items():
+                if key not in summable_fields and key not in list_fields:
+                    aggregated.setdefault(key, value)
+
+        # The likely rejections go first, in small batches of their own, so
+        # the bisection they usually trigger never touches a full-size batch.
+        if suspect_lines:
+            print(
+                f"Uploading {len(suspect_lines)} $HEX[...] plaintext(s) "
+                "separately (a Hashview that does not decode $HEX[...] "
+                "rejects them)..."
+            )
+        for i in range(0, len(suspect_lines), HASHVIEW_SUSPECT_BATCH_SIZE):
+            self._upload_cracked_bisecting(
+                url,
+                headers,
+                suspect_lines[i : i + HASHVIEW_SUSPECT_BATCH_SIZE],
+                suspect_keys[i : i + HASHVIEW_SUSPECT_BATCH_SIZE],
+                "the $HEX[...] batch",
+                merge,
+                rejected_by_server,
+                passthrough=False,
+            )
+
         for batch_num, (line_batch, key_batch) in enumerate(
             zip(batches, key_batches), start=1
         ):
-            line_batch = list(line_batch)
-            key_batch = list(key_batch)
             if len(batches) > 1:
                 print(
                     f"Uploading batch {batch_num}/{len(batches)} "
                     f"({len(line_batch)} hashes)..."
                 )
-            # A single line Hashview rejects rolls back its whole batch. Retry
-            # with that one line dropped rather than losing every hash in the
-            # batch to it -- bounded by the batch size so a server that keeps
-            # rejecting can't loop forever.
-            for _attempt in range(len(line_batch) + 1):
-                if not line_batch:
-                    break
-                converted_content = b"\n".join(line_batch)
-                resp = self.session.post(
-                    url,
-                    data=converted_content,
-                    headers=headers,
-                    timeout=HASHVIEW_UPLOAD_TIMEOUT,
-                )
-                resp.raise_for_status()
-                try:
-                    json_response = resp.json()
-                except (json.JSONDecodeError, ValueError):
-                    raise Exception(f"Invalid API response: {resp.text[:200]}")
-                if not isinstance(json_response, dict):
-                    if len(batches) == 1:
-                        # Matches today's single-request behavior: a non-dict
-                        # response (rare, but Hashview's contract doesn't
-                        # forbid it) is returned as-is rather than merged.
-                        append_to_cache(key_batch)
-                        return json_response
-                    raise Exception(
-                        f"Hashview API returned a non-object response for "
-                        f"batch {batch_num}/{len(batches)}: {json_response!r}"
-                    )
-                if json_response.get("type") == "Error":
-                    rejected_hash = _extract_rejected_hash(json_response.get("msg", ""))
-                    if rejected_hash is not None:
-                        kept_lines, kept_keys = [], []
-                        for line, key in zip(line_batch, key_batch):
-                            line_hash = line.split(b":", 1)[0].decode("ascii", "ignore")
-                            if line_hash.lower() == rejected_hash.lower():
-                                rejected_by_server.append(line_hash)
-                                continue
-                            kept_lines.append(line)
-                            kept_keys.append(key)
-                        line_batch, key_batch = kept_lines, kept_keys
-                        continue
-                    raise Exception(
-                        f"Hashview API Error: "
-                        f"{json_response.get('msg', 'Unknown error')}"
-                    )
-                append_to_cache(key_batch)
-                for field in summable_fields:
-                    if isinstance(json_response.get(field), (int, float)):
-                        aggregated[field] = (
-                            aggregated.get(field, 0) + json_response[field]
-                        )
-                for field in list_fields:
-                    if isinstance(json_response.get(field), list):
-                        aggregated.setdefault(field, [])
-                        aggregated[field].extend(json_response[field])
-                for key, value in json_response.items():
-                    if key not in summable_fields and key not in list_fields:
-                        aggregated.setdefault(key, value)
-                break
+            passthrough_response = self._upload_cracked_bisecting(
+                url,
+                headers,
+                line_batch,
+                key_batch,
+                f"batch {batch_num}/{len(batches)}",
+                merge,
+                rejected_by_server,
+                # Matches today's single-request behavior: a non-dict
+                # response (rare, but Hashview's contract doesn't forbid it)
+                # is returned as-is rather than merged.
+                passthrough=len(batches) == 1 and not suspect_lines,
+            )
+            if passthrough_response is not None:
+                return passthrough_response
 
         if rejected_by_server:
             print(
@@ -2094,7 +2168,10 @@ class HashviewAPI:
             if len(rejected_by_server) > 10:
                 print(f"    ... and {len(rejected_by_server) - 10} more")
 
-        aggregated.setdefault("uploaded", len(valid_lines) - len(rejected_by_server))
+        aggregated.setdefault(
+            "uploaded",
+            len(valid_lines) + len(suspect_lines) - len(rejected_by_server),
+        )
         aggregated["skipped"] = len(skipped) + len(rejected_by_server)
         aggregated["skipped_cached"] = skipped_cached
         return aggregated
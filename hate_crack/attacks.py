@@ -33,6 +33,24 @@ def _configure_readline(completer):
     readline.set_completer(completer)
 
 
+def _format_line_count(count: int) -> str:
+    for divisor, suffix in ((1_000_000_000, "B"), (1_000_000, "M"), (1_000, "K")):
+        if count >= divisor:
+            return f"{count / divisor:.1f}{suffix}"
+    return str(count)
+
+
+def _wordlist_entry_label(i: int, entry: Any) -> str:
+    """Picker label for a wordlist entry: ``3) name/`` for a directory, and
+    the catalogued line count, when there is one, after a file name."""
+    if entry.is_dir:
+        return f"{i}) {entry.name}/"
+    lines = getattr(entry, "lines", None)
+    if lines is None:
+        return f"{i}) {entry.name}"
+    return f"{i}) {entry.name} ({_format_line_count(lines)})"
+
+
 def _select_rules(ctx) -> list[str] | None:
     """Prompt user to select rules. Returns list of rule chain strings, or None if cancelled."""
     rule_choice = None
@@ -139,7 +157,7 @@ def quick_crack(ctx: Any) -> None:
     # pads on visible width; putting an escape sequence in the string here
     # would break its ljust() and its truncation.
     wordlist_entries = [
-        f"{i}) {entry.name}/" if entry.is_dir else f"{i}) {entry.name}"
+        _wordlist_entry_label(i, entry)
         for i, entry in enumerate(wordlist_entries_meta, start=1)
     ]
     entry_styles = [
@@ -1131,7 +1149,7 @@ def _pick_training_wordlist(ctx: Any, title: str = "Training Wordlists"):
     # buries the error message.
     if entries_meta:
         entries = [
-            f"{i}) {entry.name}/" if entry.is_dir else f"{i}) {entry.name}"
+            _wordlist_entry_label(i, entry)
             for i, entry in enumerate(entries_meta, start=1)
         ]
         entry_styles = ["\033[36m" if entry.is_dir else None for entry in entries_meta]
@@ -1248,7 +1266,7 @@ def _markov_pick_training_source(ctx: Any):
         entries.append("0) Cracked passwords (current session)")
         entry_styles.append(None)
     entries.extend(
-        f"{i}) {entry.name}/" if entry.is_dir else f"{i}) {entry.name}"
+        _wordlist_entry_label(i, entry)
         for i, entry in enumerate(entries_meta, start=1)
     )
     entry_styles.extend("\033[36m" if entry.is_dir else None for entry in entries_meta)
@@ -1544,7 +1562,7 @@ def generate_rules_crack(ctx: Any) -> None:
 
     entries_meta = ctx.list_wordlist_entries(ctx.hcatWordlists)
     wordlist_entries = [
-        f"{i}) {entry.name}/" if entry.is_dir else f"{i}) {entry.name}"
+        _wordlist_entry_label(i, entry)
         for i, entry in enumerate(entries_meta, start=1)
     ]
     entry_styles = ["\033[36m" if entry.is_dir else None for entry in entries_meta]
@@ -1842,6 +1860,30 @@ def rule_cleanup_and_optimize_handler(ctx: Any) -> None:
             os.unlink(tmp_path)
 
 
+def rule_dedupe_handler(ctx: Any) -> None:
+    """Write a rule file with every functionally duplicate rule removed."""
+    print("\nDeduplicate rule file - removes rules that try the same candidates.")
+    print("Keeps the first of, e.g., ':$1', '$1' and '$1 :', in file order.\n")
+    infile = _rule_select_file(ctx, "Input rule file: ")
+    if not infile or not os.path.isfile(infile):
+        print(f"[!] File not found: {infile}")
+        return
+    outfile = ctx.select_file_with_autocomplete(
+        "Output file path (tab to autocomplete)"
+    )
+    outfile = outfile.strip() if outfile else ""
+    if not outfile:
+        print("[!] Output path required.")
+        return
+    print(f"\nDeduplicating {infile} -> {outfile}")
+    result = ctx.rules_dedupe(infile, outfile)
+    if result is None:
+        print("[!] Deduplication failed.")
+        return
+    kept, dropped = result
+    print(f"[+] Done. Kept {kept} rules, dropped {dropped} duplicates.")
+
+
 def rule_tools_submenu(ctx: Any) -> None:
     from hate_crack.menu import interactive_menu
 
@@ -1851,6 +1893,7 @@ def rule_tools_submenu(ctx: Any) -> None:
         ("3", "Clean and optimize rule file (both)"),
         ("4", "Download rules from Hashmob.net"),
         ("5", "Analyze Hashcat rules (opcode statistics)"),
+        ("6", "Deduplicate rule file (remove functionally equivalent rules)"),
         ("99", "Back to Main Menu"),
     ]
     while True:
@@ -1867,6 +1910,8 @@ def rule_tools_submenu(ctx: Any) -> None:
             download_hashmob_rules(print_fn=print, rules_dir=ctx.rulesDirectory)
         elif choice == "5":
             ctx.analyze_rules()
+        elif choice == "6":
+            rule_dedupe_handler(ctx)
 
 
 def wordlist_filter_length(ctx: Any) -> None:
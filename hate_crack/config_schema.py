@@ -388,6 +388,23 @@ CONFIG_SCHEMA: tuple[ConfigKey, ...] = (
     ConfigKey("RESTORE_POTFILE_ON_START", "restore_potfile_on_start", "bool", False),
     ConfigKey("RULE_DEBUG_MODE_ENABLED", "rule_debug_mode_enabled", "bool", True),
     ConfigKey("COVERAGE_ENABLED", "coverage_enabled", "bool", True),
+    # Off by default: the first lookup against a large shared potfile is a
+    # one-off full read into ~/.hate_crack/potfile_index, which an operator
+    # should opt into rather than discover.
+    ConfigKey("POTFILE_INDEX_ENABLED", "potfile_index_enabled", "bool", False),
+    # Off by default: sketch counting only differs once a corpus overflows
+    # rulegen.MAX_UNIQUE_KEYS, and then it trades exact surviving counts for
+    # bounded error, which is the operator's call.
+    ConfigKey("SPOONMAN_HEAVY_HITTERS", "spoonman_heavy_hitters", "bool", False),
+    # Empty by default: a sampled fingerprint cannot see an edit that keeps
+    # the size and misses every sampled block, so only directories the
+    # operator knows are read-only belong here.
+    ConfigKey(
+        "COVERAGE_SAMPLED_FINGERPRINT_DIRS",
+        "coverage_sampled_fingerprint_dirs",
+        "csv_list",
+        [],
+    ),
 )
 
 BY_ENV: dict[str, ConfigKey] = {entry.env: entry for entry in CONFIG_SCHEMA}
@@ -0,0 +1,163 @@
+"""Persistent cache of the corpus profiles the LLM modes put in their prompts.
+
+Every LLM attack describes its corpus through ``main._corpus_context``: a
+:func:`hate_crack.corpus_stats.summarize` pass over the whole file (or an even
+sample of it), and for a small corpus two more passes to collect the literal
+plaintexts. Run the Wordlist mode against rockyou twice and the second run
+repeats all of that to arrive at the same answer.
+
+This cache keeps the answer. A profile is stored under the corpus's *content*
+sha256 -- the digest coverage's ``wordlist_fingerprint`` already memoizes on
+``(size, mtime)`` -- together with the two caps that shape it:
+``hcatCorpusProfileMaxLines`` for the statistics and ``ollamaMaxSampleLines``
+for the literal sample. A renamed or copied wordlist
+therefore hits, and an edited one misses. Entries also carry
+:data:`PROFILE_VERSION`, so a change to what ``summarize`` reports or how
+``format_summary`` renders it retires every older profile at once instead of
+serving it.
+
+Like the wordlist catalog beside it, a lookup never creates the database and
+every failure degrades to "not cached", which the caller handles by profiling
+the corpus itself.
+"""
+
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+PROFILE_DIRNAME = "corpus_profiles"
+DB_FILENAME = "corpus_profiles.sqlite3"
+
+# Bump whenever corpus_stats.summarize() or format_summary() changes what a
+# profile says, so profiles written by the old code are never served.
+PROFILE_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    sha256       TEXT NOT NULL,
+    max_lines    INTEGER NOT NULL,
+    sample_lines INTEGER NOT NULL,
+    version      INTEGER NOT NULL,
+    -- JSON: the summarize() result dict, and the context dict built from it.
+    stats        TEXT NOT NULL,
+    context      TEXT NOT NULL,
+    created_at   TEXT NOT NULL,
+    PRIMARY KEY (sha256, max_lines, sample_lines, version)
+) WITHOUT ROWID;
+"""
+
+
+def _cache_dir() -> Path:
+    # Beside the coverage store, as attack_coverage._coverage_dir() builds it.
+    return Path(os.path.expanduser("~")) / ".hate_crack" / PROFILE_DIRNAME
+
+
+class CorpusProfileCache:
+    """SQLite-backed store of ``(stats, context)`` pairs.
+
+    Every method swallows :class:`sqlite3.Error` and degrades to "not
+    cached", as :class:`hate_crack.wordlist_catalog.WordlistCatalog` does.
+    """
+
+    def __init__(self, path: Path | str | None = None):
+        self._path = Path(path) if path is not None else _cache_dir() / DB_FILENAME
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self, create: bool = True) -> sqlite3.Connection | None:
+        if self._conn is not None:
+            return self._conn
+        if not create and not self._path.exists():
+            return None
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self._path), timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            conn.commit()
+        except (sqlite3.Error, OSError):
+            return None
+        self._conn = conn
+        return conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+    def lookup(
+        self, sha256: str, max_lines: int, sample_lines: int
+    ) -> tuple[dict, dict] | None:
+        """The cached ``(stats, context)`` for this corpus and these caps, or None."""
+        conn = self._connect(create=False)
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT stats, context FROM profiles WHERE sha256 = ? "
+                "AND max_lines = ? AND sample_lines = ? AND version = ?",
+                (sha256, max_lines, sample_lines, PROFILE_VERSION),
+            ).fetchone()
+            if row is None:
+                return None
+            stats, context = json.loads(row[0]), json.loads(row[1])
+        except (sqlite3.Error, ValueError):
+            return None
+        if not isinstance(stats, dict) or not isinstance(context, dict):
+            return None
+        return stats, context
+
+    def record(
+        self,
+        sha256: str,
+        max_lines: int,
+        sample_lines: int,
+        stats: dict,
+        context: dict,
+    ) -> bool:
+        conn = self._connect()
+        if conn is None:
+            return False
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO profiles "
+                "(sha256, max_lines, sample_lines, version, stats, context, "
+                "created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    sha256,
+                    max_lines,
+                    sample_lines,
+                    PROFILE_VERSION,
+                    json.dumps(stats),
+                    json.dumps(context),
+                    datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                ),
+            )
+            conn.commit()
+        except (sqlite3.Error, TypeError, ValueError):
+            return False
+        return True
+
+
+_default_cache: CorpusProfileCache | None = None
+
+
+def get_cache() -> CorpusProfileCache:
+    """The process-wide cache. Created lazily so importing costs no I/O."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = CorpusProfileCache()
+    return _default_cache
+
+
+def reset_cache() -> None:
+    """Drop the process-wide cache (used by tests)."""
+    global _default_cache
+    if _default_cache is not None:
+        _default_cache.close()
+    _default_cache = None
@@ -10,14 +10,18 @@ This module summarizes the entire file instead — one pass, bounded output —
 the prompt carries full-corpus facts at roughly the token cost of the sample it
 replaces. The heavy lifting is deliberately reused rather than reinvented:
 baseword extraction is :func:`hate_crack.rulegen.derive`, the same function the
-Spoonman attack derives its baseword list with.
+Spoonman attack derives its baseword list with, and a large file is split into
+byte ranges across a process pool the same way ``rulegen.generate`` splits it.
 
 Nothing here contacts the model or the network; it is pure aggregation, which
 keeps it cheap to test.
 """
 
+import hashlib
+import math
 import os
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
 from hate_crack import rulegen
 from hate_crack.plaintext import (
@@ -71,6 +75,28 @@ _ESTIMATE_BYTES = 4 * 1024 * 1024
 # path.
 PROGRESS_INTERVAL = 100_000
 
+# Smallest share of the work worth handing to its own worker process: a byte
+# range of the file when reading all of it, a number of lines when sampling.
+# Below these the pool's startup and the pickled Counters coming back cost
+# more than the aggregation saves, so a small corpus is read in-process.
+_MIN_SHARD_BYTES = 16 * 1024 * 1024
+_MIN_SHARD_LINES = 250_000
+
+# The distinct-password count is exact up to this many passwords and a
+# HyperLogLog estimate beyond it (see _DistinctCounter). The exact set is the
+# one structure here that grows with every new password rather than with
+# every new baseword or mask, so this is what bounds its memory: a few
+# megabytes of short strings at most.
+_EXACT_DISTINCT_LIMIT = 1 << 16
+
+# 2**14 one-byte HyperLogLog registers: 16 KiB however large the corpus, for a
+# standard error of 1.04 / sqrt(2**14), about 0.8%.
+_HLL_PRECISION = 14
+
+# Each worker gets several ranges rather than one, so progress can be reported
+# as ranges complete instead of only once at the very end.
+_SHARDS_PER_WORKER = 4
+
 
 def _is_ascii_digit(c):
     """Return True iff *c* is an ASCII decimal digit, ``0``-``9``.
@@ -157,6 +183,84 @@ def _years(pw):
             yield chunk
 
 
+class _DistinctCounter:
+    """Count distinct passwords: exactly while few, by HyperLogLog once many.
+
+    An exact set of every password was the main memory cost of an uncapped
+    profile -- it grows with the corpus's cardinality, not with the top-N
+    lists that actually reach the prompt. Up to :data:`_EXACT_DISTINCT_LIMIT`
+    passwords the set is the whole story and the count is exact, so a small
+    corpus reports what it always did. Past that it becomes a buffer that is
+    folded into a HyperLogLog sketch of ``2 ** _HLL_PRECISION`` registers each
+    time it fills, and :meth:`count` becomes an estimate with a standard error
+    of about 0.8%. Buffering means a password repeated within a fill is hashed
+    once, and keeps the hashing out of the per-line loop.
+
+    Passwords are hashed with BLAKE2b rather than ``hash()``, whose per-process
+    salt would make sketches from different workers unmergeable.
+    """
+
+    __slots__ = ("exact", "registers")
+
+    def __init__(self):
+        self.exact = set()
+        self.registers = None
+
+    @property
+    def estimated(self):
+        return self.registers is not None
+
+    def add(self, pw):
+        exact = self.exact
+        exact.add(pw)
+        if len(exact) > _EXACT_DISTINCT_LIMIT:
+            self._flush()
+
+    def _flush(self):
+        """Fold the buffered passwords into the sketch, creating it if need be."""
+        if self.registers is None:
+            self.registers = bytearray(1 << _HLL_PRECISION)
+        registers = self.registers
+        bits = 64 - _HLL_PRECISION
+        low = (1 << bits) - 1
+        blake2b = hashlib.blake2b
+        for pw in self.exact:
+            x = int.from_bytes(
+                blake2b(pw.encode("utf-8", "surrogatepass"), digest_size=8).digest(),
+                "big",
+            )
+            # Position of the leftmost 1 in the low bits, counting from 1.
+            rank = bits - (x & low).bit_length() + 1
+            index = x >> bits
+            if rank > registers[index]:
+                registers[index] = rank
+        self.exact = set()
+
+    def merge(self, other):
+        """Fold *other* in; the result counts the union of both inputs."""
+        self.exact |= other.exact
+        if other.registers is not None:
+            self._flush()
+            self.registers = bytearray(map(max, self.registers, other.registers))
+        elif self.registers is not None or len(self.exact) > _EXACT_DISTINCT_LIMIT:
+            self._flush()
+
+    def count(self):
+        """The number of distinct passwords added, estimated once sketched."""
+        if self.registers is None:
+            return len(self.exact)
+        self._flush()
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0**-r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction: linear counting on the empty registers.
+            estimate = m * math.log(m / zeros)
+        # A 64-bit hash needs no large-range correction at any corpus size.
+        return round(estimate)
+
+
 def _estimate_line_count(path, size):
     """Estimate the number of lines in *path* from its first few megabytes.
 
@@ -186,9 +290,13 @@ def _iter_lines(path):
         yield from fh
 
 
-def _iter_sampled_lines(path, size, cap):
+def _iter_sampled_lines(path, size, cap, first=0, last=None):
     """Yield at most *cap* lines drawn evenly from across *path*.
 
+    *first* and *last* restrict the read to anchors ``[first, last)`` of the
+    full set, so the anchors can be split across workers without moving any
+    of them: the union of the parts is exactly the whole sample.
+
     Opened in binary mode and decoded per line: seeking to an arbitrary byte
     offset is well defined on a binary file and not on a TextIOWrapper, whose
     seek() contract accepts only cookies returned by its own tell(). latin-1
@@ -197,9 +305,9 @@ def _iter_sampled_lines(path, size, cap):
     """
     anchors = max(1, min(SAMPLE_ANCHORS, cap))
     per_anchor = max(1, cap // anchors)
-    yielded = 0
+    yielded = first * per_anchor
     with open(path, "rb") as fh:
-        for i in range(anchors):
+        for i in range(first, anchors if last is None else last):
             if yielded >= cap:
                 return
             fh.seek((size * i) // anchors)
@@ -216,56 +324,47 @@ def _iter_sampled_lines(path, size, cap):
                     return
 
 
-def summarize(path, progress=None, max_lines=None):
-    """Aggregate every password in *path* into a bounded stats dict.
+def _new_tally():
+    """Empty aggregates for :func:`_tally`; see there for what each holds."""
+    return {
+        "basewords": Counter(),
+        "masks": Counter(),
+        "lengths": Counter(),
+        "shapes": Counter(),
+        "digit_suffixes": Counter(),
+        "special_suffixes": Counter(),
+        "specials": Counter(),
+        "years": Counter(),
+        "unique": _DistinctCounter(),
+        "total": 0,
+        "mask_total": 0,
+        "mask_excluded_non_ascii": 0,
+        "hash_shaped": 0,
+        "lines_read": 0,
+    }
 
-    Reads the file once. Raises OSError if it cannot be read and ValueError if
-    it holds no usable passwords, matching how rulegen.generate reports an
-    empty corpus.
 
-    *progress*, when given, is called with the number of lines read so far —
-    every :data:`PROGRESS_INTERVAL` lines and once more at the end with the
-    true total, so the last figure a caller paints matches the file. Lines
-    read, not passwords kept: the time goes into reading, and a corpus that is
-    mostly unusable lines would otherwise appear stalled.
+def _tally(lines, progress=None):
+    """Aggregate every password in *lines* into a fresh :func:`_new_tally`.
 
-    *max_lines*, when given and positive, bounds the pass: a corpus estimated
-    to hold more than that many lines is sampled evenly across its whole byte
-    range rather than read end to end, and the returned dict carries
-    ``sampled=True`` with an ``estimated_total``. This is not a refinement —
-    the loop below runs at roughly 135k lines/s, so an uncapped pass over a
-    multi-billion-line corpus takes hours and grows ``unique`` without bound
-    until it exhausts memory. Sampling evenly rather than truncating keeps the
-    statistics representative: large wordlists are ordered, so a head slice
-    describes the ordering instead of the corpus.
+    *progress* is called every :data:`PROGRESS_INTERVAL` lines read.
     """
-    if is_gzipped(path):
-        raise ValueError(
-            f"{path} is gzip-compressed; decompress it before calling summarize()"
-        )
-
-    basewords = Counter()
-    masks = Counter()
-    lengths = Counter()
-    shapes = Counter()
-    digit_suffixes = Counter()
-    special_suffixes = Counter()
-    specials = Counter()
-    years = Counter()
+    tally = _new_tally()
+    basewords = tally["basewords"]
+    masks = tally["masks"]
+    lengths = tally["lengths"]
+    shapes = tally["shapes"]
+    digit_suffixes = tally["digit_suffixes"]
+    special_suffixes = tally["special_suffixes"]
+    specials = tally["specials"]
+    years = tally["years"]
+    unique = tally["unique"]
     total = 0
     mask_total = 0
     mask_excluded_non_ascii = 0
     hash_shaped = 0
-    unique = set()
-
     lines_read = 0
 
-    cap = max_lines if max_lines and max_lines > 0 else None
-    size = os.path.getsize(path)
-    estimated_total = _estimate_line_count(path, size) if cap else None
-    sampled = cap is not None and estimated_total > cap
-    lines = _iter_sampled_lines(path, size, cap) if sampled else _iter_lines(path)
-
     for raw in lines:
         lines_read += 1
         if progress is not None and lines_read % PROGRESS_INTERVAL == 0:
@@ -309,10 +408,142 @@ def summarize(path, progress=None, max_lines=None):
         for year in _years(pw):
             years[year] += 1
 
+    tally.update(
+        total=total,
+        mask_total=mask_total,
+        mask_excluded_non_ascii=mask_excluded_non_ascii,
+        hash_shaped=hash_shaped,
+        lines_read=lines_read,
+    )
+    return tally
+
+
+def _merge_tally(into, other):
+    """Fold *other* into *into*, which must come first in file order.
+
+    ``Counter.update`` keeps first-seen key order and ``most_common`` breaks
+    ties by it, so merging in file order ranks exactly as one pass would.
+    """
+    for key, value in other.items():
+        if isinstance(value, Counter):
+            into[key].update(value)
+        elif isinstance(value, _DistinctCounter):
+            into[key].merge(value)
+        else:
+            into[key] += value
+
+
+def _tally_range(task):
+    """Pool entry point: aggregate the lines of one byte range of a file."""
+    path, start, end = task
+    with rulegen.corpus_lines(path, start, end) as lines:
+        return _tally(lines)
+
+
+def _tally_anchors(task):
+    """Pool entry point: aggregate one slice of the sample's anchors."""
+    path, size, cap, first, last = task
+    return _tally(_iter_sampled_lines(path, size, cap, first, last))
+
+
+def _tally_parallel(worker, tasks, workers, progress):
+    """Run *worker* over *tasks* across a pool, merging results in order."""
+    tally = _new_tally()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(worker, tasks):
+            _merge_tally(tally, part)
+            if progress is not None:
+                progress(tally["lines_read"])
+    return tally
+
+
+def summarize(path, progress=None, max_lines=None, line_count=None, workers=None):
+    """Aggregate every password in *path* into a bounded stats dict.
+
+    Reads the file once. Raises OSError if it cannot be read and ValueError if
+    it holds no usable passwords, matching how rulegen.generate reports an
+    empty corpus.
+
+    *progress*, when given, is called with the number of lines read so far —
+    every :data:`PROGRESS_INTERVAL` lines and once more at the end with the
+    true total, so the last figure a caller paints matches the file. Lines
+    read, not passwords kept: the time goes into reading, and a corpus that is
+    mostly unusable lines would otherwise appear stalled.
+
+    *max_lines*, when given and positive, bounds the pass: a corpus estimated
+    to hold more than that many lines is sampled evenly across its whole byte
+    range rather than read end to end, and the returned dict carries
+    ``sampled=True`` with an ``estimated_total``. This is not a refinement —
+    the loop below runs at roughly 135k lines/s, so an uncapped pass over a
+    multi-billion-line corpus takes hours. Sampling evenly rather than
+    truncating keeps the statistics representative: large wordlists are
+    ordered, so a head slice describes the ordering instead of the corpus.
+
+    ``unique`` is exact up to :data:`_EXACT_DISTINCT_LIMIT` distinct passwords
+    and a HyperLogLog estimate (about 0.8% standard error) beyond it, flagged
+    by ``unique_estimated``, so memory no longer grows with the corpus's
+    cardinality.
+
+    *line_count*, when the caller already knows it exactly (from
+    :mod:`hate_crack.wordlist_catalog`), replaces that estimate.
+
+    *workers* spreads the pass over that many processes (default: one per
+    CPU), so a full profile of a billion-line corpus is a question of cores
+    rather than hours. A full read is split into newline-aligned byte ranges,
+    and a sampled one deals its anchors out in contiguous runs. Either way the
+    partial Counters are merged in file order, so the result is identical to
+    a single-process pass. Progress is then reported as each range completes
+    rather than every :data:`PROGRESS_INTERVAL` lines. A corpus too small to
+    be worth splitting, or ``workers=1``, is read in-process as before.
+    """
+    if is_gzipped(path):
+        raise ValueError(
+            f"{path} is gzip-compressed; decompress it before calling summarize()"
+        )
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    cap = max_lines if max_lines and max_lines > 0 else None
+    size = os.path.getsize(path)
+    if not cap:
+        estimated_total = None
+    elif line_count is not None:
+        estimated_total = line_count
+    else:
+        estimated_total = _estimate_line_count(path, size)
+    sampled = cap is not None and estimated_total > cap
+    if sampled:
+        anchors = max(1, min(SAMPLE_ANCHORS, cap))
+        shards = min(workers * _SHARDS_PER_WORKER, cap // _MIN_SHARD_LINES, anchors)
+    else:
+        shards = min(workers * _SHARDS_PER_WORKER, size // _MIN_SHARD_BYTES)
+    parallel = workers > 1 and shards > 1
+    if parallel:
+        if sampled:
+            bounds = [anchors * i // shards for i in range(shards + 1)]
+            tasks = [
+                (path, size, cap, first, last)
+                for first, last in zip(bounds, bounds[1:])
+            ]
+            tally = _tally_parallel(_tally_anchors, tasks, workers, progress)
+        else:
+            tasks = [
+                (path, start, end)
+                for start, end in rulegen.shard_ranges(path, shards)
+            ]
+            tally = _tally_parallel(_tally_range, tasks, workers, progress)
+    else:
+        lines = _iter_sampled_lines(path, size, cap) if sampled else _iter_lines(path)
+        tally = _tally(lines, progress)
+    lines_read = tally["lines_read"]
+    total = tally["total"]
+    basewords = tally["basewords"]
+
     # Final count before the empty-corpus check: a file that turned out to hold
     # no passwords was still read, and the caller's last painted figure should
-    # say how much.
-    if progress is not None and lines_read % PROGRESS_INTERVAL != 0:
+    # say how much. A parallel pass has already reported it with its last range.
+    if progress is not None and not parallel and lines_read % PROGRESS_INTERVAL:
         progress(lines_read)
 
     if total == 0:
@@ -333,22 +564,24 @@ def summarize(path, progress=None, max_lines=None):
         # None when uncapped: no estimate was taken, and reporting the scanned
         # count as an "estimate" would misrepresent an exact figure.
         "estimated_total": estimated_total if sampled else None,
-        "hash_shaped": hash_shaped,
-        "unique": len(unique),
+        "hash_shaped": tally["hash_shaped"],
+        # Exact on all but very large corpora; see _DistinctCounter.
+        "unique": tally["unique"].count(),
+        "unique_estimated": tally["unique"].estimated,
         "basewords": ranked_basewords,
         "baseword_total": len(basewords),
-        "masks": masks.most_common(TOP_MASKS),
+        "masks": tally["masks"].most_common(TOP_MASKS),
         # Mask shares are computed over the passwords a mask could describe,
         # not over the whole corpus: dividing by "total" would understate every
         # mask by the non-ASCII fraction.
-        "mask_total": mask_total,
-        "mask_excluded_non_ascii": mask_excluded_non_ascii,
-        "lengths": sorted(lengths.items()),
-        "shapes": shapes.most_common(),
-        "digit_suffixes": digit_suffixes.most_common(TOP_SUFFIXES),
-        "special_suffixes": special_suffixes.most_common(TOP_SPECIALS),
-        "specials": specials.most_common(TOP_SPECIALS),
-        "years": years.most_common(TOP_YEARS),
+        "mask_total": tally["mask_total"],
+        "mask_excluded_non_ascii": tally["mask_excluded_non_ascii"],
+        "lengths": sorted(tally["lengths"].items()),
+        "shapes": tally["shapes"].most_common(),
+        "digit_suffixes": tally["digit_suffixes"].most_common(TOP_SUFFIXES),
+        "special_suffixes": tally["special_suffixes"].most_common(TOP_SPECIALS),
+        "specials": tally["specials"].most_common(TOP_SPECIALS),
+        "years": tally["years"].most_common(TOP_YEARS),
     }
 
 
@@ -390,6 +623,9 @@ def format_summary(stats):
     inviting it to echo numbers back as password candidates.
     """
     total = stats["total"]
+    distinct = stats["unique"]
+    if stats.get("unique_estimated"):
+        distinct = f"~{distinct}"
     if stats.get("sampled"):
         # The uncapped header's "ENTIRE corpus" claim would be false here, and
         # the model has no way to detect that from the numbers. Coverage is
@@ -399,7 +635,7 @@ def format_summary(stats):
         estimated = stats.get("estimated_total") or total
         coverage = 100.0 * total / estimated if estimated else 100.0
         out = [
-            f"Corpus: {total} passwords ({stats['unique']} distinct, "
+            f"Corpus: {total} passwords ({distinct} distinct, "
             f"{stats['baseword_total']} distinct basewords), sampled evenly "
             f"from across a corpus of roughly {estimated:,} lines "
             f"({coverage:.2f}% coverage). The shares below are representative "
@@ -408,7 +644,7 @@ def format_summary(stats):
     else:
         out = [
             f"Corpus: {stats['total']} passwords "
-            f"({stats['unique']} distinct, {stats['baseword_total']} distinct "
+            f"({distinct} distinct, {stats['baseword_total']} distinct "
             "basewords). These figures cover the ENTIRE corpus, not a sample.\n"
         ]
 
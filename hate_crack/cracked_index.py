@@ -0,0 +1,254 @@
+"""Incremental index of the decoded plaintexts in a cracked-hash output file.
+
+Several attacks learn from what has already been cracked: Fingerprint expands
+it on every lap of its convergence loop, Smart Mask and Top Mask cluster it,
+Recycle feeds it back through the rule files, LM-to-NT combines it. Each of
+them used to re-extract the whole ``<hashfile>.out`` into ``.working`` -- read
+every line, split off the hash, decode ``$HEX[...]`` -- and on an engagement
+with hundreds of thousands of cracks that was the largest non-GPU cost between
+two hashcat launches, paid again on every lap.
+
+hashcat only ever *appends* to an ``-o`` file, so almost all of that work is a
+repeat. This index remembers the byte offset of the output file it has
+consumed, decodes only the lines past it, and appends the results to a sidecar
+plaintext file. Callers then ask for everything (:meth:`plaintexts`) or only
+what arrived after a checkpoint they took earlier (:meth:`plaintexts_since`).
+
+The output file is not *always* append-only: ``_run_hashcat_show`` replaces it
+wholesale via a temp file, and an operator can truncate or edit it by hand. So
+the recorded offset is trusted only while the file is the same inode, is at
+least that long, and still carries the same bytes just before the offset.
+Anything else throws the index away and rebuilds it from byte 0 -- the old,
+always-correct behaviour, paid once.
+
+A trailing line with no newline yet is left unconsumed; hashcat may still be
+writing it, and indexing half a password would be worse than waiting.
+"""
+
+import binascii
+import hashlib
+import json
+import os
+import re
+import uuid
+
+INDEX_SUFFIX = ".plaintexts"
+STATE_SUFFIX = ".json"
+
+_STATE_VERSION = 1
+
+_READ_CHUNK = 1024 * 1024
+
+# How many bytes before the consumed offset are hashed to notice an in-place
+# rewrite of the same length or longer.
+_TAIL_PROBE_BYTES = 4096
+
+_HEX_RE = re.compile(r"^\$HEX\[(\S+)\]")
+
+
+def decode_cracked_field(field):
+    """Decode hashcat's ``$HEX[...]`` wrapper on a cracked plaintext field.
+
+    latin-1, not a multi-byte codec: one raw byte maps to one character, which
+    callers writing these characters back out to a hashcat-facing file must
+    re-encode the same way to round-trip the original bytes. A malformed
+    wrapper is returned as-is rather than aborting the extraction.
+    """
+    match = _HEX_RE.search(field)
+    if not match:
+        return field
+    try:
+        return binascii.unhexlify(match.group(1)).decode("latin-1")
+    except (binascii.Error, ValueError):
+        return field
+
+
+def _plaintext_from_line(raw):
+    """The decoded plaintext of one raw ``.out`` line, or None if it has none.
+
+    The plaintext is the *last* colon field, because hash components for some
+    modes (NetNTLM, Kerberos, ...) embed their own colons.
+    """
+    line = raw.decode("utf-8", errors="replace").rstrip("\n")
+    if line.endswith("\r"):
+        line = line[:-1]
+    if ":" not in line:
+        return None
+    return decode_cracked_field(line.rsplit(":", 1)[-1])
+
+
+class CrackedPlaintextIndex:
+    """Decoded plaintexts of ``source_path``, kept in step with its growth.
+
+    The index lives beside the source as ``<source>.plaintexts`` (one
+    plaintext per line, in crack order, duplicates kept) plus a small JSON
+    state file, so it survives between calls and between attacks of the same
+    session.
+    """
+
+    def __init__(self, source_path, index_path=None):
+        self.source_path = source_path
+        self.index_path = index_path or source_path + INDEX_SUFFIX
+        self.state_path = self.index_path + STATE_SUFFIX
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(state, dict) or state.get("version") != _STATE_VERSION:
+            return None
+        return state
+
+    def _save_state(self, state):
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.state_path)
+
+    def _tail_digest(self, f, offset):
+        start = max(0, offset - _TAIL_PROBE_BYTES)
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+    def _state_is_current(self, state, st, f):
+        """True if ``state`` still describes a prefix of the open source file."""
+        if state is None:
+            return False
+        offset = state.get("offset", 0)
+        if (state.get("dev"), state.get("ino")) != (st.st_dev, st.st_ino):
+            return False
+        if st.st_size < offset:
+            return False
+        try:
+            if os.path.getsize(self.index_path) != state.get("index_size"):
+                return False
+        except OSError:
+            return False
+        return self._tail_digest(f, offset) == state.get("tail_sha256")
+
+    def refresh(self):
+        """Index any complete lines appended to the source since the last call.
+
+        Returns the number of plaintexts added. A missing source empties the
+        index.
+        """
+        try:
+            f = open(self.source_path, "rb")
+        except FileNotFoundError:
+            self.clear()
+            return 0
+        with f:
+            st = os.fstat(f.fileno())
+            state = self._load_state()
+            if not self._state_is_current(state, st, f):
+                state = {
+                    "version": _STATE_VERSION,
+                    "generation": uuid.uuid4().hex,
+                    "dev": st.st_dev,
+                    "ino": st.st_ino,
+                    "offset": 0,
+                    "count": 0,
+                }
+                open(self.index_path, "w").close()
+            offset = state["offset"]
+            added = 0
+            f.seek(offset)
+            pending = b""
+            with open(self.index_path, "a", encoding="utf-8", newline="\n") as out:
+                while True:
+                    chunk = f.read(_READ_CHUNK)
+                    if not chunk:
+                        break
+                    pending += chunk
+                    cut = pending.rfind(b"\n")
+                    if cut < 0:
+                        continue
+                    complete, pending = pending[: cut + 1], pending[cut + 1 :]
+                    offset += len(complete)
+                    for raw in complete.splitlines():
+                        plaintext = _plaintext_from_line(raw)
+                        if plaintext is not None:
+                            out.write(plaintext + "\n")
+                            added += 1
+            state["offset"] = offset
+            state["count"] += added
+            state["index_size"] = os.path.getsize(self.index_path)
+            state["tail_sha256"] = self._tail_digest(f, offset)
+        self._save_state(state)
+        return added
+
+    def generation(self):
+        """An id that changes whenever the index is rebuilt from byte 0.
+
+        A checkpoint is only meaningful within one generation, so a caller
+        that persists checkpoints (Recycle's per-rule ledger) stores this
+        beside them and starts over on a mismatch.
+        """
+        state = self._load_state()
+        return state.get("generation", "") if state else ""
+
+    def checkpoint(self):
+        """An opaque marker for "everything indexed so far".
+
+        Pass it to :meth:`plaintexts_since` later to get only what was cracked
+        in between. It is a byte offset into the index file, so it stays valid
+        until the index is rebuilt; a stale checkpoint past the end of a
+        rebuilt index yields nothing rather than raising.
+        """
+        try:
+            return os.path.getsize(self.index_path)
+        except OSError:
+            return 0
+
+    def plaintexts_since(self, checkpoint=0, until=None):
+        """Plaintexts indexed after ``checkpoint``, refreshing first.
+
+        ``until`` bounds the read at a second, later checkpoint, so a caller
+        can take an exact slice even while hashcat keeps appending.
+        """
+        self.refresh()
+        try:
+            with open(self.index_path, "rb") as f:
+                f.seek(checkpoint)
+                if until is None:
+                    data = f.read()
+                else:
+                    data = f.read(max(0, until - checkpoint))
+        except OSError:
+            return []
+        return data.decode("utf-8", errors="replace").split("\n")[:-1]
+
+    def plaintexts(self):
+        """Every indexed plaintext, in crack order, refreshing first."""
+        return self.plaintexts_since(0)
+
+    def export(self, working_path):
+        """Write every plaintext to ``working_path``, one per line.
+
+        The same layout the old extraction wrote to ``.working``: newline
+        separated with no trailing newline, for the external tools (statsgen,
+        combinator, hashcat itself) that read it as a wordlist.
+        """
+        self.refresh()
+        with (
+            open(self.index_path, "rb") as src,
+            open(working_path, "wb") as dst,
+        ):
+            previous = b""
+            while True:
+                chunk = src.read(_READ_CHUNK)
+                if not chunk:
+                    break
+                dst.write(previous)
+                previous = chunk
+            dst.write(previous[:-1] if previous.endswith(b"\n") else previous)
+
+    def clear(self):
+        """Forget the index; the next refresh rebuilds it from byte 0."""
+        for path in (self.index_path, self.state_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -13,6 +13,7 @@ import shutil
 import logging
 import binascii
 import glob
+import hashlib
 import random
 import re
 import readline
@@ -26,6 +27,7 @@ import dataclasses
 import gzip
 import lzma
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from types import SimpleNamespace
 
 #!/usr/bin/env python3
@@ -81,8 +83,12 @@ from hate_crack import llm  # noqa: E402
 from hate_crack import noninteractive as _noninteractive  # noqa: E402
 from hate_crack.progress import spinner  # noqa: E402
 from hate_crack import corpus_stats as _corpus_stats  # noqa: E402
+from hate_crack import corpus_profile_cache as _corpus_profiles  # noqa: E402
+from hate_crack import cracked_index as _cracked_index  # noqa: E402
 from hate_crack import plaintext as _plaintext  # noqa: E402
+from hate_crack import potfile_index as _potfile_index  # noqa: E402
 from hate_crack import rulegen as _rulegen  # noqa: E402
+from hate_crack import wordlist_catalog as _wordlist_catalog  # noqa: E402
 from hate_crack import attack_coverage as _coverage  # noqa: E402
 from hate_crack.menu import interactive_menu  # noqa: E402
 from hate_crack.username_detect import detect_username_hash_format  # noqa: E402
@@ -137,6 +143,8 @@ class DirEntry:
 
     name: str
     is_dir: bool
+    # Line count from the wordlist catalog, when it has a current entry.
+    lines: int | None = None
 
 
 def _visible_entries(directory):
@@ -174,12 +182,23 @@ def list_wordlist_entries(directory):
     be labelled as one. See :func:`list_wordlist_files` for callers that need
     files only.
     """
-    return [
+    entries = [
         entry
         for entry in _visible_entries(directory)
         if entry.is_dir
         or not any(entry.name.endswith(ext) for ext in EXCLUDED_WORDLIST_EXTENSIONS)
     ]
+    catalogued = _wordlist_catalog.get_catalog().lookup_many(
+        os.path.join(directory, entry.name) for entry in entries if not entry.is_dir
+    )
+    return [
+        dataclasses.replace(
+            entry, lines=catalogued[os.path.join(directory, entry.name)].lines
+        )
+        if os.path.join(directory, entry.name) in catalogued
+        else entry
+        for entry in entries
+    ]
 
 
 def list_wordlist_files(directory):
@@ -1117,6 +1136,18 @@ try:
 except KeyError:
     pass
 check_for_updates_enabled = config_parser.get("check_for_updates", True)
+# Answer `hashcat --show` for unsalted fast modes from an incrementally built
+# SQLite index of the potfile instead of launching hashcat; see potfile_index.
+potfile_index_enabled = bool(config_parser.get("potfile_index_enabled", False))
+# Count Spoonman's basewords and rules with bounded-error heavy-hitter sketches
+# instead of tier pruning once a corpus overflows them; see rulegen.
+spoonman_heavy_hitters = bool(config_parser.get("spoonman_heavy_hitters", False))
+# Fingerprint wordlists under these directories for coverage from their size
+# and a sample of blocks instead of a full read; see attack_coverage.
+coverage_sampled_fingerprint_dirs = list(
+    config_parser.get("coverage_sampled_fingerprint_dirs", [])
+)
+_coverage.set_sampled_fingerprint_dirs(coverage_sampled_fingerprint_dirs)
 
 # Notification subsystem bootstrap.  The notify module stores its own
 # settings snapshot; we hand it the resolved `config.json` path so it can
@@ -1676,7 +1707,8 @@ def _apply_coverage(cmd, spec, attack_name: str, decision_cache: dict | None = N
     without prompting again, even though each has its own, different plan.
     """
     store = _coverage_store()
-    plan = _coverage.plan_run(spec, store.covered, store=store)
+    lookup = store.covered_lookup(_coverage.target_id(spec.hash_file))
+    plan = _coverage.plan_run(spec, lookup, store=store)
     if plan.is_inert:
         return cmd, None, []
 
@@ -1791,12 +1823,130 @@ def _coverage_forget(hash_file: str) -> str:
     )
 
 
+def _coverage_export(hash_file: str, output: str) -> int:
+    target = _coverage.target_id(hash_file)
+    if target is None:
+        print(f"[!] Cannot read {hash_file}.")
+        return 1
+    try:
+        counts = _coverage_store().export_target(target, output)
+    except OSError as exc:
+        print(f"[!] Cannot write {output}: {exc}")
+        return 1
+    if counts is None:
+        print("[!] The coverage store could not be read.")
+        return 1
+    print(
+        f"Exported {counts['entries']} covered "
+        f"entr{'y' if counts['entries'] == 1 else 'ies'} from "
+        f"{counts['runs']} {_plural('run', counts['runs'])} of "
+        f"{os.path.basename(hash_file)} to {output}."
+    )
+    return 0
+
+
+def _coverage_merge(path: str) -> int:
+    try:
+        counts = _coverage_store().merge(path)
+    except OSError as exc:
+        print(f"[!] Cannot read {path}: {exc}")
+        return 1
+    except ValueError as exc:
+        print(f"[!] {path}: {exc}")
+        return 1
+    if counts is None:
+        print("[!] The coverage store could not be written.")
+        return 1
+    print(
+        f"Merged {counts['entries']} new covered "
+        f"entr{'y' if counts['entries'] == 1 else 'ies'} and "
+        f"{counts['runs']} new {_plural('run', counts['runs'])} for target "
+        f"{counts['target'][:16]}... from {path}."
+    )
+    return 0
+
+
+def _coverage_maintenance_report() -> str:
+    """The whole store's size and what each target holds, largest first."""
+    usage = _coverage_store().usage()
+    vacuum = "incremental" if usage["incremental"] else "off (enable with --vacuum)"
+    lines = [
+        "Coverage store",
+        f"  size      : {usage['file_bytes'] / 1e6:.1f} MB "
+        f"({usage['free_bytes'] / 1e6:.1f} MB free)",
+        f"  vacuum    : {vacuum}",
+    ]
+    if not usage["targets"]:
+        lines.append("  No attacks recorded yet.")
+        return "\n".join(lines)
+    lines += [
+        "",
+        f"  {'target':<20}{'entries':>10}{'runs':>7}{'MB':>9}  last run",
+        f"  {'-' * 20}{'-' * 10}{'-' * 7}{'-' * 9}  {'-' * 25}",
+    ]
+    for target, entries, runs, size, last_run in usage["targets"]:
+        lines.append(
+            f"  {target[:16] + '...':<20}{entries:>10}{runs:>7}"
+            f"{size / 1e6:>9.1f}  {last_run}"
+        )
+    lines.append("")
+    lines.append("  MB is each target's share of the store by entries, an estimate.")
+    return "\n".join(lines)
+
+
+def _coverage_maintain(args) -> int:
+    store = _coverage_store()
+    days = args.prune_days
+    if days is not None:
+        if days < 0:
+            print("Error: --prune-days cannot be negative")
+            return 2
+        stale = store.stale_targets(days)
+        if not stale:
+            print(f"No target was last attacked more than {days} days ago.")
+        else:
+            if not args.yes:
+                print(
+                    f"{len(stale)} {_plural('target', len(stale))} last attacked "
+                    f"more than {days} days ago:"
+                )
+                for target in stale:
+                    print(f"  {target[:16]}...")
+                answer = input("\n[?] Drop their coverage and history? [y/N]: ")
+                if answer.strip().lower() not in ("y", "yes"):
+                    print("Left unchanged.")
+                    return 0
+            # The list just confirmed, not prune()'s fresh look: a target that
+            # went stale while the prompt waited was never shown.
+            pruned = [(target, store.forget_target(target)) for target in stale]
+            dropped = sum(entries for _, entries in pruned)
+            print(
+                f"Pruned {len(pruned)} {_plural('target', len(pruned))} "
+                f"({dropped} covered entr{'y' if dropped == 1 else 'ies'})."
+            )
+    if args.vacuum:
+        print("[*] Coverage: vacuuming the store.")
+        if not store.vacuum():
+            print("[!] The coverage store could not be vacuumed.")
+            return 1
+    print(_coverage_maintenance_report())
+    return 0
+
+
 def _run_coverage_command(args) -> int:
-    """`hate_crack coverage status|history|forget --hashfile X`."""
+    """`hate_crack coverage status|history|forget|export --hashfile X`, and the
+    store-wide `merge FILE` and `maintain`."""
     command = getattr(args, "coverage_command", None)
     if not command:
-        print("Error: coverage needs one of: status, history, forget")
+        print(
+            "Error: coverage needs one of: status, history, forget, export, "
+            "merge, maintain"
+        )
         return 2
+    if command == "merge":
+        return _coverage_merge(args.file)
+    if command == "maintain":
+        return _coverage_maintain(args)
 
     hash_file = resolve_path(args.hashfile)
     if not hash_file or not os.path.isfile(hash_file):
@@ -1818,11 +1968,55 @@ def _run_coverage_command(args) -> int:
                 return 0
         print(_coverage_forget(hash_file))
         return 0
+    if command == "export":
+        return _coverage_export(hash_file, args.output)
 
     print(f"Error: unknown coverage command: {command}")
     return 2
 
 
+def _run_wordlists_command(args) -> int:
+    """`hate_crack wordlists index [--dir D] [--workers N]`.
+
+    Scans every wordlist under the directory that the catalog does not
+    already hold a current entry for, one file per worker process, so the
+    keyspace guards, coverage fingerprints and pickers can answer from the
+    catalog instead of rereading the files. Safe to leave running in the
+    background: each finished file is committed as it completes.
+    """
+    command = getattr(args, "wordlists_command", None)
+    if command != "index":
+        print("Error: wordlists needs one of: index")
+        return 2
+    directory = resolve_path(args.wordlist_dir) if args.wordlist_dir else hcatWordlists
+    if not directory or not os.path.isdir(directory):
+        print(f"Error: wordlist directory not found: {args.wordlist_dir or directory}")
+        return 1
+    if args.workers is not None and args.workers < 1:
+        print("Error: --workers must be at least 1")
+        return 2
+
+    paths = _wordlist_catalog.iter_wordlist_files(
+        directory, exclude_extensions=EXCLUDED_WORDLIST_EXTENSIONS
+    )
+    print(f"[*] Indexing {len(paths)} wordlist(s) under {directory}...")
+
+    def report(path, info):
+        if info is None:
+            print(f"[!] Could not read {path}")
+        else:
+            print(f"    {path}: {info.lines:,} lines, {info.size:,} bytes")
+
+    indexed, current, failed = _wordlist_catalog.get_catalog().index_paths(
+        paths, workers=args.workers, progress=report
+    )
+    print(
+        f"[*] Wordlist catalog: {indexed} indexed, {current} already current,"
+        f" {failed} failed."
+    )
+    return 1 if failed else 0
+
+
 def _run_hcat_cmd(
     cmd,
     attack_name: str = "",
@@ -1852,6 +2046,11 @@ def _run_hcat_cmd(
 
     Coverage is recorded only on clean completion, so a ctrl-C or a hashcat
     error never leaves the store claiming ground that was not covered.
+
+    Returns True under that same condition (see
+    :func:`_run_hcat_cmd_uncovered`), and False when the run was skipped as
+    already covered or did not finish, for callers that keep their own
+    record of what was tried.
     """
     plan = None
     temp_paths: list[str] = []
@@ -1862,7 +2061,7 @@ def _run_hcat_cmd(
         applied = _apply_coverage(cmd, coverage, attack_name, coverage_decision)
         if applied is None:
             _coverage_skip_count += 1
-            return
+            return False
         cmd, plan, temp_paths = applied
 
     _hcat_launch_count += 1
@@ -1881,8 +2080,10 @@ def _run_hcat_cmd(
             with contextlib.suppress(OSError):
                 os.unlink(path)
 
+    # Written in the background: the next attack's plan already sees these
+    # keys, and nothing waits on the commit. See CoverageStore.record_async.
     if plan is not None and completed:
-        _coverage_store().record(
+        _coverage_store().record_async(
             plan.record_keys,
             target=plan.target,
             kind=plan.kind,
@@ -1895,7 +2096,10 @@ def _run_hcat_cmd(
         # no fixed keyspace to diff. One row, no keys.
         target = _coverage.target_id(hash_file)
         if target:
-            _coverage_store().log_run(target, attack=attack_name, kind="history")
+            _coverage_store().record_async(
+                (), target=target, attack=attack_name, kind="history"
+            )
+    return completed
 
 
 def _run_hcat_cmd_uncovered(
@@ -2545,15 +2749,84 @@ def select_file_with_autocomplete(
 
 
 # Counts the number of lines in a file
+# lineCount memo: realpath -> _LineCountEntry. `.out` files only grow between
+# attacks and wordlists never change, yet every attack recounted both from byte
+# 0 -- Fingerprint twice per lap, the keyspace guard on multi-GB wordlists.
+_line_counts: dict = {}
+
+# Bytes just before the counted offset that must still match before an entry is
+# trusted, so a same-size rewrite inside one mtime tick is still noticed.
+_LINE_COUNT_TAIL_PROBE = 4096
+
+
+class _LineCountEntry(NamedTuple):
+    dev: int
+    ino: int
+    size: int
+    mtime_ns: int
+    count: int
+    tail: bytes
+
+
+def _count_newlines(f, start, end):
+    # Bounded at the stat'd size: a writer appending mid-count must not get
+    # its bytes counted here *and* again as the next call's delta.
+    f.seek(start)
+    count = 0
+    remaining = end - start
+    while remaining > 0:
+        buf = f.read(min(1 << 20, remaining))  # 1 MiB chunks
+        if not buf:
+            break
+        remaining -= len(buf)
+        count += buf.count(b"\n")
+    return count
+
+
+def _line_count_tail(f, offset):
+    start = max(0, offset - _LINE_COUNT_TAIL_PROBE)
+    f.seek(start)
+    return hashlib.sha256(f.read(offset - start)).digest()
+
+
 def lineCount(file):
+    """Number of newlines in `file`, or 0 if it cannot be read.
+
+    The bytes on disk are counted, compressed or not; a wordlist's count as
+    hashcat sees it comes from _wordlist_line_count.
+
+    Counts are memoized per path on (inode, size, mtime). An unchanged file
+    is answered from the memo; a file that only grew -- same inode, and the
+    bytes before the old end unchanged -- has just the appended bytes
+    counted. Anything else is counted from the start, including a file whose
+    size is the same but whose mtime is not: an in-place edit further up than
+    the compared tail would otherwise keep its stale count.
+    """
     try:
-        count = 0
+        key = os.path.realpath(file)
         with open(file, "rb") as f:
-            while True:
-                buf = f.read(1 << 20)  # 1 MiB chunks
-                if not buf:
-                    break
-                count += buf.count(b"\n")
+            st = os.fstat(f.fileno())
+            cached = _line_counts.get(key)
+            start = count = 0
+            if (
+                cached is not None
+                and (cached.dev, cached.ino) == (st.st_dev, st.st_ino)
+                and cached.size <= st.st_size
+                and _line_count_tail(f, cached.size) == cached.tail
+            ):
+                if cached.size == st.st_size and cached.mtime_ns == st.st_mtime_ns:
+                    return cached.count
+                if cached.size < st.st_size:
+                    start, count = cached.size, cached.count
+            count += _count_newlines(f, start, st.st_size)
+            _line_counts[key] = _LineCountEntry(
+                st.st_dev,
+                st.st_ino,
+                st.st_size,
+                st.st_mtime_ns,
+                count,
+                _line_count_tail(f, st.st_size),
+            )
         return count
     except Exception:
         return 0
@@ -2594,11 +2867,12 @@ def _extract_cracked_plaintexts(source_path, working_path):
     hash modes that allow full Unicode, like NTLM. A caller that reads
     working_path afterward without this decode step gets that literal
     wrapper text instead of the real password.
+
+    The extraction itself is incremental: see
+    :mod:`hate_crack.cracked_index`. Only lines appended to source_path since
+    the previous call are split and decoded; the rest is a straight copy.
     """
-    _write_delimited_field(source_path, working_path, 2, last_field=True)
-    converted = convert_hex(working_path)
-    with open(working_path, "w") as working:
-        working.writelines("\n".join(converted))
+    _cracked_index.CrackedPlaintextIndex(source_path).export(working_path)
 
 
 def _write_field_sorted_unique(input_path, output_path, field_index, delimiter=":"):
@@ -2626,6 +2900,127 @@ def _write_field_sorted_unique(input_path, output_path, field_index, delimiter="
         return False
 
 
+@dataclasses.dataclass
+class _PwdumpScan:
+    """What one pass over a pwdump file learned; see :func:`_scan_pwdump`.
+
+    Each NT/LM value lands in exactly one of the two sets per field: the
+    ``user`` set if any non-computer account carries it, otherwise the
+    ``computer`` set. Either answer to the "ignore computer accounts?" prompt
+    can then be served without reading the file again.
+    """
+
+    computer_accounts: int = 0
+    # The filtered copy, or the input itself when there was nothing to filter.
+    filtered_path: str = ""
+    nt_user: set[str] = dataclasses.field(default_factory=set)
+    nt_computer: set[str] = dataclasses.field(default_factory=set)
+    lm_user: set[str] = dataclasses.field(default_factory=set)
+    lm_computer: set[str] = dataclasses.field(default_factory=set)
+
+    def nt_hashes(self, include_computer_accounts: bool) -> set[str]:
+        if include_computer_accounts:
+            return self.nt_user | self.nt_computer
+        return self.nt_user
+
+    def lm_hashes(self, include_computer_accounts: bool) -> set[str]:
+        if include_computer_accounts:
+            return self.lm_user | self.lm_computer
+        return self.lm_user
+
+
+def _scan_pwdump(
+    input_path: str, filtered_path: str, delimiter: str = ":"
+) -> _PwdumpScan:
+    """Count, filter and deduplicate a pwdump file in a single streaming pass.
+
+    Replaces what used to be five passes over the dump -- count the computer
+    accounts, filter them out, then one ``sort -u`` pipeline each for the NT
+    and LM fields, then ``lineCount`` on the ``.lm`` result twice -- which on
+    a multi-million-line NTDS extract took minutes before the first attack.
+
+    The filtered copy (non-computer lines, blank lines dropped, as
+    :func:`_filter_computer_accounts` writes it) goes to ``filtered_path``
+    speculatively, before the operator has been asked whether to use it; the
+    caller deletes it if not. It is only started at the first computer
+    account, by copying the lines kept before it, so a dump with none is never
+    copied at all and ``scan.filtered_path`` is the input itself. Field
+    extraction matches
+    :func:`_write_field_sorted_unique` (NT is field 4, LM field 3), and the
+    deduplication is a set in-process: a 2M-account dump holds at most 2M
+    distinct 32-character values per field, well inside memory, and set
+    membership replaces two external sorts.
+    """
+    scan = _PwdumpScan(filtered_path=input_path)
+    try:
+        with contextlib.ExitStack() as stack:
+            src = stack.enter_context(open(input_path, "r", errors="replace"))
+            dst = None
+            kept = 0
+            for line in src:
+                stripped = line.rstrip("\r\n")
+                if not stripped:
+                    continue
+                parts = stripped.split(delimiter, 4)
+                is_computer = parts[0].endswith("$")
+                if is_computer:
+                    scan.computer_accounts += 1
+                    if dst is None:
+                        dst = stack.enter_context(open(filtered_path, "w"))
+                        _copy_kept_pwdump_lines(input_path, dst, kept)
+                        scan.filtered_path = filtered_path
+                elif dst is not None:
+                    dst.write(stripped + "\n")
+                else:
+                    kept += 1
+                for index, user, computer in (
+                    (3, scan.nt_user, scan.nt_computer),
+                    (2, scan.lm_user, scan.lm_computer),
+                ):
+                    if len(parts) <= index:
+                        continue
+                    value = parts[index]
+                    if is_computer:
+                        if value not in user:
+                            computer.add(value)
+                    else:
+                        user.add(value)
+                        computer.discard(value)
+    except (FileNotFoundError, PermissionError, OSError) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"Warning: Could not process {input_path}: {e}")
+    return scan
+
+
+def _copy_kept_pwdump_lines(input_path: str, dst, count: int) -> None:
+    """Write the first ``count`` non-blank lines of ``input_path`` to ``dst``.
+
+    The part of the filtered copy :func:`_scan_pwdump` had already read past
+    when it met the first computer account.
+    """
+    if not count:
+        return
+    with open(input_path, "r", errors="replace") as src:
+        for line in src:
+            stripped = line.rstrip("\r\n")
+            if stripped:
+                dst.write(stripped + "\n")
+                count -= 1
+                if not count:
+                    return
+
+
+def _write_sorted_lines(output_path: str, values: Iterable[str]) -> None:
+    """Write ``values`` one per line in ``LC_ALL=C sort`` order.
+
+    Code-point order on str is UTF-8 byte order, which is what C-locale
+    ``sort`` produces, so the file is identical to the external sort's.
+    """
+    with open(output_path, "w") as dst:
+        for value in sorted(values):
+            dst.write(value + "\n")
+
+
 def _count_computer_accounts(input_path: str, delimiter: str = ":") -> int:
     """Count computer accounts (usernames ending with $) in a hash file."""
     count = 0
@@ -2671,6 +3066,25 @@ def _filter_computer_accounts(
     return removed
 
 
+def _username_key(username: str) -> int:
+    """An 8-byte digest of a lowercased username, as an int.
+
+    A set of these costs a fraction of a set of the strings themselves, which
+    matters for a capture of millions of lines. The price is that equal keys
+    are taken to be equal usernames without checking: if two different
+    usernames ever collided, the second one's lines would all be dropped as
+    duplicates of the first, losing that user's hash. At 64 bits the chance
+    of any collision among ten million distinct usernames is about 3 in a
+    million, which is the risk accepted here.
+    """
+    return int.from_bytes(
+        hashlib.blake2b(
+            username.lower().encode("utf-8", "surrogateescape"), digest_size=8
+        ).digest(),
+        "big",
+    )
+
+
 def _dedup_netntlm_by_username(
     input_path: str, output_path: str, delimiter: str = ":"
 ) -> tuple[int, int]:
@@ -2681,48 +3095,62 @@ def _dedup_netntlm_by_username(
     Only writes output_path when duplicates are found.
     Returns a tuple of (total_lines, duplicates_removed).
 
-    Uses a two-pass approach to avoid holding all lines in memory:
-    - Pass 1: scan to collect seen usernames and count duplicates
-    - Pass 2: stream non-duplicate lines directly to the output file
+    One pass: first occurrences are written speculatively to a temp file
+    beside output_path while duplicates are counted, and the temp file is
+    renamed into place only if a duplicate turned up -- otherwise it is
+    discarded. Usernames are remembered as 8-byte keys
+    (:func:`_username_key`) rather than as lowered strings.
     """
-    seen_usernames: set[str] = set()
+    seen_usernames: set[int] = set()
     duplicates = 0
     total = 0
+    temp_path = output_path + ".tmp"
     try:
-        # Pass 1: count totals and identify unique usernames
-        with open(input_path, "r", errors="replace") as src:
+        with (
+            open(input_path, "r", errors="replace") as src,
+            open(temp_path, "w") as dst,
+        ):
             for line in src:
                 stripped = line.rstrip("\r\n")
                 if not stripped:
                     continue
                 total += 1
-                username = stripped.split(delimiter, 1)[0].lower()
-                if username in seen_usernames:
+                key = _username_key(stripped.split(delimiter, 1)[0])
+                if key in seen_usernames:
                     duplicates += 1
                 else:
-                    seen_usernames.add(username)
-
-        # Pass 2: write non-duplicate lines directly to output (only if needed)
+                    seen_usernames.add(key)
+                    dst.write(stripped + "\n")
         if duplicates > 0:
-            first_seen: set[str] = set()
-            with (
-                open(input_path, "r", errors="replace") as src,
-                open(output_path, "w") as dst,
-            ):
-                for line in src:
-                    stripped = line.rstrip("\r\n")
-                    if not stripped:
-                        continue
-                    username = stripped.split(delimiter, 1)[0].lower()
-                    if username not in first_seen:
-                        first_seen.add(username)
-                        dst.write(stripped + "\n")
+            os.replace(temp_path, output_path)
     except (FileNotFoundError, PermissionError, OSError) as e:
         if not isinstance(e, FileNotFoundError):
             print(f"Warning: Could not process {input_path}: {e}")
+    finally:
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
     return total, duplicates
 
 
+def _potfile_index_show(hash_type, hash_file):
+    """Answer `--show` from the potfile index, or None to ask hashcat.
+
+    Only when `potfile_index_enabled` is set, the mode is a bare-digest one
+    the index understands, and the hash list has no username prefixes (their
+    `--show` output layout is hashcat's to decide).
+    """
+    if not potfile_index_enabled or hcatUsernamePrefix:
+        return None
+    if not _potfile_index.supports_mode(hash_type):
+        return None
+    potfile = hcatPotfilePath or _hashcat_paths.default_potfile_path(hcatBin)
+    index = _potfile_index.PotfileIndex(potfile)
+    try:
+        return index.show(hash_type, hash_file)
+    finally:
+        index.close()
+
+
 def _run_hashcat_show(hash_type, hash_file, output_path, force_overwrite=False):
     """Rewrite `output_path` from `hashcat --show`, refusing to destroy data.
 
@@ -2738,40 +3166,42 @@ def _run_hashcat_show(hash_type, hash_file, output_path, force_overwrite=False):
     replacement itself goes through a temp file so an interrupted write cannot
     leave a half-file behind. Returns True when `output_path` was written.
     """
-    cmd = [
-        hcatBin,
-        "--show",
-        # Use hashcat's built-in potfile unless configured otherwise.
-        *([f"--potfile-path={hcatPotfilePath}"] if hcatPotfilePath else []),
-        "-m",
-        str(hash_type),
-        hash_file,
-    ]
-    # If username:hash format was detected, --show also needs --username
-    # to parse the input correctly; otherwise it treats "user:hash" as a
-    # literal hash and finds no matches in the potfile.
-    _maybe_append_username_flag(cmd)
-    result = subprocess.run(
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        check=False,
-    )
-    if result.returncode != 0:
-        print(
-            f"Warning: hashcat --show exited with code {result.returncode};"
-            f" leaving {output_path} unchanged."
+    lines = _potfile_index_show(hash_type, hash_file)
+    if lines is None:
+        cmd = [
+            hcatBin,
+            "--show",
+            # Use hashcat's built-in potfile unless configured otherwise.
+            *([f"--potfile-path={hcatPotfilePath}"] if hcatPotfilePath else []),
+            "-m",
+            str(hash_type),
+            hash_file,
+        ]
+        # If username:hash format was detected, --show also needs --username
+        # to parse the input correctly; otherwise it treats "user:hash" as a
+        # literal hash and finds no matches in the potfile.
+        _maybe_append_username_flag(cmd)
+        result = subprocess.run(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=False,
         )
-        stderr_output = result.stderr.decode("utf-8", errors="replace").strip()
-        if stderr_output:
-            print(f"  hashcat: {stderr_output.splitlines()[-1]}")
-        return False
-    lines = [
-        line
-        for line in result.stdout.decode("utf-8", errors="ignore").splitlines()
-        # hashcat --show prints parse errors to stdout; skip non-result lines
-        if ":" in line and not line.startswith(("Hash parsing error", "* "))
-    ]
+        if result.returncode != 0:
+            print(
+                f"Warning: hashcat --show exited with code {result.returncode};"
+                f" leaving {output_path} unchanged."
+            )
+            stderr_output = result.stderr.decode("utf-8", errors="replace").strip()
+            if stderr_output:
+                print(f"  hashcat: {stderr_output.splitlines()[-1]}")
+            return False
+        lines = [
+            line
+            for line in result.stdout.decode("utf-8", errors="ignore").splitlines()
+            # hashcat --show prints parse errors to stdout; skip non-result lines
+            if ":" in line and not line.startswith(("Hash parsing error", "* "))
+        ]
     if not lines and not force_overwrite:
         try:
             already_populated = os.path.getsize(output_path) > 0
@@ -3308,6 +3738,26 @@ def _fingerprint_expander_chain(max_expander_len):
     return sorted(n for n in lengths if 7 <= n <= max_expander_len)
 
 
+def _wordlist_line_count(path):
+    """Lines hashcat reads from *path*: the catalog's count if it is current.
+
+    Otherwise counted here, and a gzip wordlist by its decompressed lines as
+    the catalog counts it. lineCount counts the bytes on disk, which for a
+    compressed list is the number of stray newline bytes in the stream.
+    """
+    catalogued = _wordlist_catalog.get_catalog().lookup(path)
+    if catalogued is not None:
+        return catalogued.lines
+    if not _plaintext.is_gzipped(path):
+        return lineCount(path)
+    try:
+        with _open_wordlist(path) as f:
+            chunks = iter(lambda: f.read(1 << 20), b"")
+            return sum(chunk.count(b"\n") for chunk in chunks)
+    except (OSError, EOFError):
+        return 0
+
+
 def _fingerprint_keyspace_guard(left_path, right_path, label, limit):
     """Return True if a -a1 combination of left/right should proceed.
 
@@ -3321,7 +3771,7 @@ def _fingerprint_keyspace_guard(left_path, right_path, label, limit):
     """
     if not limit:
         return True
-    keyspace = lineCount(left_path) * lineCount(right_path)
+    keyspace = _wordlist_line_count(left_path) * _wordlist_line_count(right_path)
     if keyspace <= limit:
         return True
     print(
@@ -3479,17 +3929,20 @@ def hcatFingerprint(
     expanded_path = f"{hcatHashFile}.expanded"
     open(expanded_path, "w").close()  # fresh accumulator for this attack run
 
+    # Each lap only reads what was cracked since the previous one; the index
+    # carries the decoded plaintexts between laps and between expander lengths.
+    cracked = _cracked_index.CrackedPlaintextIndex(f"{hcatHashFile}.out")
     any_candidates = False
     for expander_len in _fingerprint_expander_chain(max_expander_len):
         seen_plaintexts: set[str] = set()
         candidates_this_length = False
         crackedBefore = lineCount(hcatHashFile + ".out")
+        checkpoint = 0
         while True:
-            _extract_cracked_plaintexts(
-                f"{hcatHashFile}.out", f"{hcatHashFile}.working"
-            )
-            with open(f"{hcatHashFile}.working", errors="replace") as f:
-                current_plaintexts = {line.rstrip("\n") for line in f if line.strip()}
+            current_plaintexts = {
+                p for p in cracked.plaintexts_since(checkpoint) if p.strip()
+            }
+            checkpoint = cracked.checkpoint()
             new_plaintexts = current_plaintexts - seen_plaintexts
             if not new_plaintexts:
                 break
@@ -4206,9 +4659,13 @@ def hcatSmartMask(
     if keyspace_limit is None:
         keyspace_limit = _SMART_MASK_KEYSPACE_LIMIT
 
-    _extract_cracked_plaintexts(f"{hcatHashFile}.out", f"{hcatHashFile}.working")
-    with open(f"{hcatHashFile}.working", errors="replace") as f:
-        plaintexts = [line.rstrip("\n") for line in f if line.strip()]
+    plaintexts = [
+        p
+        for p in _cracked_index.CrackedPlaintextIndex(
+            f"{hcatHashFile}.out"
+        ).plaintexts()
+        if p.strip()
+    ]
 
     templates, skipped_no_stem = _cluster_smart_mask_templates(
         plaintexts, min_cluster_size
@@ -4968,66 +5425,85 @@ def _sample_plaintext_file(path, cap, source_label="wordlist"):
     ``cap`` is the maximum number of lines to keep (values <= 0 fall back to the
     built-in default of 500).  ``source_label`` is used only in the progress and
     error messages so callers can say "wordlist" or "cracked passwords".
+    A gzip-compressed file is decompressed as it is read.
 
     Returns a list of plaintexts (possibly empty when the file has no usable
     lines), or ``None`` if the file could not be read — in which case an error
     has already been printed.
     """
-    # Two-pass evenly-spaced sample: first count usable lines so we can
-    # stride-select across the whole file rather than taking a head slice.
-    # A head-only sample misses the pattern variation across large wordlists
-    # (e.g. rockyou.txt becomes more random further in).
+    # Invalid cap (zero or negative): fall back to the built-in default of 500.
+    if cap <= 0:
+        cap = 500
+
+    # One pass, with the total unknown until the end. Evenly spaced: keep
+    # every `stride`-th usable line, and each time 2 * cap are kept drop every
+    # other one and double the stride, so at most 2 * cap lines are held and
+    # they always span the whole file read so far. A head-only sample misses
+    # the pattern variation across large wordlists (e.g. rockyou.txt becomes
+    # more random further in).
+    kept: list = []
+    stride = 1
+    total_usable = 0
     try:
-        total_usable = 0
-        with open(path, "r", errors="ignore") as f:
-            for raw in f:
-                if _usable_plaintext(raw):
-                    total_usable += 1
+        if _is_gzipped(path):
+            f = gzip.open(path, "rb")
+        else:
+            f = open(path, "rb")
+        with f:
+            for w in _plaintext.iter_usable_plaintexts(
+                f, encoding="utf-8", errors="ignore"
+            ):
+                if total_usable % stride == 0:
+                    kept.append(w)
+                    if len(kept) == 2 * cap:
+                        del kept[1::2]
+                        stride *= 2
+                total_usable += 1
     except Exception as e:
         print(f"Error reading {source_label}: {e}")
         return None
 
-    # Invalid cap (zero or negative): fall back to the built-in default of 500.
-    if cap <= 0:
-        cap = 500
+    if total_usable <= cap:
+        sampled = kept
+    else:
+        # `kept` holds between cap and 2 * cap - 1 lines, evenly spaced. The
+        # k-th pick is the middle of the k-th of cap equal slices of it, which
+        # yields EXACTLY cap distinct lines and, since fewer than 2 * cap are
+        # kept, always includes the first and the last of them.
+        n = len(kept)
+        sampled = [kept[((2 * k + 1) * n) // (2 * cap)] for k in range(cap)]
 
     if total_usable <= cap:
-        # No capping needed — collect all usable lines.
-        try:
-            sampled: list[str] = []
-            with open(path, "r", errors="ignore") as f:
-                for raw in f:
-                    w = _usable_plaintext(raw)
-                    if w:
-                        sampled.append(w)
-        except Exception as e:
-            print(f"Error reading {source_label}: {e}")
-            return None
         print(f"Loaded {len(sampled):,} passwords from {source_label}.")
-        return sampled
+    else:
+        print(
+            f"Sampled {len(sampled):,} of {total_usable:,} passwords from "
+            f"{source_label}."
+        )
+    return sampled
+
+
+# Largest corpus _corpus_context will hash alongside its first profile, so
+# the profile can be cached. Hashing runs at disk speed, so up to here it
+# finishes within the profile it shares the read with. Past it, a capped
+# profile reads only a sample and a full hash could take longer than the
+# profile it was meant to save. A bigger corpus is looked up only once its
+# fingerprint is already known, from a coverage run or
+# `hate_crack wordlists index`.
+CORPUS_PROFILE_HASH_MAX_BYTES = 1024 * 1024 * 1024
 
-    # Evenly-spaced sample: the k-th pick targets index floor(k * total / cap),
-    # which yields EXACTLY cap distinct indices spanning the full range for any
-    # 1 <= cap <= total_usable.
+
+def _corpus_profile_fingerprint(path):
+    """Content sha256 of *path* for the profile cache, if already known."""
+    return _coverage.get_store().wordlist_fingerprint(path, compute=False)
+
+
+def _corpus_profile_hashable(path):
+    """Whether *path* is small enough to hash alongside its profile."""
     try:
-        pick_set = {(k * total_usable) // cap for k in range(cap)}
-        sampled = []
-        usable_idx = 0
-        with open(path, "r", errors="ignore") as f:
-            for raw in f:
-                w = _usable_plaintext(raw)
-                if not w:
-                    continue
-                if usable_idx in pick_set:
-                    sampled.append(w)
-                usable_idx += 1
-    except Exception as e:
-        print(f"Error reading {source_label}: {e}")
-        return None
-    print(
-        f"Sampled {len(sampled):,} of {total_usable:,} passwords from {source_label}."
-    )
-    return sampled
+        return os.path.getsize(path) <= CORPUS_PROFILE_HASH_MAX_BYTES
+    except OSError:
+        return False
 
 
 def _corpus_context(path, source_label="wordlist"):
@@ -5046,26 +5522,51 @@ def _corpus_context(path, source_label="wordlist"):
     aggregate covers 100% of the corpus at a bounded size. Literal plaintexts
     are still included when they all fit, since nothing is gained by hiding
     them from a small corpus.
+
+    Both are cached by the corpus's content fingerprint and the two caps (see
+    :mod:`hate_crack.corpus_profile_cache`), so profiling the same wordlist
+    again returns at once.
     """
+    cap = hcatCorpusProfileMaxLines
+    sample_cap = ollamaMaxSampleLines if ollamaMaxSampleLines > 0 else 500
+    fingerprint = _corpus_profile_fingerprint(path)
+    cached = None
+    hashing = digest = None
+    if fingerprint is not None:
+        cached = _corpus_profiles.get_cache().lookup(fingerprint, cap, sample_cap)
+    elif _corpus_profile_hashable(path):
+        # Hashed alongside the profile rather than before it, so a first-seen
+        # corpus is read once through the page cache instead of twice in a
+        # row. The cost: a renamed copy whose digest is not yet known is
+        # profiled again once before its copy's profile can be found.
+        hashing = ThreadPoolExecutor(max_workers=1)
+        digest = hashing.submit(_coverage.hash_wordlist, path)
     try:
         with _wordlist_path(path) as resolved_path:
-            # "no LLM yet" is load-bearing, not decoration: summarize() is a
-            # pure local pass that never contacts the model, but on a corpus
-            # of a few million lines it runs for the better part of a minute,
-            # and a bare "Analyzing..." reads as the model having stalled.
-            cap = hcatCorpusProfileMaxLines
-            with spinner(
-                f"Profiling {source_label} locally (no LLM yet)..."
-            ) as _profile_progress:
-                stats = _corpus_stats.summarize(
-                    resolved_path,
-                    progress=lambda n: _profile_progress.set_detail(
-                        f"{n:,} / {cap:,} lines" if cap > 0 else f"{n:,} lines"
-                    ),
-                    max_lines=cap,
-                )
+            if cached is not None:
+                stats, context = cached
+                print(f"Reusing the cached profile of {source_label}.")
+            else:
+                # "no LLM yet" is load-bearing, not decoration: summarize() is
+                # a pure local pass that never contacts the model, but on a
+                # corpus of a few million lines it runs for the better part of
+                # a minute, and a bare "Analyzing..." reads as the model having
+                # stalled.
+                # An exact count from the catalog beats summarize()'s estimate.
+                catalogued = _wordlist_catalog.get_catalog().lookup(path)
+                with spinner(
+                    f"Profiling {source_label} locally (no LLM yet)..."
+                ) as _profile_progress:
+                    stats = _corpus_stats.summarize(
+                        resolved_path,
+                        progress=lambda n: _profile_progress.set_detail(
+                            f"{n:,} / {cap:,} lines" if cap > 0 else f"{n:,} lines"
+                        ),
+                        max_lines=cap,
+                        line_count=catalogued.lines if catalogued else None,
+                    )
+                context = {"summary": _corpus_stats.format_summary(stats)}
 
-            context = {"summary": _corpus_stats.format_summary(stats)}
             if stats.get("sampled"):
                 estimated = stats.get("estimated_total") or stats["total"]
                 print(
@@ -5092,13 +5593,23 @@ def _corpus_context(path, source_label="wordlist"):
                     "below will be meaningless if so."
                 )
 
-            cap = ollamaMaxSampleLines if ollamaMaxSampleLines > 0 else 500
-            if stats["total"] <= cap:
-                sampled = _sample_plaintext_file(
-                    resolved_path, cap, source_label=source_label
-                )
-                if sampled:
-                    context["sample"] = "\n".join(sampled)
+            if cached is None:
+                sampled = []
+                if stats["total"] <= sample_cap:
+                    sampled = _sample_plaintext_file(
+                        resolved_path, sample_cap, source_label=source_label
+                    )
+                    if sampled:
+                        context["sample"] = "\n".join(sampled)
+                if digest is not None:
+                    fingerprint = _coverage.get_store().remember_wordlist_fingerprint(
+                        digest.result()
+                    )
+                # A sample that could not be read is not worth remembering.
+                if fingerprint is not None and sampled is not None:
+                    _corpus_profiles.get_cache().record(
+                        fingerprint, cap, sample_cap, stats, context
+                    )
             # NOTE: this return sits inside the try, so a ValueError/OSError
             # raised by format_summary() or _sample_plaintext_file() above is
             # swallowed into the OSError handler below and this function
@@ -5112,6 +5623,9 @@ def _corpus_context(path, source_label="wordlist"):
     except ValueError as e:
         print(f"Error: {e}")
         return None
+    finally:
+        if hashing is not None:
+            hashing.shutdown(wait=False)
 
 
 def hcatOllamaResearchTarget(company):
@@ -6289,11 +6803,21 @@ def hcatPrinceLing(hcatHashType, hcatHashFile):
 # first corpus's basewords and rules, silently.
 SPOONMAN_PROVENANCE_FILE = "corpus.json"
 SPOONMAN_PROVENANCE_FIELDS = ("corpus", "size", "mtime")
+# Where an interrupted derivation's progress waits to be resumed. It survives
+# cleanup(), unlike the rest of the cache directory; see _clear_spoonman_dir.
+SPOONMAN_CHECKPOINT_DIR = "checkpoint"
+# The last derivation's counters, so a corpus that has only been appended to
+# (a growing potfile export, say) is re-derived from its new tail alone. Kept
+# across cleanup() too, or the next session would pay for a full read again.
+SPOONMAN_STATE_DIR = "state"
 
 
 def _spoonman_provenance(corpus):
     """Describe *corpus* for the cache key: absolute path, size, and mtime.
 
+    The counting mode goes in too, so switching ``spoonman_heavy_hitters``
+    re-derives rather than reusing output counted the other way.
+
     Returns None if it cannot be stat'd, which the caller treats as "cannot
     prove the cache matches" and therefore re-derives.
     """
@@ -6305,6 +6829,7 @@ def _spoonman_provenance(corpus):
         "corpus": os.path.abspath(corpus),
         "size": stat.st_size,
         "mtime": stat.st_mtime,
+        "heavy_hitters": spoonman_heavy_hitters,
     }
 
 
@@ -6368,6 +6893,40 @@ def _invalidate_spoonman_provenance(path):
         print(f"[!] Could not invalidate stale corpus provenance {path}: {e}")
 
 
+def _clear_spoonman_dir(cache_dir):
+    """Remove a Spoonman cache directory, sparing what the next run builds on.
+
+    Everything in it is per-run scratch except two subdirectories. A non-empty
+    checkpoint, which rulegen.generate() only leaves behind when a derivation
+    was interrupted, holds hours of reading the next run against the same
+    corpus can resume. A committed state holds the last derivation's counters,
+    which let a later session read only what was appended to the corpus since.
+    """
+    checkpoint = os.path.join(cache_dir, SPOONMAN_CHECKPOINT_DIR)
+    state = os.path.join(cache_dir, SPOONMAN_STATE_DIR)
+    keep = set()
+    try:
+        if os.path.isdir(checkpoint) and os.listdir(checkpoint):
+            keep.add(SPOONMAN_CHECKPOINT_DIR)
+    except OSError:
+        pass
+    # Counters without their manifest were never committed and cannot be used.
+    if os.path.isfile(os.path.join(state, _rulegen.STATE_MANIFEST)):
+        keep.add(SPOONMAN_STATE_DIR)
+    if not keep:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        return
+    for name in os.listdir(cache_dir):
+        if name in keep:
+            continue
+        path = os.path.join(cache_dir, name)
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            with contextlib.suppress(OSError):
+                os.remove(path)
+
+
 def _spoonman_cache_mismatch(recorded, current):
     """Explain why *recorded* does not describe *current*, or None if it does."""
     if current is None:
@@ -6381,6 +6940,9 @@ def _spoonman_cache_mismatch(recorded, current):
         or recorded.get("mtime") != current["mtime"]
     ):
         return "the corpus has changed since it was derived"
+    # Absent from records written before the mode existed, which were exact.
+    if recorded.get("heavy_hitters", False) != current.get("heavy_hitters", False):
+        return "it was derived with a different counting mode"
     return None
 
 
@@ -6405,8 +6967,12 @@ def _count_over_long_basewords(path, cap=OPTIMIZED_KERNEL_MAX_PLAIN_LENGTH):
 
     Streams the file one line at a time: a Spoonman baseword list is derived
     from the whole corpus and can be nearly as large, so it must not be read
-    into memory just to print a warning.
+    into memory just to print a warning. A current wordlist-catalog entry
+    answers from its length histogram without reading the file at all.
     """
+    catalogued = _wordlist_catalog.get_catalog().lookup(path)
+    if catalogued is not None:
+        return catalogued.longer_than(cap)
     try:
         with open(path, encoding="latin-1") as handle:
             return sum(1 for line in handle if len(line.rstrip("\r\n")) > cap)
@@ -6714,6 +7280,12 @@ def hcatSpoonman(
                     cache_dir,
                     leet_restore=True,
                     baseword_caps=(baseword_cap,) if baseword_cap else (),
+                    heavy_hitters=spoonman_heavy_hitters,
+                    checkpoint_dir=os.path.join(cache_dir, SPOONMAN_CHECKPOINT_DIR),
+                    state_dir=os.path.join(cache_dir, SPOONMAN_STATE_DIR),
+                    # A gzip corpus is decompressed to a new temporary file
+                    # every run; key the resume on the file the user named.
+                    corpus_identity=corpus,
                 )
         except (OSError, ValueError) as e:
             print(f"Rule derivation failed: {e}")
@@ -7244,14 +7816,85 @@ def hcatLMtoNT():
     # toggle-lm-ntlm.rule by Didier Stevens https://blog.didierstevens.com/2016/07/16/tool-to-generate-hashcat-toggle-rules/
 
 
+def _recycle_ledger_path(hash_file):
+    return f"{hash_file}.recycle.json"
+
+
+def _read_recycle_ledger(hash_file, generation):
+    """Per-rule checkpoints into the cracked index, for this index generation.
+
+    A ledger from another generation (the index was rebuilt, so its
+    checkpoints point into a different file) or one that cannot be read is
+    treated as empty -- every rule then recycles everything, which is what
+    Recycle did before it kept a ledger at all.
+    """
+    try:
+        with open(_recycle_ledger_path(hash_file), encoding="utf-8") as f:
+            ledger = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(ledger, dict) or ledger.get("generation") != generation:
+        return {}
+    rules = ledger.get("rules")
+    return rules if isinstance(rules, dict) else {}
+
+
+def _write_recycle_ledger(hash_file, generation, rules):
+    path = _recycle_ledger_path(hash_file)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"generation": generation, "rules": rules}, f)
+    os.replace(temp_path, path)
+
+
+def _recycle_rule_identity(rule_path):
+    """Ledger key for a rule file: its path plus the (size, mtime) it had.
+
+    An edited rule file has new rules that never saw the old plaintexts, so
+    it must not inherit the old file's checkpoint.
+    """
+    try:
+        st = os.stat(rule_path)
+    except OSError:
+        return rule_path
+    return f"{rule_path}:{st.st_size}:{st.st_mtime_ns}"
+
+
 # Recycle Cracked Passwords
 def hcatRecycle(hcatHashType, hcatHashFile, hcatNewPasswords):
+    """Rerun every rule in ``hcatRules`` over plaintexts it has not yet seen.
+
+    Extensive Crack recycles after each of its stages, and a rule file that
+    already ran over the earlier cracks would only regenerate candidates
+    hashcat has already tried against this hash list. So each rule file gets
+    just the delta: the cracked plaintexts indexed since the checkpoint
+    recorded the last time it *finished* over them. A run that is
+    interrupted or errors out records nothing, so its delta is offered again
+    next time.
+    """
     global hcatProcess
     working_file = hcatHashFile + ".working"
     if hcatNewPasswords > 0:
-        _extract_cracked_plaintexts(f"{hcatHashFile}.out", working_file)
+        cracked = _cracked_index.CrackedPlaintextIndex(f"{hcatHashFile}.out")
+        cracked.refresh()
+        generation = cracked.generation()
+        end = cracked.checkpoint()
+        ledger = _read_recycle_ledger(hcatHashFile, generation)
+        working_start = None
         for rule in hcatRules:
             rule_path = get_rule_path(rule)
+            identity = _recycle_rule_identity(rule_path)
+            start = ledger.get(identity, 0)
+            if not isinstance(start, int) or not 0 <= start <= end:
+                start = 0
+            if start == end:
+                print(f"[*] Recycle: no new plaintexts for {rule}, skipping.")
+                continue
+            if start != working_start:
+                delta = dict.fromkeys(cracked.plaintexts_since(start, until=end))
+                with open(working_file, "w", encoding="utf-8") as f:
+                    f.write("\n".join(delta))
+                working_start = start
             cmd = [
                 hcatBin,
                 "-m",
@@ -7270,7 +7913,9 @@ def hcatRecycle(hcatHashType, hcatHashFile, hcatNewPasswords):
             cmd.extend(shlex.split(hcatTuning))
             _append_potfile_arg(cmd)
             cmd = _add_debug_mode_for_rules(cmd)
-            _run_hcat_cmd(cmd, attack_name="Recycle", hash_file=hcatHashFile)
+            if _run_hcat_cmd(cmd, attack_name="Recycle", hash_file=hcatHashFile):
+                ledger[identity] = end
+                _write_recycle_ledger(hcatHashFile, generation, ledger)
 
 
 def hcatGenerateRules(hcatHashType, hcatHashFile, rule_count, wordlist):
@@ -7470,6 +8115,10 @@ def cleanup():
                 os.remove(scratch)
         if os.path.exists(hcatHashFile + ".working"):
             os.remove(hcatHashFile + ".working")
+        for cracked_source in (hcatHashFile + ".out", hcatHashFile + ".lm.cracked"):
+            _cracked_index.CrackedPlaintextIndex(cracked_source).clear()
+        if os.path.exists(_recycle_ledger_path(hcatHashFile)):
+            os.remove(_recycle_ledger_path(hcatHashFile))
         if os.path.exists(hcatHashFile + ".expanded"):
             os.remove(hcatHashFile + ".expanded")
         # A directory since the attack started generating its own rules; the
@@ -7482,7 +8131,7 @@ def cleanup():
         elif os.path.isfile(hcatHashFile + ".llm_patterns"):
             os.remove(hcatHashFile + ".llm_patterns")
         if os.path.isdir(hcatHashFile + ".spoonman"):
-            shutil.rmtree(hcatHashFile + ".spoonman", ignore_errors=True)
+            _clear_spoonman_dir(hcatHashFile + ".spoonman")
         if os.path.isdir(hcatHashFile + ".rosetta"):
             shutil.rmtree(hcatHashFile + ".rosetta", ignore_errors=True)
         if os.path.exists(hcatHashFileOrig + ".combined"):
@@ -8536,6 +9185,37 @@ def rules_optimize(infile: str, outfile: str) -> bool:
     return result.returncode == 0
 
 
+def rules_dedupe(infile: str, outfile: str) -> tuple[int, int] | None:
+    """Drop rules equivalent to an earlier one. Returns (kept, dropped).
+
+    Pure Python, unlike the hashcat-utils tools beside it: equivalence is
+    ``rulegen.canonical_rule``'s, so ``:$1``, ``$1`` and ``$1 :`` keep only
+    the first. Read and written as bytes with ``surrogateescape``, as coverage
+    reads rule files, so a rule that is not valid UTF-8 survives verbatim.
+    Returns None if either file cannot be read or written.
+    """
+    try:
+        with open(infile, "rb") as fin:
+            text = fin.read().decode("utf-8", errors="surrogateescape")
+    except OSError:
+        return None
+    lines = text.split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    lines = [line[:-1] if line.endswith("\r") else line for line in lines]
+    kept, dropped = _rulegen.dedupe_rules(lines)
+    try:
+        with open(outfile, "wb") as fout:
+            for line in kept:
+                fout.write(line.encode("utf-8", errors="surrogateescape") + b"\n")
+    except OSError:
+        return None
+    rules = sum(
+        1 for line in kept if line.strip() and not line.lstrip().startswith("#")
+    )
+    return rules, dropped
+
+
 def rule_tools_submenu():
     return _attacks.rule_tools_submenu(_attack_ctx())
 
@@ -8613,26 +9293,10 @@ def notifications_submenu():
 
 # convert hex words for recycling
 def convert_hex(working_file):
-    processed_words = []
-    regex = r"^\$HEX\[(\S+)\]"
+    # The decode (and why it is latin-1) lives with the cracked-plaintext
+    # index, which does the same thing incrementally for the attacks.
     with open(working_file, "r") as f:
-        for line in f:
-            match = re.search(regex, line.rstrip("\n"))
-            if match:
-                # latin-1, not iso-8859-9: matches the byte-preserving convention
-                # the rest of the codebase already uses (see
-                # hate_crack.plaintext.decode_hex_wrapper) -- one raw byte maps
-                # to one character, which callers that write these characters
-                # back out to a hashcat-facing file (e.g. hcatSmartMask's
-                # .hcmask) must re-encode with the same codec to round-trip
-                # the original bytes exactly.
-                processed_words.append(
-                    binascii.unhexlify(match.group(1)).decode("latin-1")
-                )
-            else:
-                processed_words.append(line.rstrip("\n"))
-
-    return processed_words
+        return [_cracked_index.decode_cracked_field(line.rstrip("\n")) for line in f]
 
 
 # Display Cracked Hashes
@@ -9235,6 +9899,7 @@ def main():
             ("status", "Show what has already been run against a hash file"),
             ("history", "List every attack run against a hash file"),
             ("forget", "Drop all coverage for a hash file so it can be re-attacked"),
+            ("export", "Write a hash file's coverage to a file for another node"),
         ):
             sub = coverage_subparsers.add_parser(name, help=blurb)
             sub.add_argument(
@@ -9248,6 +9913,62 @@ def main():
                     action="store_true",
                     help="Skip the confirmation prompt",
                 )
+            if name == "export":
+                sub.add_argument(
+                    "-o",
+                    "--output",
+                    required=True,
+                    help="File to write (merge it with `coverage merge`)",
+                )
+        merge_parser = coverage_subparsers.add_parser(
+            "merge", help="Add coverage exported on another node to this one"
+        )
+        merge_parser.add_argument("file", help="File written by `coverage export`")
+        maintain_parser = coverage_subparsers.add_parser(
+            "maintain",
+            help="Report the store's size per target; prune and vacuum it",
+        )
+        maintain_parser.add_argument(
+            "--prune-days",
+            type=int,
+            metavar="DAYS",
+            help="Forget every target not attacked in the last DAYS days",
+        )
+        maintain_parser.add_argument(
+            "--vacuum",
+            action="store_true",
+            help="Return free space to the filesystem (enables incremental "
+            "vacuum on an older store, rewriting it once)",
+        )
+        maintain_parser.add_argument(
+            "--yes",
+            action="store_true",
+            help="Skip the confirmation prompt",
+        )
+
+        wordlists_parser = subparsers.add_parser(
+            "wordlists",
+            help="Maintain the wordlist catalog (line counts, fingerprints)",
+        )
+        wordlists_subparsers = wordlists_parser.add_subparsers(
+            dest="wordlists_command"
+        )
+        wl_index = wordlists_subparsers.add_parser(
+            "index",
+            help="Catalog every wordlist under a directory, in parallel",
+        )
+        wl_index.add_argument(
+            "--dir",
+            dest="wordlist_dir",
+            default=None,
+            help="Directory to index (default: hcatWordlists)",
+        )
+        wl_index.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Worker processes (default: one per CPU)",
+        )
 
         hashview_parser = subparsers.add_parser(
             "hashview", help="Hashview menu actions"
@@ -9371,7 +10092,10 @@ def main():
 
     has_attack_subcommand = any(arg in _noninteractive.ATTACK_COMMANDS for arg in argv)
     use_subcommand_parser = (
-        "hashview" in argv or "coverage" in argv or has_attack_subcommand
+        "hashview" in argv
+        or "coverage" in argv
+        or "wordlists" in argv
+        or has_attack_subcommand
     )
     parser, hashview_parser = _build_parser(
         include_positional=not use_subcommand_parser,
@@ -9455,6 +10179,9 @@ def main():
     if getattr(args, "command", None) == "coverage":
         sys.exit(_run_coverage_command(args))
 
+    if getattr(args, "command", None) == "wordlists":
+        sys.exit(_run_wordlists_command(args))
+
     if getattr(args, "command", None) == "hashview":
         if not hashview_api_key:
             print("\nError: Hashview API key not configured.")
@@ -9689,8 +10416,14 @@ def main():
             if re.search(r"[a-f0-9A-F]{32}:[a-f0-9A-F]{32}:::", hcatHashFileLine):
                 pwdump_format = True
                 print("PWDUMP format detected...")
-                # Detect computer accounts (usernames ending with $)
-                computer_count = _count_computer_accounts(hcatHashFile)
+                # One pass counts the computer accounts (usernames ending
+                # with $), writes the filtered copy in case it is wanted, and
+                # collects the NT and LM values for either answer.
+                filtered_path = f"{hcatHashFile}.filtered"
+                _preprocessing_temp_files.append(filtered_path)
+                scan = _scan_pwdump(hcatHashFile, filtered_path)
+                include_computers = True
+                computer_count = scan.computer_accounts
                 if computer_count > 0:
                     print(
                         f"Detected {computer_count} computer account(s)"
@@ -9700,24 +10433,29 @@ def main():
                         "Would you like to ignore computer accounts? (Y) ", "Y"
                     )
                     if filter_choice.upper() == "Y":
-                        filtered_path = f"{hcatHashFile}.filtered"
-                        _preprocessing_temp_files.append(filtered_path)
-                        removed = _filter_computer_accounts(hcatHashFile, filtered_path)
-                        print(f"Removed {removed} computer account(s).")
-                        hcatHashFile = filtered_path
+                        print(f"Removed {computer_count} computer account(s).")
+                        hcatHashFile = scan.filtered_path
+                        include_computers = False
                         # Keep this file - remove from cleanup list
                         _preprocessing_temp_files.remove(filtered_path)
+                if include_computers:
+                    with contextlib.suppress(OSError):
+                        os.remove(filtered_path)
+                    _preprocessing_temp_files.remove(filtered_path)
                 print("Parsing NT hashes...")
-                _write_field_sorted_unique(hcatHashFile, f"{hcatHashFile}.nt", 4)
+                _write_sorted_lines(
+                    f"{hcatHashFile}.nt", scan.nt_hashes(include_computers)
+                )
                 print("Parsing LM hashes...")
-                _write_field_sorted_unique(hcatHashFile, f"{hcatHashFile}.lm", 3)
+                lm_hashes = scan.lm_hashes(include_computers)
+                _write_sorted_lines(f"{hcatHashFile}.lm", lm_hashes)
                 if (
-                    (lineCount(hcatHashFile + ".lm") == 1)
+                    (len(lm_hashes) == 1)
                     and (
                         hcatHashFileLine.split(":")[2].lower()
                         != "aad3b435b51404eeaad3b435b51404ee"
                     )
-                ) or (lineCount(hcatHashFile + ".lm") > 1):
+                ) or (len(lm_hashes) > 1):
                     lmHashesFound = True
                     lmChoice = _auto_input(
                         "LM hashes identified. Would you like to brute force"
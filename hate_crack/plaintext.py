@@ -61,11 +61,13 @@ def is_gzipped(path: str) -> bool:
 # SHA256 (64), SHA384 (96), SHA512 (128).
 HEX_HASH_LENGTHS = frozenset({16, 32, 40, 48, 56, 64, 96, 128})
 
-_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+_HEX_DIGITS = "0123456789abcdefABCDEF"
 
 
 def _is_hex(value):
-    return bool(value) and all(c in _HEX_DIGITS for c in value)
+    # strip() removes every hex digit in C, where a per-character all() ran a
+    # Python generator over each digest of a cracked corpus.
+    return bool(value) and not value.strip(_HEX_DIGITS)
 
 
 def is_hash_token(token):
@@ -218,3 +220,91 @@ def usable_plaintext(raw, *, keep_whitespace=False):
     # Neither matched: nothing here says the leading whitespace is anything but
     # part of the password, so keep the line as it came in.
     return text
+
+
+# Bytes read at a time by iter_usable_plaintexts().
+READ_BLOCK = 4 * 1024 * 1024
+
+
+def usable_plaintexts(
+    block, *, encoding="latin-1", errors="strict", keep_whitespace=False
+):
+    """Return :func:`usable_plaintext` of every line in *block*, blanks dropped.
+
+    *block* is raw bytes holding whole lines; its last line need not end in a
+    newline. Lines are split as a text-mode file splits them -- at LF, CR or
+    CRLF -- so every result is exactly what the single-line function returns
+    for the same line read through ``open(path, encoding=encoding)``.
+
+    The block is decoded once, and a block with no colon and no ``$HEX[``
+    anywhere in it -- a plain wordlist -- needs neither undo step, so its
+    lines are only stripped, without a Python-level loop. Otherwise lines
+    without either, and ``hash:plain`` lines with a hex digest, are handled
+    inline; only the rest go through :func:`usable_plaintext`.
+    """
+    text = block.decode(encoding, errors)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = text.split("\n")
+    if ":" not in text and "$HEX[" not in text:
+        if keep_whitespace:
+            # isspace() is what strip() strips, so this is the blank check.
+            return [line for line in lines if line and not line.isspace()]
+        return list(filter(None, map(str.strip, lines)))
+    found = []
+    for line in lines:
+        if "$HEX[" in line:
+            pw = usable_plaintext(line, keep_whitespace=keep_whitespace)
+        elif ":" not in line:
+            if keep_whitespace:
+                pw = "" if line.isspace() else line
+            else:
+                pw = line.strip()
+        elif keep_whitespace or line.count(":") > 1:
+            pw = usable_plaintext(line, keep_whitespace=keep_whitespace)
+        else:
+            # hashcat's "hash:plain", inlined: with one colon and no wrapper,
+            # strip_hash_prefix() only has to decide whether the first field is
+            # a hex digest. A crypt-style field still goes the long way.
+            body = line.strip()
+            head, _, tail = body.partition(":")
+            if head.startswith("$"):
+                pw = usable_plaintext(line)
+            elif len(head) in HEX_HASH_LENGTHS and not head.strip(_HEX_DIGITS):
+                pw = tail
+            else:
+                pw = body
+        if pw:
+            found.append(pw)
+    return found
+
+
+def iter_usable_plaintexts(
+    fh, *, encoding="latin-1", errors="strict", keep_whitespace=False
+):
+    """Yield the password on every line of binary file *fh*, blanks skipped.
+
+    Reads :data:`READ_BLOCK` bytes at a time and hands each run of whole lines
+    to :func:`usable_plaintexts`. A line cut by the block boundary is carried
+    into the next block, as is a final CR that may yet pair with an LF.
+    """
+    pending = b""
+    for chunk in iter(lambda: fh.read(READ_BLOCK), b""):
+        data = pending + chunk
+        cut = data.rfind(b"\n") + 1
+        if not cut:
+            # No LF at all: a CR-terminated file. A CR short of the last byte
+            # cannot be the first half of a CRLF.
+            cut = data.rfind(b"\r", 0, len(data) - 1) + 1
+        pending = data[cut:]
+        if cut:
+            yield from usable_plaintexts(
+                data[:cut],
+                encoding=encoding,
+                errors=errors,
+                keep_whitespace=keep_whitespace,
+            )
+    if pending:
+        yield from usable_plaintexts(
+            pending, encoding=encoding, errors=errors, keep_whitespace=keep_whitespace
+        )
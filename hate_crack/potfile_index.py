@@ -0,0 +1,341 @@
+"""Indexed, in-process answer to ``hashcat --show`` for unsalted fast modes.
+
+``_run_hashcat_show`` runs at startup and again from ``check_potfile``,
+``combine_ntlm_output``, ``restore_from_potfile`` and twice inside
+``hcatLMtoNT``. Every one of those launches hashcat, which initialises its
+compute backend and then parses the *entire* potfile just to print the handful
+of lines that match the hash list. Against a shared potfile of tens of
+gigabytes that is minutes per call, all of it spent re-reading lines that were
+already read last time.
+
+This module keeps a SQLite copy of the potfile keyed by raw digest bytes, fed
+incrementally from the byte offset it last consumed (hashcat only ever appends
+to a potfile). A ``--show`` for a hash list then becomes one indexed lookup per
+hash. The offset is trusted on the same terms as
+:mod:`hate_crack.cracked_index`: same inode, at least that long, same bytes
+just before the offset. Anything else rebuilds from byte 0.
+
+Only modes whose hash is a bare hex digest are answered here -- there is no
+salt to parse and no per-mode canonicalisation beyond lowercasing, so the
+potfile's first field *is* the lookup key. Everything else (salted modes,
+``--username`` hash lists, a store that cannot be opened) returns None and the
+caller falls back to hashcat, which remains the authority.
+
+**Why SQLite rather than a sorted digest file:** a sorted file has to be
+re-merged on every append, and hashcat appends after every crack. A primary
+key absorbs appends in place, deduplicates repeat cracks for free, and
+``sqlite3`` is already what :mod:`hate_crack.attack_coverage` uses.
+"""
+
+import binascii
+import hashlib
+import os
+import sqlite3
+from pathlib import Path
+from typing import Iterable
+
+INDEX_DIRNAME = "potfile_index"
+
+# hashcat mode -> hex length of one hash line in the hash list. LM (3000) is
+# 32 hex on input but cracked and potted as two independent 16-hex halves.
+SUPPORTED_MODES: dict[str, int] = {
+    "0": 32,
+    "100": 40,
+    "900": 32,
+    "1000": 32,
+    "1400": 64,
+    "1700": 128,
+    "3000": 32,
+}
+
+# Digest lengths (in hex) a potfile key may have to be worth indexing: the
+# modes above plus the 16-hex LM half.
+_INDEXED_HEX_LENGTHS = frozenset({16, 32, 40, 64, 128})
+
+_READ_CHUNK = 8 * 1024 * 1024
+
+# Same probe as cracked_index: enough to notice a same-length rewrite.
+_TAIL_PROBE_BYTES = 4096
+
+# Above this much unread potfile, say so before going quiet for a while.
+_LARGE_INGEST_NOTICE_BYTES = 1024 * 1024 * 1024
+
+# Well under SQLite's default 999 bound-parameter limit.
+_LOOKUP_BATCH = 500
+
+_HEX_DIGITS = frozenset(b"0123456789abcdef")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pot (
+    digest BLOB PRIMARY KEY,
+    plain  BLOB NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS state (
+    id          INTEGER PRIMARY KEY CHECK (id = 1),
+    dev         INTEGER NOT NULL,
+    ino         INTEGER NOT NULL,
+    offset      INTEGER NOT NULL,
+    tail_sha256 TEXT NOT NULL
+);
+"""
+
+
+def supports_mode(hash_type) -> bool:
+    """True if ``--show`` for ``hash_type`` can be answered from the index."""
+    return str(hash_type) in SUPPORTED_MODES
+
+
+def _index_dir() -> Path:
+    # Beside the coverage store under ~/.hate_crack.
+    return Path(os.path.expanduser("~")) / ".hate_crack" / INDEX_DIRNAME
+
+
+def default_db_path(potfile_path: str) -> Path:
+    """One store per potfile, named by a digest of its absolute path."""
+    real = os.path.realpath(os.path.expanduser(potfile_path))
+    name = hashlib.sha256(real.encode("utf-8")).hexdigest()[:16]
+    return _index_dir() / f"{name}.sqlite3"
+
+
+def _digest_key(field: bytes) -> bytes | None:
+    """Raw digest bytes of a hex potfile/hash-list field, or None."""
+    field = field.strip().lower()
+    if len(field) not in _INDEXED_HEX_LENGTHS or not _HEX_DIGITS.issuperset(field):
+        return None
+    return binascii.unhexlify(field)
+
+
+def _unwrap_hex(plain: bytes) -> tuple[bytes, bool]:
+    """Raw bytes of a potted plaintext, and whether it was ``$HEX[...]``."""
+    if plain.startswith(b"$HEX[") and plain.endswith(b"]"):
+        try:
+            return binascii.unhexlify(plain[5:-1]), True
+        except (binascii.Error, ValueError):
+            pass
+    return plain, False
+
+
+def _join_lm_halves(first: bytes, second: bytes) -> bytes:
+    """Combine two potted LM half plaintexts the way ``--show`` prints them.
+
+    If either half needed ``$HEX[...]`` in the potfile, so does the whole.
+    """
+    raw_first, hex_first = _unwrap_hex(first)
+    raw_second, hex_second = _unwrap_hex(second)
+    if hex_first or hex_second:
+        return b"$HEX[" + binascii.hexlify(raw_first + raw_second) + b"]"
+    return first + second
+
+
+class PotfileIndex:
+    """SQLite-backed digest -> plaintext index of one potfile.
+
+    Like :class:`hate_crack.attack_coverage.CoverageStore`, every method
+    swallows :class:`sqlite3.Error`, but here the degraded answer is None --
+    "ask hashcat" -- rather than an empty result, because an empty ``--show``
+    is a real answer its callers act on.
+    """
+
+    def __init__(self, potfile_path: str, db_path: Path | str | None = None):
+        self.potfile_path = potfile_path
+        self._path = (
+            Path(db_path) if db_path is not None else default_db_path(potfile_path)
+        )
+        self._conn: sqlite3.Connection | None = None
+
+    # -- connection --------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection | None:
+        if self._conn is not None:
+            return self._conn
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self._path), timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            conn.commit()
+        except (sqlite3.Error, OSError):
+            return None
+        self._conn = conn
+        return conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+    # -- ingestion ---------------------------------------------------------
+
+    @staticmethod
+    def _tail_digest(f, offset: int) -> str:
+        start = max(0, offset - _TAIL_PROBE_BYTES)
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+    def _resume_offset(self, conn: sqlite3.Connection, st, f) -> int:
+        """Where ingestion can resume, after wiping a stale index if need be."""
+        row = conn.execute(
+            "SELECT dev, ino, offset, tail_sha256 FROM state WHERE id = 1"
+        ).fetchone()
+        if row is not None:
+            dev, ino, offset, tail = row
+            if (
+                (dev, ino) == (st.st_dev, st.st_ino)
+                and offset <= st.st_size
+                and self._tail_digest(f, offset) == tail
+            ):
+                return offset
+        with conn:
+            conn.execute("DELETE FROM pot")
+            conn.execute("DELETE FROM state")
+        return 0
+
+    def refresh(self) -> int | None:
+        """Ingest complete potfile lines appended since the last call.
+
+        Returns the number of lines read, or None when the index is unusable
+        (potfile missing, store unavailable). Each chunk commits its rows and
+        the new offset together, so an interrupted first build resumes rather
+        than restarting.
+        """
+        conn = self._connect()
+        if conn is None:
+            return None
+        try:
+            f = open(self.potfile_path, "rb")
+        except OSError:
+            return None
+        try:
+            with f:
+                st = os.fstat(f.fileno())
+                offset = self._resume_offset(conn, st, f)
+                if st.st_size - offset >= _LARGE_INGEST_NOTICE_BYTES:
+                    print(
+                        f"[*] Indexing {(st.st_size - offset) / 1e9:.1f} GB of "
+                        f"{os.path.basename(self.potfile_path)}; later lookups "
+                        "only read what hashcat appends."
+                    )
+                consumed = 0
+                f.seek(offset)
+                pending = b""
+                while chunk := f.read(_READ_CHUNK):
+                    pending += chunk
+                    cut = pending.rfind(b"\n")
+                    if cut < 0:
+                        continue
+                    complete, pending = pending[: cut + 1], pending[cut + 1 :]
+                    rows = []
+                    for raw in complete.splitlines():
+                        consumed += 1
+                        field, sep, plain = raw.rstrip(b"\r").partition(b":")
+                        if not sep:
+                            continue
+                        key = _digest_key(field)
+                        if key is not None:
+                            rows.append((key, plain))
+                    offset += len(complete)
+                    tail = self._tail_digest(f, offset)
+                    f.seek(offset + len(pending))
+                    with conn:
+                        conn.executemany(
+                            "INSERT OR IGNORE INTO pot (digest, plain) VALUES (?, ?)",
+                            rows,
+                        )
+                        conn.execute(
+                            "INSERT OR REPLACE INTO state"
+                            " (id, dev, ino, offset, tail_sha256)"
+                            " VALUES (1, ?, ?, ?, ?)",
+                            (st.st_dev, st.st_ino, offset, tail),
+                        )
+                if offset == 0:
+                    # Nothing complete yet: still record the identity so an
+                    # empty potfile is not "rebuilt" on every call.
+                    with conn:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO state"
+                            " (id, dev, ino, offset, tail_sha256)"
+                            " VALUES (1, ?, ?, 0, ?)",
+                            (st.st_dev, st.st_ino, self._tail_digest(f, 0)),
+                        )
+        except sqlite3.Error:
+            return None
+        return consumed
+
+    # -- lookup ------------------------------------------------------------
+
+    def lookup(self, digests: Iterable[bytes]) -> dict[bytes, bytes] | None:
+        """Potted plaintext for each of ``digests`` that has one."""
+        conn = self._connect()
+        if conn is None:
+            return None
+        keys = list(dict.fromkeys(digests))
+        found: dict[bytes, bytes] = {}
+        try:
+            for start in range(0, len(keys), _LOOKUP_BATCH):
+                batch = keys[start : start + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                found.update(
+                    conn.execute(
+                        f"SELECT digest, plain FROM pot WHERE digest IN ({placeholders})",
+                        batch,
+                    )
+                )
+        except sqlite3.Error:
+            return None
+        return found
+
+    def show(self, hash_type, hash_file: str) -> list[str] | None:
+        """The lines ``hashcat --show -m hash_type hash_file`` would print.
+
+        One ``hash:plain`` line per distinct cracked hash, in hash-list order
+        (hashcat deduplicates its hash list on load, too). Lines that do not
+        parse as this mode's digest are skipped, as hashcat's own parse
+        errors are by ``_run_hashcat_show``. An LM hash is shown only once
+        both of its halves are potted. Returns None whenever hashcat must be
+        asked instead.
+        """
+        mode = str(hash_type)
+        width = SUPPORTED_MODES.get(mode)
+        if width is None:
+            return None
+        hashes: dict[bytes, None] = {}
+        try:
+            with open(hash_file, "rb") as f:
+                for raw in f:
+                    field = raw.strip().lower()
+                    if len(field) == width and _HEX_DIGITS.issuperset(field):
+                        hashes[field] = None
+        except OSError:
+            return None
+        if self.refresh() is None:
+            return None
+
+        if mode == "3000":
+            wanted = (
+                binascii.unhexlify(h[i : i + 16]) for h in hashes for i in (0, 16)
+            )
+        else:
+            wanted = (binascii.unhexlify(h) for h in hashes)
+        found = self.lookup(wanted)
+        if found is None:
+            return None
+
+        lines = []
+        for h in hashes:
+            if mode == "3000":
+                first = found.get(binascii.unhexlify(h[:16]))
+                second = found.get(binascii.unhexlify(h[16:]))
+                if first is None or second is None:
+                    continue
+                plain = _join_lm_halves(first, second)
+            else:
+                plain = found.get(binascii.unhexlify(h))
+                if plain is None:
+                    continue
+            lines.append((h + b":" + plain).decode("utf-8", errors="ignore"))
+        return lines
@@ -70,6 +70,17 @@ percentages are relative to those, and both ``coverage.txt`` and the run's
 console output say so. Passing ``max_unique=None`` restores the exact,
 unbounded behaviour for anyone who has the memory to spare.
 
+Tier pruning keeps the surviving counts exact, but what it discards depends on
+when each check happens to fire, and nothing bounds how far the ranking below
+the cut has moved. ``heavy_hitters=True`` trades that for a guarantee: each
+counter becomes a Misra-Gries sketch (:class:`_HeavyHitters`) of at most
+``max_unique`` keys. A key's stored count is an *over*-estimate by at most the
+sketch's ``floor``, which never exceeds ``passwords / (max_unique + 1)`` --
+``passwords / (max_unique // shards + 1)`` for a read split into shards -- and
+every key seen more often than that is guaranteed to be kept. The rule file
+cut-offs are then chosen on the guaranteed lower bounds, and ``coverage.txt``
+reports the bracket each one covers.
+
 The literal fallback, and what it does and does not mean
 -------------------------------------------------------
 
@@ -105,9 +116,17 @@ The limits themselves, for completeness:
   missing coverage.
 """
 
+import contextlib
+import gzip
+import hashlib
 import itertools
+import json
 import os
+import pickle
+import re
+import time
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from typing import NamedTuple
 
 from hate_crack.plaintext import is_gzipped, looks_like_hash_line, usable_plaintext
@@ -141,6 +160,30 @@ MAX_UNIQUE_KEYS = 20_000_000
 # can add at most a million keys to a counter, which is 5% of the default bound.
 _PRUNE_CHECK_INTERVAL = 1_000_000
 
+# Smallest byte range worth handing to its own worker process. Below this the
+# pool's startup and the pickled Counters coming back cost more than the scan
+# saves, so a small corpus is read in-process exactly as before.
+_MIN_SHARD_BYTES = 16 * 1024 * 1024
+
+# How often a checkpointed scan persists its progress. Checked only at the
+# prune cadence above, so the clock is read once per million lines rather than
+# per password. Ten minutes bounds what an OOM kill or Ctrl-C can cost while
+# keeping the write -- a compressed copy of both counters -- rare enough not to
+# matter next to the read.
+_CHECKPOINT_SECONDS = 600
+
+# Bumped whenever the pickled layout of a checkpoint changes, so a file written
+# by an older version is discarded rather than misread.
+_CHECKPOINT_VERSION = 1
+
+CHECKPOINT_MANIFEST = "checkpoint.json"
+
+# An incremental derivation's state directory: the manifest is written last and
+# is what makes the counters beside it valid (see _load_state).
+STATE_MANIFEST = "state.json"
+
+_HASH_CHUNK = 4 * 1024 * 1024
+
 
 def _prune_counter(counter, max_unique):
     """Discard the lowest-frequency keys of *counter* until it fits *max_unique*.
@@ -213,6 +256,97 @@ def _prune_counter(counter, max_unique):
     return (len(doomed), observations)
 
 
+class _HeavyHitters(Counter):
+    """A Counter kept as a Misra-Gries heavy-hitter sketch.
+
+    Rather than decrementing every survivor on each prune, the cumulative
+    decrement is kept once, as ``floor``, and a key first seen after a prune
+    starts at ``floor + 1`` instead of 1 (what SpaceSaving calls inheriting
+    the minimum). A stored value ``v`` therefore brackets the key's true count
+    as ``v - floor <= true <= v``, and ranking by ``v`` is the SpaceSaving
+    ranking. ``__missing__`` is all it takes, so the scan loop's
+    ``counts[key] += 1`` is unchanged and costs nothing extra per line.
+
+    Counter's pickling drops instance attributes, and a shard's sketch is
+    useless without its floor, hence ``__reduce__``.
+    """
+
+    floor = 0
+
+    def __missing__(self, key):
+        return self.floor
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),), {"floor": self.floor}
+
+
+def _prune_sketch(counter, max_unique):
+    """Misra-Gries decrement of *counter* down to at most *max_unique* keys.
+
+    Raises the floor to the value of the (max_unique+1)-th largest key and
+    drops every key at or below it. At least ``max_unique + 1`` keys each give
+    up that increase, so the floor can only ever reach ``observations /
+    (max_unique + 1)``: the standard Misra-Gries bound, whatever the read order.
+
+    Returns ``(keys_discarded, 0)``. A sketch does not know how many
+    observations it discarded; its error bound is ``counter.floor`` instead.
+    """
+    if max_unique is None or len(counter) <= max_unique:
+        return (0, 0)
+    histogram = Counter(counter.values())
+    kept = 0
+    threshold = counter.floor
+    for value in sorted(histogram, reverse=True):
+        if kept + histogram[value] > max_unique:
+            threshold = value
+            break
+        kept += histogram[value]
+    doomed = [key for key, value in counter.items() if value <= threshold]
+    for key in doomed:
+        del counter[key]
+    counter.floor = max(counter.floor, threshold)
+    return (len(doomed), 0)
+
+
+def _prune(counter, max_unique):
+    if isinstance(counter, _HeavyHitters):
+        return _prune_sketch(counter, max_unique)
+    return _prune_counter(counter, max_unique)
+
+
+def _merge_counts(into, other):
+    """``into.update(other)``, merging sketch floors when they are sketches.
+
+    A key missing from one sketch may still have been seen up to that sketch's
+    floor times, so it is credited with that floor (keeping the upper bound
+    honest) and the merged floor is the sum of the two. Key order is kept, as
+    ``Counter.update`` keeps it.
+
+    The summed floor still obeys a Misra-Gries bound for the combined
+    observations. A sketch pruned to a budget of *b* keys satisfies ``floor *
+    (b + 1)`` plus its counts above the floor <= its observations. Both sides
+    add up across a merge, so the merged sketch satisfies it for the smallest
+    budget of the two, and a later :func:`_prune_sketch` to any budget of at
+    least that preserves it. Shards pruned to ``max_unique // shards`` and
+    merged under ``max_unique`` therefore end with a floor of at most
+    ``passwords / (max_unique // shards + 1)``.
+    """
+    if not isinstance(into, _HeavyHitters):
+        into.update(other)
+        return
+    into_floor = into.floor
+    other_floor = other.floor
+    if other_floor:
+        for key in into:
+            into[key] += other_floor
+    for key, hits in other.items():
+        if key in into:
+            into[key] += hits - other_floor
+        else:
+            into[key] = into_floor + hits
+    into.floor = into_floor + other_floor
+
+
 def _pos(n):
     """Return the rule-alphabet character for index *n*, or None if unaddressable."""
     return POS[n] if 0 <= n < len(POS) else None
@@ -345,8 +479,19 @@ def validate_rule(rule):
         return False
     if any(not (" " <= c <= "~") for c in rule):
         return False
+    ops = parse_rule(rule)
+    return ops is not None and 0 < len(ops) <= MAX_RULE_FUNCTIONS
 
-    count = 0
+
+def parse_rule(rule):
+    """Split *rule* into ``(op, args)`` pairs, or None if hashcat would reject it.
+
+    Covers every op in :data:`RULE_OP_ARGS`, where :func:`count_ops` knows only
+    the ones :func:`derive` emits. Each argument is decoded, so ``$\x41`` and
+    ``$A`` parse alike. None for an unknown op, an argument that runs off the
+    end of the line, or a position outside :data:`POS`.
+    """
+    ops = []
     i = 0
     while i < len(rule):
         # hashcat allows functions to be separated by spaces for readability.
@@ -357,25 +502,140 @@ def validate_rule(rule):
             continue
         kinds = RULE_OP_ARGS.get(rule[i])
         if kinds is None:
-            return False
+            return None
         # Arguments are measured rather than counted, because hashcat decodes
         # \xNN to a single byte: an escape is one argument four characters wide.
+        args = []
         at = i + 1
         for kind in kinds:
             # The op and all of its arguments must fit inside the line.
             if at >= len(rule):
-                return False
+                return None
             decoded, width = _read_arg(rule, at)
             if kind == "p" and decoded not in POS:
-                return False
+                return None
+            args.append(decoded)
             at += width
-        if at > len(rule):
-            return False
+        ops.append((rule[i], tuple(args)))
         i = at
-        count += 1
-        if count > MAX_RULE_FUNCTIONS:
-            return False
-    return count > 0
+    return ops
+
+
+# Ops that change only the case of letters, leaving the length and every other
+# character where it was -- and, of those, the ones whose result does not
+# depend on the case they are given. Any case op directly before one of the
+# second kind is dead: ``ul`` is ``l`` and ``T0c`` is ``c``. hashcat's case ops
+# all touch ASCII letters only, so this holds for every byte.
+_CASE_OPS = frozenset("lucCtTEe")
+_CASE_RESETS = frozenset("lucCEe")
+
+# Ops undone by the op given here when it follows with the same arguments:
+# ``rr``, ``tt``, ``kk``, ``KK`` and ``*NM*NM`` are each the identity, as are
+# ``{}`` and ``}{``. Toggles of one position are handled with the T run below.
+_UNDONE_BY = {"r": "r", "t": "t", "k": "k", "K": "K", "*": "*", "{": "}", "}": "{"}
+
+# Every character a rewrite below starts from. A rule holding none of them --
+# ``$1$2``, ``sa@``, ``^x]`` -- is already canonical, and skips the parse.
+_MAY_REWRITE = re.compile(r"[ :\\pDi*rtkK{}TlucCEe]")
+
+
+def canonical_rule(rule):
+    """Return one spelling of *rule* shared by every rule it is equivalent to.
+
+    Two rules with the same canonical form produce the same candidate from
+    every word, so coverage keys a rule on this and :func:`dedupe_rules` keeps
+    one rule per form. Only rewrites that hold for every word, at any length,
+    are made:
+
+    * ``:`` no-ops and the spaces between functions are dropped, and an
+      argument spelled as an escape is written as its byte (only CR and LF
+      stay escaped; see :func:`_escape_arg`).
+    * ``p1`` is ``d``, ``D0`` is ``[``, ``i0X`` is ``^X``. ``*NM`` is written
+      with the lower position first, and ``*NN`` is dropped.
+    * A case op directly before ``l``, ``u``, ``c``, ``C``, ``E`` or ``e`` is
+      dropped.
+    * A pair of ops that undo each other is dropped (see :data:`_UNDONE_BY`),
+      and so is the pair that leaves adjacent: ``rttr`` is ``:``.
+    * A run of ``T`` toggles becomes its positions toggled an odd number of
+      times, in order: ``T2T0`` and ``T0T2`` are both ``T0T2``.
+
+    Anything that does not parse -- an op this module does not know, or a
+    malformed line -- comes back unchanged, so it still has a stable key, and
+    so does a rule over hashcat's length or function limits. A rule that
+    reduces to nothing is ``:``.
+    """
+    if not _MAY_REWRITE.search(rule):
+        return rule
+    # A rule hashcat rejects tries nothing, so it must not share a form with
+    # the valid rule it would otherwise reduce to.
+    if len(rule) > MAX_RULE_LENGTH or "\r" in rule or "\n" in rule:
+        return rule
+    ops = parse_rule(rule)
+    if ops is None or len(ops) > MAX_RULE_FUNCTIONS:
+        return rule
+    stack = []
+    for op, args in ops:
+        if op == ":":
+            continue
+        if op == "p" and args == ("1",):
+            op, args = "d", ()
+        elif op == "D" and args == ("0",):
+            op, args = "[", ()
+        elif op == "i" and args[0] == "0":
+            op, args = "^", args[1:]
+        elif op == "*":
+            if args[0] == args[1]:
+                continue
+            args = tuple(sorted(args, key=POS.index))
+
+        if op in _CASE_RESETS:
+            while stack and stack[-1][0] in _CASE_OPS:
+                stack.pop()
+        elif op == "T":
+            start = len(stack)
+            while start and stack[start - 1][0] == "T":
+                start -= 1
+            toggled = {prev[1][0] for prev in stack[start:]} ^ {args[0]}
+            del stack[start:]
+            stack.extend(("T", (p,)) for p in sorted(toggled, key=POS.index))
+            continue
+        elif stack and stack[-1] == (_UNDONE_BY.get(op), args):
+            stack.pop()
+            continue
+        stack.append((op, args))
+
+    canonical = "".join(op + "".join(map(_escape_arg, args)) for op, args in stack)
+    if not canonical:
+        return ":"
+    # A backslash argument written beside what follows could read back as an
+    # escape that was never there; such a rule keeps its own spelling.
+    if "\\" in canonical and parse_rule(canonical) != stack:
+        return rule
+    return canonical
+
+
+def dedupe_rules(rules):
+    """Return *rules* less every rule equivalent to an earlier one.
+
+    Equivalence is :func:`canonical_rule`'s, and the first spelling of each
+    is the one kept, in its original position, so a file sorted by
+    productivity stays sorted. Blank lines and ``#`` comments are kept as they
+    are. Returns ``(kept, dropped)``, the second counting the rules removed.
+    """
+    kept = []
+    seen = set()
+    dropped = 0
+    for rule in rules:
+        if not rule.strip() or rule.lstrip().startswith("#"):
+            kept.append(rule)
+            continue
+        canonical = canonical_rule(rule)
+        if canonical in seen:
+            dropped += 1
+            continue
+        seen.add(canonical)
+        kept.append(rule)
+    return kept, dropped
 
 
 # Tie-break order among equally-cheap case encodings, per :func:`_case_ops`.
@@ -788,6 +1048,80 @@ class _Scan(NamedTuple):
     pruned_rule_hits: int
 
 
+@contextlib.contextmanager
+def corpus_lines(corpus_path, start=0, end=None):
+    """Yield an iterable of the corpus lines in ``[start, end)``.
+
+    The whole file is read in text mode, as it always has been. A byte range
+    has to be read in binary to be seekable and bounded, so
+    :class:`_RangeReader` reproduces text mode's universal-newline splitting
+    on top of it: a shard yields exactly the lines the whole-file read would
+    have yielded for the same bytes.
+
+    Public, with :func:`shard_ranges`, because :mod:`hate_crack.corpus_stats`
+    splits and reads a corpus the same way for its profile.
+    """
+    if end is None and start == 0:
+        with open(corpus_path, encoding="latin-1") as fh:
+            yield fh
+        return
+    with open(corpus_path, "rb") as fh:
+        fh.seek(start)
+        if end is None:
+            end = os.fstat(fh.fileno()).st_size
+        yield _RangeReader(fh, start, end)
+
+
+class _RangeReader:
+    """Lines of binary *fh* from *start* until *end*, as text mode would split
+    them, tracking the byte offset each one came from.
+
+    A binary file splits on LF only. Text mode also ends a line at a lone CR
+    and folds CRLF into one terminator, so a line holding a CR anywhere but
+    just before its LF is re-split here. Such lines are rare, so the common
+    case costs one ``count``. CRLF is folded to LF as text mode folds it.
+
+    ``line_offset`` is where the raw line behind the current text line starts,
+    and ``at_line_start`` says whether the current text line is the first one
+    split out of it: only there is ``line_offset`` a resumable position (see
+    :func:`_save_checkpoint`).
+    """
+
+    def __init__(self, fh, start, end):
+        self._fh = fh
+        self._end = end
+        self.line_offset = start
+        self.at_line_start = True
+
+    def __iter__(self):
+        offset = self.line_offset
+        end = self._end
+        for raw in self._fh:
+            if offset >= end:
+                break
+            self.line_offset = offset
+            self.at_line_start = True
+            offset += len(raw)
+            line = raw.decode("latin-1")
+            crs = line.count("\r")
+            if crs == 0:
+                yield line
+                continue
+            if crs == 1 and line.endswith("\r\n"):
+                yield line[:-2] + "\n"
+                continue
+            parts = line.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+            last = parts.pop()
+            pieces = [part + "\n" for part in parts]
+            if last:
+                pieces.append(last)
+            for piece in pieces:
+                yield piece
+                self.at_line_start = False
+        # Exhausted: everything up to here has been handed out.
+        self.line_offset = offset
+
+
 def _scan_corpus(
     corpus_path,
     ascii_only,
@@ -796,6 +1130,11 @@ def _scan_corpus(
     dictionary=None,
     min_hits=2,
     count_rules=True,
+    start=0,
+    end=None,
+    heavy_hitters=False,
+    checkpoint=None,
+    checkpoint_key=None,
 ):
     """Read *corpus_path* once, deriving a baseword and rule for each password.
 
@@ -804,35 +1143,106 @@ def _scan_corpus(
     the rule counter entirely, which is what pass 1 of a ``leet_restore`` run
     wants: it needs only the baseword counter, and building a rule counter it
     will throw away would hold a second counter's worth of memory for nothing.
+
+    *start* and *end* restrict the read to one newline-aligned byte range of
+    the file (see :func:`shard_ranges`); the default reads all of it.
+    *heavy_hitters* counts into :class:`_HeavyHitters` sketches instead.
+
+    *checkpoint* is a file this scan saves its progress to every
+    :data:`_CHECKPOINT_SECONDS` and once more when it finishes, and resumes
+    from if it already holds progress saved under the same *checkpoint_key*
+    for the same range. Resuming restores the counters, the statistics and
+    the line count the prune cadence runs on, so a resumed scan returns
+    exactly what an uninterrupted one would have.
     """
-    base_counts = Counter()
-    rule_counts = Counter()
-    total = 0
-    skipped = 0
-    no_letter_literals = 0
-    unrepresentable = 0
-    hash_shaped = 0
-    unwritable_basewords = 0
-    leet_restored = 0
-    selfcheck_failures = []
-    lines_read = 0
-    pruned_basewords = 0
-    pruned_baseword_hits = 0
-    pruned_rules = 0
-    pruned_rule_hits = 0
-
-    with open(corpus_path, encoding="latin-1") as fh:
+    if checkpoint is not None and end is None:
+        end = os.path.getsize(corpus_path)
+    resumed = None
+    if checkpoint is not None:
+        checkpoint_key = (checkpoint_key, start, end)
+        resumed = _load_checkpoint(checkpoint, checkpoint_key)
+    if resumed is not None:
+        start, lines_read, scan = resumed
+        (
+            base_counts,
+            rule_counts,
+            total,
+            skipped,
+            no_letter_literals,
+            unrepresentable,
+            hash_shaped,
+            unwritable_basewords,
+            selfcheck_failures,
+            leet_restored,
+            pruned_basewords,
+            pruned_baseword_hits,
+            pruned_rules,
+            pruned_rule_hits,
+        ) = scan
+    else:
+        counter_type = _HeavyHitters if heavy_hitters else Counter
+        base_counts = counter_type()
+        rule_counts = counter_type()
+        total = 0
+        skipped = 0
+        no_letter_literals = 0
+        unrepresentable = 0
+        hash_shaped = 0
+        unwritable_basewords = 0
+        leet_restored = 0
+        selfcheck_failures = []
+        lines_read = 0
+        pruned_basewords = 0
+        pruned_baseword_hits = 0
+        pruned_rules = 0
+        pruned_rule_hits = 0
+    next_checkpoint = time.monotonic() + _CHECKPOINT_SECONDS
+
+    with corpus_lines(corpus_path, start, end) as fh:
         for line in fh:
             lines_read += 1
-            if max_unique is not None and lines_read % _PRUNE_CHECK_INTERVAL == 0:
-                # Each counter is checked independently: a corpus can blow the
-                # baseword bound long before the rule bound, or the reverse.
-                keys, hits = _prune_counter(base_counts, max_unique)
-                pruned_basewords += keys
-                pruned_baseword_hits += hits
-                keys, hits = _prune_counter(rule_counts, max_unique)
-                pruned_rules += keys
-                pruned_rule_hits += hits
+            if lines_read % _PRUNE_CHECK_INTERVAL == 0:
+                if max_unique is not None:
+                    # Each counter is checked independently: a corpus can blow
+                    # the baseword bound long before the rule bound, or the
+                    # reverse.
+                    keys, hits = _prune(base_counts, max_unique)
+                    pruned_basewords += keys
+                    pruned_baseword_hits += hits
+                    keys, hits = _prune(rule_counts, max_unique)
+                    pruned_rules += keys
+                    pruned_rule_hits += hits
+                # Saved after the prune, while the counters are at their
+                # smallest, and as of *before* this line: it has been read but
+                # not yet counted, so the resume point is the start of it.
+                if (
+                    checkpoint is not None
+                    and fh.at_line_start
+                    and time.monotonic() >= next_checkpoint
+                ):
+                    _save_checkpoint(
+                        checkpoint,
+                        checkpoint_key,
+                        fh.line_offset,
+                        lines_read - 1,
+                        _Scan(
+                            base_counts,
+                            rule_counts,
+                            total,
+                            skipped,
+                            no_letter_literals,
+                            unrepresentable,
+                            hash_shaped,
+                            unwritable_basewords,
+                            selfcheck_failures,
+                            leet_restored,
+                            pruned_basewords,
+                            pruned_baseword_hits,
+                            pruned_rules,
+                            pruned_rule_hits,
+                        ),
+                    )
+                    next_checkpoint = time.monotonic() + _CHECKPOINT_SECONDS
             stripped = line.rstrip("\r\n")
             if looks_like_hash_line(stripped.strip()):
                 hash_shaped += 1
@@ -905,7 +1315,7 @@ def _scan_corpus(
             if count_rules:
                 rule_counts[rule] += 1
 
-    return _Scan(
+    scan = _Scan(
         base_counts=base_counts,
         rule_counts=rule_counts,
         total=total,
@@ -921,6 +1331,418 @@ def _scan_corpus(
         pruned_rules=pruned_rules,
         pruned_rule_hits=pruned_rule_hits,
     )
+    if checkpoint is not None:
+        # A finished range is checkpointed too, so a run interrupted later --
+        # in another shard, in pass 2, or while writing -- never reads it again.
+        _save_checkpoint(checkpoint, checkpoint_key, fh.line_offset, lines_read, scan)
+    return scan
+
+
+class _CheckpointUnpickler(pickle.Unpickler):
+    """Unpickler that rebuilds only the types a checkpoint can hold."""
+
+    _ALLOWED = {
+        ("collections", "Counter"),
+        (__name__, "_HeavyHitters"),
+        (__name__, "_Scan"),
+    }
+
+    def find_class(self, module, name):
+        if (module, name) in self._ALLOWED:
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"unexpected {module}.{name} in a checkpoint")
+
+
+def _save_checkpoint(path, key, offset, lines_read, scan):
+    """Write a scan's progress to *path*: resume at byte *offset* with *scan*.
+
+    Pickled, for speed and because it keeps each Counter's key order (which
+    ``most_common`` tie-breaks on), and gzip-compressed at the fastest level:
+    a counter of short password fragments shrinks several-fold for little CPU.
+    Written beside the target and renamed over it, so an interrupt mid-write
+    leaves the previous checkpoint intact. Best effort: a checkpoint that
+    cannot be written costs a resume, not the pass it was protecting.
+    """
+    tmp = path + ".tmp"
+    try:
+        with gzip.open(tmp, "wb", compresslevel=1) as f:
+            pickle.dump(
+                (_CHECKPOINT_VERSION, key, offset, lines_read, scan),
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp, path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+
+
+def _load_checkpoint(path, key):
+    """``(offset, lines_read, scan)`` saved at *path* under *key*, or None.
+
+    Anything unreadable, from another version, or saved for a different
+    derivation is a miss, and the scan starts from the beginning.
+    """
+    try:
+        with gzip.open(path, "rb") as f:
+            version, saved_key, offset, lines_read, scan = _CheckpointUnpickler(
+                f
+            ).load()
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError):
+        return None
+    if version != _CHECKPOINT_VERSION or saved_key != key:
+        return None
+    return offset, lines_read, scan
+
+
+def _checkpoint_key(corpus_path, **options):
+    """What a checkpoint must have been saved under to be resumed from.
+
+    The corpus's identity (real path, size and mtime, as the Spoonman cache
+    provenance records it) plus every option that changes what a scan counts.
+    JSON-shaped, so it doubles as the checkpoint directory's manifest.
+    """
+    real = os.path.realpath(corpus_path)
+    st = os.stat(real)
+    return {
+        "version": _CHECKPOINT_VERSION,
+        "corpus": real,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        **options,
+    }
+
+
+def _prepare_checkpoints(checkpoint_dir, key):
+    """Make *checkpoint_dir* ready for the derivation *key* describes.
+
+    Returns True if it already holds checkpoints saved for that derivation.
+    Checkpoints for anything else -- another corpus, the same corpus since
+    modified, other options -- are deleted rather than left to accumulate.
+    """
+    manifest = os.path.join(checkpoint_dir, CHECKPOINT_MANIFEST)
+    try:
+        with open(manifest, encoding="utf-8") as f:
+            recorded = json.load(f)
+    except (OSError, ValueError):
+        recorded = None
+    if recorded == key:
+        return any(name.endswith(".ckpt") for name in os.listdir(checkpoint_dir))
+    _clear_checkpoints(checkpoint_dir)
+    try:
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        with open(manifest, "w", encoding="utf-8") as f:
+            json.dump(key, f, indent=2, sort_keys=True)
+            f.write("\n")
+    except OSError:
+        pass
+    return False
+
+
+def _clear_checkpoints(checkpoint_dir):
+    """Delete the checkpoints in *checkpoint_dir*, and it too once empty."""
+    try:
+        names = os.listdir(checkpoint_dir)
+    except OSError:
+        return
+    for name in names:
+        if name == CHECKPOINT_MANIFEST or name.endswith((".ckpt", ".ckpt.tmp")):
+            with contextlib.suppress(OSError):
+                os.remove(os.path.join(checkpoint_dir, name))
+    with contextlib.suppress(OSError):
+        os.rmdir(checkpoint_dir)
+
+
+def _state_key(corpus_path, **options):
+    """What an incremental derivation's state must have been saved under.
+
+    Like :func:`_checkpoint_key` but without the corpus's size and mtime --
+    appending changes both, and it is the prefix hash that vouches for the
+    bytes already counted -- and without ``workers``, which never changes what
+    the merged counters hold.
+    """
+    return {
+        "version": _CHECKPOINT_VERSION,
+        "corpus": os.path.realpath(corpus_path),
+        **options,
+    }
+
+
+def _prefix_digests(path, lengths):
+    """sha256 hex digests of the first *n* bytes of *path*, for each *n*.
+
+    One sequential read, however many lengths are asked for. A length past the
+    end of the file gets None.
+    """
+    digest = hashlib.sha256()
+    digests = {}
+    wanted = sorted(set(lengths))
+    position = 0
+    with open(path, "rb") as fh:
+        for length in wanted:
+            while position < length:
+                chunk = fh.read(min(_HASH_CHUNK, length - position))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                position += len(chunk)
+            digests[length] = digest.hexdigest() if position == length else None
+    return digests
+
+
+def _load_state(state_dir, key, corpus_path, names):
+    """The previous derivation's counters, if *corpus_path* only grew since.
+
+    Returns ``(offset, scans, digest)``: the byte offset the saved counters
+    reach, a dict of the saved :class:`_Scan` per pass name (None when there is
+    nothing usable), and the sha256 of the whole corpus as it stands, which the
+    caller records for next time. The counters are usable only if they were
+    saved under *key*, the corpus is at least *offset* bytes long, and those
+    first *offset* bytes still hash to what was counted -- anything else is a
+    corpus that was rewritten rather than appended to, and the derivation
+    starts again from byte 0. So is one whose counted bytes did not end in an
+    LF: the appended bytes may finish a line that was already counted whole.
+    """
+    size = os.path.getsize(corpus_path)
+    try:
+        with open(os.path.join(state_dir, STATE_MANIFEST), encoding="utf-8") as f:
+            recorded = json.load(f)
+        offset = int(recorded["offset"])
+        matches = recorded["key"] == key and 0 < offset <= size
+        if matches:
+            with open(corpus_path, "rb") as fh:
+                fh.seek(offset - 1)
+                matches = fh.read(1) == b"\n"
+    except (OSError, ValueError, TypeError, KeyError):
+        matches = False
+    if not matches:
+        return 0, None, _prefix_digests(corpus_path, [size])[size]
+    digests = _prefix_digests(corpus_path, [offset, size])
+    if digests[offset] != recorded["sha256"]:
+        return 0, None, digests[size]
+    scans = {}
+    for name in names:
+        saved = _load_checkpoint(
+            os.path.join(state_dir, f"{name}.state"), (key, offset, digests[offset])
+        )
+        if saved is None:
+            return 0, None, digests[size]
+        scans[name] = saved[2]
+    return offset, scans, digests[size]
+
+
+def _begin_state(state_dir):
+    """Invalidate *state_dir* before any of its counters are overwritten."""
+    with contextlib.suppress(OSError):
+        os.remove(os.path.join(state_dir, STATE_MANIFEST))
+    with contextlib.suppress(OSError):
+        os.makedirs(state_dir, exist_ok=True)
+
+
+def _save_state(state_dir, key, offset, digest, name, scan):
+    """Persist pass *name*'s counters, covering the first *offset* bytes."""
+    _save_checkpoint(
+        os.path.join(state_dir, f"{name}.state"), (key, offset, digest), offset, 0, scan
+    )
+
+
+def _commit_state(state_dir, key, offset, digest):
+    """Write the manifest that makes the counters in *state_dir* valid. Best effort."""
+    try:
+        with open(os.path.join(state_dir, STATE_MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(
+                {"key": key, "offset": offset, "sha256": digest},
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+            f.write("\n")
+    except OSError:
+        pass
+
+
+def shard_ranges(corpus_path, shards, start=0, end=None):
+    """Split *corpus_path* into at most *shards* newline-aligned byte ranges.
+
+    Returns ``[(start, end), ...]`` covering ``[start, end)`` -- by default the
+    whole file -- in order, each boundary falling just after an LF. *start*
+    must itself be a line start. Text mode never pairs a CR with the LF
+    before it, so a boundary there never splits what a whole-file read would
+    treat as one line. Ranges are equal by bytes, not by lines, which is close
+    enough on a password corpus whose lines are all about the same length.
+    Read each range with :func:`corpus_lines`.
+    """
+    size = os.path.getsize(corpus_path) if end is None else end
+    bounds = [start]
+    with open(corpus_path, "rb") as fh:
+        for i in range(1, shards):
+            target = start + (size - start) * i // shards
+            if target <= bounds[-1]:
+                continue
+            # Back up one byte so a target that already sits at a line start
+            # stays there instead of skipping a whole line.
+            fh.seek(target - 1)
+            fh.readline()
+            boundary = fh.tell()
+            if boundary >= size:
+                break
+            if boundary > bounds[-1]:
+                bounds.append(boundary)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+# Pass 2's attestation dictionary, installed once per worker process by
+# _init_shard_worker rather than pickled into every task.
+_shard_dictionary = None
+
+
+def _init_shard_worker(dictionary):
+    global _shard_dictionary
+    _shard_dictionary = dictionary
+
+
+def _shard_checkpoint(prefix, start, end):
+    """The checkpoint file for one byte range, or None when not checkpointing.
+
+    Named by its range, so a rerun that splits the corpus differently (another
+    worker count) finds nothing to resume rather than the wrong range.
+    """
+    if prefix is None:
+        return None
+    return f"{prefix}.{start}-{end}.ckpt"
+
+
+def _scan_shard(task):
+    corpus_path, start, end, checkpoint, *options = task
+    (
+        ascii_only,
+        verify,
+        max_unique,
+        min_hits,
+        count_rules,
+        heavy_hitters,
+        checkpoint_key,
+    ) = options
+    return _scan_corpus(
+        corpus_path,
+        ascii_only,
+        verify,
+        max_unique,
+        dictionary=_shard_dictionary,
+        min_hits=min_hits,
+        count_rules=count_rules,
+        start=start,
+        end=end,
+        heavy_hitters=heavy_hitters,
+        checkpoint=checkpoint,
+        checkpoint_key=checkpoint_key,
+    )
+
+
+def _merge_scans(scans, max_unique):
+    """Fold per-shard :class:`_Scan` results into one, in shard order.
+
+    Merging in file order is what keeps the output identical to a
+    single-process read: :func:`_merge_counts` keeps first-insertion order, so
+    every key lands where the whole-file scan would first have seen it, and
+    ``most_common`` breaks ties by exactly that order. The merged counters are
+    pruned after every shard, and what that discards is added to the pruned
+    totals alongside whatever the shards pruned themselves.
+    """
+    scans = iter(scans)
+    merged = next(scans)._asdict()
+    base_counts = merged["base_counts"]
+    rule_counts = merged["rule_counts"]
+    for scan in scans:
+        _merge_counts(base_counts, scan.base_counts)
+        _merge_counts(rule_counts, scan.rule_counts)
+        for name in _Scan._fields[2:]:
+            merged[name] += getattr(scan, name)
+        keys, hits = _prune(base_counts, max_unique)
+        merged["pruned_basewords"] += keys
+        merged["pruned_baseword_hits"] += hits
+        keys, hits = _prune(rule_counts, max_unique)
+        merged["pruned_rules"] += keys
+        merged["pruned_rule_hits"] += hits
+    return _Scan(**merged)
+
+
+def _scan_corpus_sharded(
+    corpus_path,
+    ascii_only,
+    verify,
+    max_unique,
+    workers,
+    dictionary=None,
+    min_hits=2,
+    count_rules=True,
+    heavy_hitters=False,
+    checkpoint=None,
+    checkpoint_key=None,
+    start=0,
+    end=None,
+):
+    """:func:`_scan_corpus` across a process pool, one byte range per worker.
+
+    Falls back to the in-process scan when *workers* is 1 or the corpus is too
+    small to be worth splitting (see :data:`_MIN_SHARD_BYTES`).
+
+    Every worker holds its own pair of counters at once, so each shard is
+    bounded at ``max_unique // shards`` keys rather than ``max_unique``: the
+    keys live across the pool at any moment stay within the one budget
+    :data:`MAX_UNIQUE_KEYS` was sized for, instead of multiplying it by the
+    core count. The merge is then bounded at the full ``max_unique``, and
+    pruned after every shard, so the merged counters never hold more than
+    ``max_unique`` keys plus one shard's share. The price is that a corpus
+    big enough to prune is pruned harder in each shard than a single-process
+    read would prune it, and a sketch's error bound loosens to ``passwords /
+    (max_unique // shards + 1)`` (see :func:`_merge_counts`).
+
+    *checkpoint*, when set, is a path prefix: each range checkpoints to its
+    own file beneath it (see :func:`_shard_checkpoint`). *start* and *end*
+    restrict the whole scan to one byte range, as for :func:`_scan_corpus`.
+    """
+    whole_file = start == 0 and end is None and checkpoint is None
+    size = os.path.getsize(corpus_path) if end is None else end
+    shards = min(workers, (size - start) // _MIN_SHARD_BYTES)
+    ranges = shard_ranges(corpus_path, shards, start, size) if shards > 1 else []
+    if len(ranges) <= 1:
+        return _scan_corpus(
+            corpus_path,
+            ascii_only,
+            verify,
+            max_unique,
+            dictionary=dictionary,
+            min_hits=min_hits,
+            count_rules=count_rules,
+            heavy_hitters=heavy_hitters,
+            checkpoint=_shard_checkpoint(checkpoint, start, size),
+            checkpoint_key=checkpoint_key,
+            start=start,
+            end=None if whole_file else size,
+        )
+    shard_bound = None if max_unique is None else max(max_unique // len(ranges), 1)
+    options = (
+        ascii_only,
+        verify,
+        shard_bound,
+        min_hits,
+        count_rules,
+        heavy_hitters,
+        checkpoint_key,
+    )
+    tasks = [
+        (corpus_path, start, end, _shard_checkpoint(checkpoint, start, end), *options)
+        for start, end in ranges
+    ]
+    with ProcessPoolExecutor(
+        max_workers=len(ranges),
+        initializer=_init_shard_worker,
+        initargs=(dictionary,),
+    ) as pool:
+        # map() yields in submission order, which _merge_scans relies on.
+        return _merge_scans(pool.map(_scan_shard, tasks), max_unique)
 
 
 def generate(
@@ -934,6 +1756,11 @@ def generate(
     leet_restore=True,
     leet_min_hits=2,
     baseword_caps=(),
+    workers=None,
+    heavy_hitters=False,
+    checkpoint_dir=None,
+    state_dir=None,
+    corpus_identity=None,
 ):
     """Derive basewords and rules from *corpus_path*, writing them under *outdir*.
 
@@ -974,6 +1801,59 @@ def generate(
     so can only understate a count, never overstate one. The dictionary is also
     filtered to keys meeting ``leet_min_hits`` before pass 2, which is
     output-neutral for the same reason read in reverse.
+
+    ``workers`` splits each pass across that many processes, one
+    newline-aligned byte range of the corpus apiece (default: one per CPU).
+    The shard counters are merged in file order, so while pruning does not
+    fire every output file is identical to a single-process run. Each shard is
+    bounded at ``max_unique`` divided by the shard count, keeping the pool's
+    total within the same memory budget, so on a corpus big enough to prune a
+    sharded run may prune where a single-process one would not. ``workers=1``
+    reads in-process exactly as before, as does any corpus too small to be
+    worth splitting.
+
+    ``heavy_hitters`` replaces tier pruning with a Misra-Gries sketch of
+    ``max_unique`` keys per counter (see :class:`_HeavyHitters`). Nothing
+    changes until a counter first overflows. After that, every count written
+    may overstate the truth by at most that counter's floor, returned as
+    ``baseword_count_error`` and ``rule_count_error`` and bounded by
+    ``passwords / (max_unique + 1)``, or by ``passwords / (max_unique //
+    shards + 1)`` when a pass is split into shards. The ``rules.top{N}.rule``
+    cut-offs are chosen so that the guaranteed lower bound reaches N% where
+    the sketch allows it. ``cover_bounds`` gives each cut-off's bracket of passwords
+    covered, which ``coverage.txt`` also reports. Pass 1's attestation
+    dictionary is built from the lower bounds, so an overestimate never
+    attests a restoration.
+
+    ``checkpoint_dir`` makes the read resumable. Each pass, and each shard of
+    it, saves its counters and the byte offset it reached there every
+    :data:`_CHECKPOINT_SECONDS`, and again when it completes. A later call
+    for the same corpus (same real path, size and mtime) with the same
+    options picks up from those checkpoints instead of byte 0. A finished
+    pass 1 is not read again at all. Checkpoints saved for anything else are
+    discarded, and a successful run removes its own once the output is
+    written.
+
+    ``state_dir`` makes the derivation incremental. A successful run keeps its
+    counters there, along with the byte offset they reach and a sha256 of
+    the bytes before it. If the next call with the same options finds the
+    corpus only appended to, it reads just the new tail. It merges the tail's
+    counts after the saved ones and re-ranks every output file from the merged
+    counters. The old prefix is checked by hashing it, which is one sequential
+    read with no derivation. A corpus rewritten in any other way is derived
+    from byte 0 again. ``incremental_from`` in the returned dict is the offset
+    a run resumed from, or None. With ``leet_restore`` the new tail is derived
+    against a dictionary that includes it. Lines already counted keep the
+    restorations their own run's dictionary allowed, so the output can drift
+    slightly from a full re-derive until the state is discarded. With
+    ``leet_restore=False`` it matches a full re-derive exactly while pruning
+    does not fire.
+
+    ``corpus_identity`` is the path checkpoints and state are keyed on, when
+    it is not *corpus_path* itself. A caller that decompresses a gzip corpus
+    to a fresh temporary file passes the original, so an interrupted or grown
+    corpus is still recognized on the next run. The offsets saved are always
+    into *corpus_path*.
     """
     if is_gzipped(corpus_path):
         raise ValueError(
@@ -981,19 +1861,83 @@ def generate(
         )
 
     os.makedirs(outdir, exist_ok=True)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    checkpoint_key = None
+    if checkpoint_dir is not None:
+        checkpoint_key = _checkpoint_key(
+            corpus_identity or corpus_path,
+            ascii_only=ascii_only,
+            verify=verify,
+            max_unique=max_unique,
+            leet_restore=leet_restore,
+            leet_min_hits=leet_min_hits,
+            heavy_hitters=heavy_hitters,
+            workers=workers,
+        )
+        if _prepare_checkpoints(checkpoint_dir, checkpoint_key):
+            print_fn(f"[*] Resuming derivation from the checkpoint in {checkpoint_dir}")
+
+    def _checkpoint(name):
+        return None if checkpoint_dir is None else os.path.join(checkpoint_dir, name)
+
+    # Pin the end of the read, so lines appended while this run is reading are
+    # left for the next one rather than counted without being recorded.
+    corpus_end = None
+    incremental_from = None
+    previous = {}
+    if state_dir is not None:
+        corpus_end = os.path.getsize(corpus_path)
+        state_key = _state_key(
+            corpus_identity or corpus_path,
+            ascii_only=ascii_only,
+            verify=verify,
+            max_unique=max_unique,
+            leet_restore=leet_restore,
+            leet_min_hits=leet_min_hits,
+            heavy_hitters=heavy_hitters,
+        )
+        names = ("attest", "derive") if leet_restore else ("derive",)
+        offset, scans, corpus_digest = _load_state(
+            state_dir, state_key, corpus_path, names
+        )
+        if scans is not None:
+            incremental_from = offset
+            previous = scans
+            print_fn(
+                f"[*] Folding {corpus_end - offset} appended bytes of "
+                f"{corpus_path} into the previous derivation"
+            )
+        _begin_state(state_dir)
+
+    def _read(name, **options):
+        scan = _scan_corpus_sharded(
+            corpus_path,
+            ascii_only,
+            max_unique=max_unique,
+            workers=workers,
+            heavy_hitters=heavy_hitters,
+            checkpoint=_checkpoint(name),
+            checkpoint_key=checkpoint_key,
+            start=incremental_from or 0,
+            end=corpus_end,
+            **options,
+        )
+        if name in previous:
+            # Saved counts first, so ties still rank in file order.
+            scan = _merge_scans([previous.pop(name), scan], max_unique)
+        if state_dir is not None and name == "attest":
+            # Saved now, unfiltered, so the filter below can drop it at once.
+            _save_state(state_dir, state_key, corpus_end, corpus_digest, name, scan)
+        return scan
 
     if leet_restore:
         # Pass 1 exists only for its baseword counter, so it skips both the
         # rule counter and the self-check; every statistic below comes from
         # pass 2. `dictionary` is dropped before the output is written so the
         # three-counter peak does not outlive the read.
-        dictionary = _scan_corpus(
-            corpus_path,
-            ascii_only,
-            verify=False,
-            max_unique=max_unique,
-            count_rules=False,
-        ).base_counts
+        dictionary = _read("attest", verify=False, count_rules=False).base_counts
         # Drop every key that cannot satisfy _derive_leet_aware's
         # `hits >= min_hits` gate. Provably output-neutral: a count is read only
         # by that gate and by the -hits sort key, and a key below the threshold
@@ -1006,18 +1950,18 @@ def generate(
         # pass 2. Rebinding the name is what actually reclaims it: the
         # unfiltered Counter has to become unreachable *before* pass 2 starts
         # allocating, or the filter has bought nothing.
-        dictionary = {k: v for k, v in dictionary.items() if v >= leet_min_hits}
-        scan = _scan_corpus(
-            corpus_path,
-            ascii_only,
-            verify,
-            max_unique,
-            dictionary=dictionary,
-            min_hits=leet_min_hits,
+        # A sketch's counts are upper bounds; attest on the lower bound, so an
+        # overestimate can never restore a letter the corpus does not support.
+        floor = getattr(dictionary, "floor", 0)
+        dictionary = {
+            k: v - floor for k, v in dictionary.items() if v - floor >= leet_min_hits
+        }
+        scan = _read(
+            "derive", verify=verify, dictionary=dictionary, min_hits=leet_min_hits
         )
         del dictionary
     else:
-        scan = _scan_corpus(corpus_path, ascii_only, verify, max_unique)
+        scan = _read("derive", verify=verify)
 
     base_counts = scan.base_counts
     rule_counts = scan.rule_counts
@@ -1038,6 +1982,8 @@ def generate(
     pruned_rule_hits = scan.pruned_rule_hits
 
     if total == 0:
+        if checkpoint_dir is not None:
+            _clear_checkpoints(checkpoint_dir)
         raise ValueError(f"no passwords read from {corpus_path}")
 
     def _path(name):
@@ -1085,14 +2031,34 @@ def generate(
     # disjoint.
     reconstructable_max = total - max(pruned_baseword_hits, pruned_rule_hits)
     reconstructable_min = max(total - pruned_baseword_hits - pruned_rule_hits, 0)
-
+    # A sketch's counts overstate by at most its floor; an exact Counter has
+    # none, and everything below reduces to the exact arithmetic.
+    baseword_count_error = getattr(base_counts, "floor", 0)
+    rule_count_error = getattr(rule_counts, "floor", 0)
+    if baseword_count_error or rule_count_error:
+        # A sketch cannot say which observations it let go, only how far each
+        # surviving count may be off, so the bracket comes from the bounds:
+        # what the retained keys account for at least and at most.
+        base_high = sum(hits for _, hits in ranked_bases)
+        base_low = base_high - baseword_count_error * len(ranked_bases)
+        rule_high = sum(hits for _, hits in ranked)
+        rule_low = rule_high - rule_count_error * len(ranked)
+        reconstructable_max = min(base_high, rule_high, total)
+        reconstructable_min = max(base_low + rule_low - total, 0)
+
+    # Cut on the guaranteed lower bound, so a capped file reaches its target
+    # whenever the counts can prove it does. Exact counts have no slack and
+    # cut exactly where they always did.
     capped_paths = {}
+    cover_bounds = {}
     for target in cover:
         needed = float(target) / 100.0 * retained_hits
         cumulative = 0
+        upper = 0
         count = 0
         for _, hits in ranked:
-            cumulative += hits
+            cumulative += hits - rule_count_error
+            upper += hits
             count += 1
             if cumulative >= needed:
                 break
@@ -1101,12 +2067,13 @@ def generate(
             for rule, _ in ranked[:count]:
                 f.write(rule + "\n")
         capped_paths[target] = capped
+        cover_bounds[target] = (cumulative, min(upper, retained_hits))
 
     # Rules needed to reach each coverage milestone.
     milestones = {}
     cumulative = 0
     for i, (_, hits) in enumerate(ranked, start=1):
-        cumulative += hits
+        cumulative += hits - rule_count_error
         pct = 100.0 * cumulative / retained_hits
         for mark in (50, 75, 80, 90, 95, 99, 100):
             if mark not in milestones and pct >= mark:
@@ -1161,7 +2128,20 @@ def generate(
             )
         if verify:
             f.write(f"self-check failures: {len(selfcheck_failures)} (must be 0)\n")
-        if pruned:
+        if pruned and heavy_hitters:
+            f.write(f"\nheavy-hitter counting (max_unique={max_unique}):\n")
+            f.write(f"  basewords discarded: {pruned_basewords}\n")
+            f.write(f"  rules discarded:     {pruned_rules}\n")
+            f.write(f"  baseword count error: at most {baseword_count_error}\n")
+            f.write(f"  rule count error:     at most {rule_count_error}\n")
+            f.write(
+                "  Each counter was kept as a Misra-Gries sketch of at most\n"
+                "  max_unique keys. Every count written overstates the true\n"
+                "  count by at most its error above and never understates it,\n"
+                "  and every key seen more often than that was kept. The output\n"
+                "  no longer reconstructs 100% of the corpus.\n"
+            )
+        elif pruned:
             f.write(f"\npruned (max_unique={max_unique}):\n")
             f.write(
                 f"  basewords discarded: {pruned_basewords} "
@@ -1176,6 +2156,7 @@ def generate(
                 "  keep memory bounded. The output no longer reconstructs 100% of\n"
                 "  the corpus.\n"
             )
+        if pruned:
             # A password needs both halves to survive, and which passwords lost
             # which half is not tracked, so this is a range rather than a count.
             if reconstructable_min == reconstructable_max:
@@ -1190,8 +2171,21 @@ def generate(
                     "  (a password needs both its baseword and its rule to survive;\n"
                     "   the two counters are pruned independently)\n"
                 )
+        if rule_count_error:
+            f.write("\nrule file cut-offs (passwords covered, guaranteed range):\n")
+            for target in cover:
+                low, high = cover_bounds[target]
+                f.write(
+                    f"  rules.top{target}.rule: between {low} and {high} "
+                    f"of {total}\n"
+                )
         f.write("\nrules needed for coverage:\n")
-        if pruned_rule_hits:
+        if rule_count_error:
+            f.write(
+                "  (percentages are guaranteed lower bounds: each rule's count\n"
+                f"   may overstate it by up to {rule_count_error})\n"
+            )
+        elif pruned_rule_hits:
             # Only meaningful when the rule counter itself lost observations —
             # otherwise the denominator is still the whole corpus and saying
             # "not of all N read" against the same N is self-contradictory.
@@ -1207,6 +2201,15 @@ def generate(
         for mark in sorted(milestones):
             f.write(f"  {mark:3d}%: {milestones[mark]} rules\n")
 
+    # Only now is there nothing left to resume.
+    if checkpoint_dir is not None:
+        _clear_checkpoints(checkpoint_dir)
+    # The manifest goes last: until it is written, the saved counters match
+    # no corpus and the next run derives from scratch.
+    if state_dir is not None:
+        _save_state(state_dir, state_key, corpus_end, corpus_digest, "derive", scan)
+        _commit_state(state_dir, state_key, corpus_end, corpus_digest)
+
     print_fn(
         f"[*] {total} passwords -> {len(base_counts)} basewords, "
         f"{len(rule_counts)} rules ({literal_fallbacks} literal fallbacks: "
@@ -1218,7 +2221,19 @@ def generate(
             f"[*] {leet_restored} basewords kept a leet-substituted letter "
             "(corpus read twice: attestation pass, then derivation pass)"
         )
-    if pruned:
+    if pruned and heavy_hitters:
+        print_fn(
+            "[!] Memory bound reached: the heavy-hitter sketches discarded "
+            f"{pruned_basewords} basewords and {pruned_rules} rules to stay "
+            f"under max_unique={max_unique} distinct keys. Every count written "
+            f"may overstate its true count by at most {baseword_count_error} "
+            f"(basewords) or {rule_count_error} (rules), and any key seen more "
+            "often than that was kept. Between "
+            f"{reconstructable_min} and {reconstructable_max} of {total} "
+            "passwords are still reconstructable; see coverage.txt for the "
+            "range each rule file cut-off covers."
+        )
+    elif pruned:
         print_fn(
             f"[!] Memory bound reached: {pruned_basewords} basewords and "
             f"{pruned_rules} rules were discarded to keep each counter under "
@@ -1282,4 +2297,8 @@ def generate(
         "pruned_rule_hits": pruned_rule_hits,
         "reconstructable_min": reconstructable_min,
         "reconstructable_max": reconstructable_max,
+        "baseword_count_error": baseword_count_error,
+        "rule_count_error": rule_count_error,
+        "cover_bounds": cover_bounds,
+        "incremental_from": incremental_from,
     }
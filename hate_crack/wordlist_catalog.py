@@ -0,0 +1,353 @@
+"""Persistent per-wordlist facts: line count, size, length histogram, sha256.
+
+The same multi-gigabyte wordlists get read end to end over and over for
+answers that cannot have changed: ``_fingerprint_keyspace_guard`` counts their
+lines, ``_count_over_long_basewords`` scans their line lengths, coverage
+hashes their content, and the LLM profiler estimates their size before
+sampling. Each of those is a full sequential read of a file nobody has touched
+since it was downloaded.
+
+This catalog records those facts once per ``(size, mtime_ns)`` of each file,
+beside the coverage store under ``~/.hate_crack``. Consumers only ever *look
+up*: a miss means "work it out yourself, as before", so a cold catalog costs
+nothing and a stale entry is never served. Filling it is the job of
+``hate_crack wordlists index``, which scans a whole wordlists directory across
+a process pool -- one wordlist per worker, since each scan is a single
+sequential read and they do not contend for anything but the disk.
+
+A gzip-compressed wordlist (detected by its magic bytes, as
+:func:`hate_crack.plaintext.is_gzipped` does) is catalogued by its
+*decompressed* lines, which is what hashcat reads, while its sha256 stays over
+the bytes on disk, which is what coverage fingerprints.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+CATALOG_DIRNAME = "wordlist_catalog"
+DB_FILENAME = "wordlist_catalog.sqlite3"
+
+_READ_CHUNK = 4 * 1024 * 1024
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# Well under SQLite's default 999 bound-parameter limit.
+_LOOKUP_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS wordlists (
+    path     TEXT PRIMARY KEY,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    lines    INTEGER NOT NULL,
+    gzip     INTEGER NOT NULL,
+    sha256   TEXT NOT NULL,
+    -- JSON object of line length (bytes, CR/LF excluded) -> line count.
+    lengths  TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+@dataclass(frozen=True)
+class WordlistInfo:
+    """What the catalog knows about one wordlist at one ``(size, mtime_ns)``."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    lines: int
+    gzip: bool
+    sha256: str
+    lengths: dict[int, int] = field(default_factory=dict)
+
+    def longer_than(self, cap: int) -> int:
+        """Number of lines more than ``cap`` bytes long."""
+        return sum(count for length, count in self.lengths.items() if length > cap)
+
+
+def _catalog_dir() -> Path:
+    # Beside the coverage store, as attack_coverage._coverage_dir() builds it.
+    return Path(os.path.expanduser("~")) / ".hate_crack" / CATALOG_DIRNAME
+
+
+def scan(path: str) -> WordlistInfo:
+    """Read ``path`` once and return its catalog entry.
+
+    Module-level and returning a plain dataclass so a process pool can run it.
+    ``lines`` counts newlines in what hashcat reads -- the decompressed
+    stream of a gzip wordlist -- as ``main._wordlist_line_count`` does, not
+    the bytes on disk ``main.lineCount`` counts. The histogram also counts a
+    final line with no newline, as a line-by-line reader would see it.
+    Raises OSError if the file cannot be read, or EOFError for a truncated
+    gzip stream.
+    """
+    real = os.path.realpath(path)
+    st = os.stat(real)
+    with open(real, "rb") as f:
+        compressed = f.read(2) == _GZIP_MAGIC
+        f.seek(0)
+        raw = _HashingReader(f)
+        if compressed:
+            source = gzip.GzipFile(fileobj=raw)
+        else:
+            source = raw
+        chunks = iter(lambda: source.read(_READ_CHUNK), b"")
+
+        lines = 0
+        lengths: Counter = Counter()
+        pending = b""
+        for chunk in chunks:
+            data = (pending + chunk).replace(b"\r\n", b"\n")
+            lines += chunk.count(b"\n")
+            parts = data.split(b"\n")
+            pending = parts.pop()
+            # A lone "\r" kept back in `pending` may still pair with a "\n"
+            # at the start of the next chunk.
+            lengths.update(map(len, parts))
+        if pending:
+            lengths[len(pending.rstrip(b"\r"))] += 1
+        # Hash whatever the decompressor left unread (trailing padding).
+        while raw.read(_READ_CHUNK):
+            pass
+    return WordlistInfo(
+        path=real,
+        size=st.st_size,
+        mtime_ns=st.st_mtime_ns,
+        lines=lines,
+        gzip=compressed,
+        sha256=raw.hexdigest(),
+        lengths=dict(lengths),
+    )
+
+
+class _HashingReader:
+    """Read-only file wrapper that sha256es every byte as it is read.
+
+    Lets a gzip wordlist be hashed (over its bytes on disk) and decompressed
+    in the same sequential pass. GzipFile only ever reads its fileobj
+    forwards, so each byte passes through exactly once.
+    """
+
+    def __init__(self, f):
+        self._f = f
+        self._digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._f.read(size)
+        self._digest.update(data)
+        return data
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+def _row_to_info(row) -> WordlistInfo:
+    path, size, mtime_ns, lines, is_gzip, sha256, lengths = row
+    return WordlistInfo(
+        path=path,
+        size=size,
+        mtime_ns=mtime_ns,
+        lines=lines,
+        gzip=bool(is_gzip),
+        sha256=sha256,
+        lengths={int(k): v for k, v in json.loads(lengths).items()},
+    )
+
+
+class WordlistCatalog:
+    """SQLite-backed catalog of :class:`WordlistInfo`.
+
+    Like :class:`hate_crack.attack_coverage.CoverageStore`, every method
+    swallows :class:`sqlite3.Error` and degrades to "not catalogued", which
+    every consumer already handles by doing the work itself. Lookups never
+    create the database: a machine that has never run the index command
+    gets no new files from merely opening a picker.
+    """
+
+    def __init__(self, path: Path | str | None = None):
+        self._path = Path(path) if path is not None else _catalog_dir() / DB_FILENAME
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self, create: bool = True) -> sqlite3.Connection | None:
+        if self._conn is not None:
+            return self._conn
+        if not create and not self._path.exists():
+            return None
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self._path), timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            conn.commit()
+        except (sqlite3.Error, OSError):
+            return None
+        self._conn = conn
+        return conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+    def lookup_many(self, paths: Iterable[str]) -> dict[str, WordlistInfo]:
+        """Current catalog entries for ``paths``, keyed by the path given.
+
+        An entry is current only while the file's size and mtime still match
+        what was scanned; anything else is left out, as is a path that no
+        longer exists.
+        """
+        conn = self._connect(create=False)
+        if conn is None:
+            return {}
+        stamps: dict[str, tuple[str, int, int]] = {}
+        for path in paths:
+            try:
+                real = os.path.realpath(path)
+                st = os.stat(real)
+            except OSError:
+                continue
+            stamps[path] = (real, st.st_size, st.st_mtime_ns)
+        if not stamps:
+            return {}
+        reals = list({real for real, _size, _mtime in stamps.values()})
+        rows: dict[str, WordlistInfo] = {}
+        try:
+            for start in range(0, len(reals), _LOOKUP_BATCH):
+                batch = reals[start : start + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                for row in conn.execute(
+                    "SELECT path, size, mtime_ns, lines, gzip, sha256, lengths "
+                    f"FROM wordlists WHERE path IN ({placeholders})",
+                    batch,
+                ):
+                    rows[row[0]] = _row_to_info(row)
+        except (sqlite3.Error, ValueError):
+            return {}
+        found = {}
+        for path, (real, size, mtime_ns) in stamps.items():
+            info = rows.get(real)
+            if info is not None and (info.size, info.mtime_ns) == (size, mtime_ns):
+                found[path] = info
+        return found
+
+    def lookup(self, path: str) -> WordlistInfo | None:
+        """The current catalog entry for ``path``, or None."""
+        return self.lookup_many([path]).get(path)
+
+    def record(self, info: WordlistInfo) -> bool:
+        conn = self._connect()
+        if conn is None:
+            return False
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO wordlists "
+                "(path, size, mtime_ns, lines, gzip, sha256, lengths) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    info.path,
+                    info.size,
+                    info.mtime_ns,
+                    info.lines,
+                    int(info.gzip),
+                    info.sha256,
+                    json.dumps({str(k): v for k, v in sorted(info.lengths.items())}),
+                ),
+            )
+            conn.commit()
+        except sqlite3.Error:
+            return False
+        return True
+
+    def index_paths(
+        self,
+        paths: Iterable[str],
+        workers: int | None = None,
+        progress: Callable[[str, WordlistInfo | None], None] | None = None,
+    ) -> tuple[int, int, int]:
+        """Scan every path not already current in the catalog.
+
+        Returns ``(indexed, already_current, failed)``. ``progress`` is called
+        once per scanned path with its entry, or None if it could not be read.
+        """
+        paths = list(dict.fromkeys(paths))
+        current = self.lookup_many(paths)
+        pending = [p for p in paths if p not in current]
+        indexed = failed = 0
+        if not pending:
+            return 0, len(current), 0
+
+        def finish(path, info):
+            nonlocal indexed, failed
+            if info is not None and self.record(info):
+                indexed += 1
+            else:
+                failed += 1
+            if progress is not None:
+                progress(path, info)
+
+        if workers == 1 or len(pending) == 1:
+            for path in pending:
+                try:
+                    info = scan(path)
+                except (OSError, EOFError):
+                    info = None
+                finish(path, info)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(scan, path): path for path in pending}
+                for future in as_completed(futures):
+                    try:
+                        info = future.result()
+                    except (OSError, EOFError):
+                        info = None
+                    finish(futures[future], info)
+        return indexed, len(current), failed
+
+
+def iter_wordlist_files(
+    directory: str, exclude_extensions: Iterable[str] = ()
+) -> list[str]:
+    """Every wordlist file under ``directory``, recursively, sorted.
+
+    Dot-files and dot-directories are skipped, like the pickers skip them.
+    """
+    excluded = tuple(exclude_extensions)
+    found = []
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for name in files:
+            if name.startswith(".") or (excluded and name.endswith(excluded)):
+                continue
+            found.append(os.path.join(root, name))
+    return sorted(found)
+
+
+_default_catalog: WordlistCatalog | None = None
+
+
+def get_catalog() -> WordlistCatalog:
+    """The process-wide catalog. Created lazily so importing costs no I/O."""
+    global _default_catalog
+    if _default_catalog is None:
+        _default_catalog = WordlistCatalog()
+    return _default_catalog
+
+
+def reset_catalog() -> None:
+    """Drop the process-wide catalog (used by tests)."""
+    global _default_catalog
+    if _default_catalog is not None:
+        _default_catalog.close()
+    _default_catalog = None
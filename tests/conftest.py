@@ -136,6 +136,34 @@ def _isolate_hashview_cache(monkeypatch, tmp_path):
     )
 
 
+@pytest.fixture(autouse=True)
+def _isolate_corpus_profiles(monkeypatch, tmp_path):
+    """Keep profiles, and the fingerprints they are keyed on, per test.
+
+    ``main._corpus_context`` fingerprints its corpus through the coverage
+    store and caches the profile under ``~/.hate_crack``. Two tests profiling
+    identical fixture text would otherwise share a profile, and the second
+    would never reach the summarize() call it is asserting on.
+    """
+    from hate_crack import attack_coverage, corpus_profile_cache
+
+    monkeypatch.setattr(
+        corpus_profile_cache,
+        "_cache_dir",
+        lambda: tmp_path / ".hate_crack" / corpus_profile_cache.PROFILE_DIRNAME,
+    )
+    monkeypatch.setattr(
+        attack_coverage,
+        "_coverage_dir",
+        lambda: tmp_path / ".hate_crack" / attack_coverage.COVERAGE_DIRNAME,
+    )
+    corpus_profile_cache.reset_cache()
+    attack_coverage.reset_store()
+    yield
+    corpus_profile_cache.reset_cache()
+    attack_coverage.reset_store()
+
+
 def _corrupted_submodule_references():
     """Report and repair duplicated ``hate_crack.main.<mod>`` module objects.
 
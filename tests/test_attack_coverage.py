@@ -1,7 +1,10 @@
 """Tests for the per-target attack coverage store."""
 
 import os
+import re
 import sqlite3
+import threading
+import time
 
 import pytest
 
@@ -74,6 +77,93 @@ def test_wordlist_fingerprint_missing_file_returns_none(store, tmp_path):
     assert store.wordlist_fingerprint(str(tmp_path / "nope.txt")) is None
 
 
+def test_wordlist_fingerprints_hash_first_sightings_concurrently(
+    store, tmp_path, monkeypatch
+):
+    """hcatDictionary hands over every list in hcatWordlists at once."""
+    paths = [_write(tmp_path / f"wl{i}.txt", f"word{i}\n") for i in range(3)]
+    expected = [ac._sha256_file(p) for p in paths]
+    # Both hashes must be in flight together, or the barrier breaks.
+    barrier = threading.Barrier(2, timeout=10)
+    real = ac._sha256_file
+
+    def hash_in_step(path):
+        if not path.endswith("wl2.txt"):
+            barrier.wait()
+        return real(path)
+
+    monkeypatch.setattr(ac, "_sha256_file", hash_in_step)
+    missing = str(tmp_path / "nope.txt")
+
+    got = store.wordlist_fingerprints(paths[:2] + [missing, paths[0], paths[2]])
+
+    assert got == expected[:2] + [None, expected[0], expected[2]]
+
+
+@pytest.fixture
+def sampled(tmp_path, monkeypatch):
+    """A read-only wordlist directory, sampled 4 blocks of 16 bytes at a time."""
+    monkeypatch.setattr(ac, "_SAMPLE_BLOCKS", 4)
+    monkeypatch.setattr(ac, "_SAMPLE_BLOCK_BYTES", 16)
+    root = tmp_path / "readonly"
+    root.mkdir()
+    ac.set_sampled_fingerprint_dirs([str(root)])
+    yield root
+    ac.set_sampled_fingerprint_dirs([])
+
+
+def test_sampled_fingerprint_reads_only_the_sample(store, sampled):
+    path = sampled / "big.txt"
+    path.write_bytes(bytes(range(256)) * 4)
+    first = store.wordlist_fingerprint(str(path))
+    assert first.startswith(ac.SAMPLED_FINGERPRINT_PREFIX)
+
+    def rewrite(offset):
+        data = bytearray(bytes(range(256)) * 4)
+        data[offset] ^= 0xFF
+        path.write_bytes(bytes(data))
+        os.utime(path, (0, offset))
+        store.clear_fingerprint_memo()
+        return store.wordlist_fingerprint(str(path))
+
+    # Blocks start at 0, 336, 672 and 1008 of 1024 bytes.
+    assert rewrite(200) == first
+    assert rewrite(340) != first
+    assert rewrite(1023) != first
+
+
+def test_sampled_fingerprint_of_a_small_list_is_its_sha256(store, sampled):
+    path = _write(sampled / "small.txt", "alpha\n")
+    assert store.wordlist_fingerprint(path) == ac._sha256_file(path)
+
+
+def test_sampled_fingerprint_is_not_served_once_unconfigured(store, sampled):
+    path = sampled / "big.txt"
+    path.write_bytes(b"x" * 1024)
+    assert store.wordlist_fingerprint(str(path)).startswith(
+        ac.SAMPLED_FINGERPRINT_PREFIX
+    )
+    ac.set_sampled_fingerprint_dirs([])
+    store.clear_fingerprint_memo()
+    assert store.wordlist_fingerprint(str(path)) == ac._sha256_file(str(path))
+
+
+def test_known_full_fingerprint_is_kept_under_sampling(
+    store, tmp_path, monkeypatch
+):
+    path = tmp_path / "lists" / "big.txt"
+    path.parent.mkdir()
+    path.write_bytes(b"x" * 1024)
+    full = store.wordlist_fingerprint(str(path))
+    monkeypatch.setattr(ac, "_SAMPLE_BLOCKS", 4)
+    monkeypatch.setattr(ac, "_SAMPLE_BLOCK_BYTES", 16)
+    ac.set_sampled_fingerprint_dirs([str(tmp_path / "lists")])
+    try:
+        assert store.wordlist_fingerprint(str(path)) == full
+    finally:
+        ac.set_sampled_fingerprint_dirs([])
+
+
 def test_unwritable_store_degrades_instead_of_raising(tmp_path, monkeypatch):
     """A read-only home must not take an attack down."""
     s = ac.CoverageStore(tmp_path / "nodir" / "cov.sqlite3")
@@ -193,7 +283,7 @@ def test_covered_table_stores_no_per_key_metadata(store):
 
 
 def test_covered_handles_more_keys_than_the_sqlite_parameter_limit(store):
-    """The 999-parameter limit is why the query binds one JSON value, not N."""
+    """The 999-parameter limit is why the query binds one packed value, not N."""
     keys = [f"k{i}" for i in range(2500)]
     store.record(keys, target="t")
     assert store.covered(keys) == set(keys)
@@ -201,22 +291,336 @@ def test_covered_handles_more_keys_than_the_sqlite_parameter_limit(store):
 
 def test_covered_query_interpolates_nothing(store):
     """Static SQL with a single bound parameter -- no placeholder building."""
-    assert "?" == ac._COVERED_IN_JSON[ac._COVERED_IN_JSON.index("json_each(") + 10]
-    assert ac._COVERED_IN_JSON.count("?") == 1
+    for sql in (ac._COVERED_IN_BLOB, ac._RECORD_FROM_BLOB):
+        assert "{" not in sql
+    assert set(re.findall(r"\?\d*", ac._COVERED_IN_BLOB)) == {"?1"}
 
 
-def test_covered_falls_back_when_json1_is_missing(store, monkeypatch):
-    """A SQLite built without JSON1 must still answer correctly."""
+def test_covered_falls_back_when_the_packed_probe_fails(store, monkeypatch):
+    """A SQLite that cannot run the packed probe must still answer correctly."""
     keys = [f"k{i}" for i in range(1200)]
     store.record(keys, target="t")
     # sqlite3.Connection is immutable, so stand in a statement that fails the
-    # same way a missing json_each would.
+    # same way an unsupported probe would.
     monkeypatch.setattr(
-        ac, "_COVERED_IN_JSON", "SELECT key FROM covered WHERE key IN (nope(?))"
+        ac, "_COVERED_IN_BLOB", "SELECT key FROM covered WHERE key IN (nope(?))"
     )
     assert store.covered(keys + ["absent"]) == set(keys)
 
 
+def test_keys_are_stored_as_16_byte_blobs(store):
+    key = ac.entry_key("t", "rule", "wlfp", "c")
+    store.record([key, "not-a-digest"], target="t")
+    stored = store._connect().execute("SELECT key FROM covered").fetchall()
+    assert {row[0] for row in stored} == {
+        bytes.fromhex(key[:32]),
+        ac._key_blob("not-a-digest"),
+    }
+    assert all(len(row[0]) == 16 for row in stored)
+
+
+# --- schema migration --------------------------------------------------------
+
+
+def _version_0_store(path, keys_by_run):
+    """A store as written before schema version 2: hex TEXT keys."""
+    path.parent.mkdir(parents=True)
+    conn = sqlite3.connect(str(path))
+    conn.executescript(
+        ac._SCHEMA.replace("key    BLOB PRIMARY KEY", "key    TEXT PRIMARY KEY")
+    )
+    for run, keys in enumerate(keys_by_run, start=1):
+        conn.execute(
+            "INSERT INTO runs (id, target, attack, ran_at) VALUES (?, 't', ?, 'x')",
+            (run, f"attack{run}"),
+        )
+        conn.executemany(
+            "INSERT INTO covered (key, run_id) VALUES (?, ?)",
+            [(key, run) for key in keys],
+        )
+    conn.commit()
+    conn.close()
+
+
+def test_version_0_store_is_migrated_in_place(tmp_path, capsys):
+    path = tmp_path / "coverage" / "cov.sqlite3"
+    first = [ac.entry_key("t", "rule", "wl", f"${i}") for i in range(10)]
+    second = [ac.entry_key("t", "rule", "wl", f"^{i}") for i in range(5)]
+    _version_0_store(path, [first, second])
+
+    migrated = ac.CoverageStore(path)
+    try:
+        assert migrated.covered(first + second + ["absent"]) == set(first + second)
+        conn = migrated._connect()
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 2
+        assert {
+            row[0] for row in conn.execute("SELECT DISTINCT typeof(key) FROM covered")
+        } == {"blob"}
+        # Each key stays linked to the run that first covered it.
+        assert migrated.summary("t")["by_attack"] == [
+            ("attack1", 10, 1),
+            ("attack2", 5, 1),
+        ]
+        assert migrated.record(first, target="t") == 0
+    finally:
+        migrated.close()
+    assert "converting the store to compact keys" in capsys.readouterr().out
+
+    again = ac.CoverageStore(path)
+    try:
+        assert again.covered(first) == set(first)
+    finally:
+        again.close()
+    assert capsys.readouterr().out == ""
+
+
+def test_new_store_starts_at_the_current_version(store, capsys):
+    conn = store._connect()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == ac.SCHEMA_VERSION
+    assert capsys.readouterr().out == ""
+
+
+# --- background writer -----------------------------------------------------
+
+
+@pytest.fixture
+def held_writer(monkeypatch):
+    """Hold every background write until ``release`` is set; log each batch."""
+    held = threading.Event()
+    release = threading.Event()
+    batches = []
+    real = ac.CoverageStore.record_runs
+
+    def record_runs(self, runs):
+        held.set()
+        release.wait(10)
+        batches.append([run.attack for run in runs])
+        return real(self, runs)
+
+    monkeypatch.setattr(ac.CoverageStore, "record_runs", record_runs)
+    yield release, batches, held
+    release.set()
+
+
+def test_queued_keys_count_as_covered_before_they_are_written(store, held_writer):
+    release, batches, held = held_writer
+    store.record_async(["a", "b"], target="t", kind="rule", attack="Dictionary")
+
+    assert store.covered(["a", "b", "c"]) == {"a", "b"}
+    assert store.covered(["a", "c"], target="t") == {"a"}
+    assert batches == []
+
+    release.set()
+    store.flush()
+    assert batches == [["Dictionary"]]
+    other = ac.CoverageStore(store._path)
+    try:
+        assert other.covered(["a", "b", "c"]) == {"a", "b"}
+    finally:
+        other.close()
+
+
+def test_runs_queued_behind_a_write_share_one_transaction(store, held_writer):
+    release, batches, held = held_writer
+    store.record_async(["a"], target="t", attack="first")
+    assert held.wait(10)  # the writer has taken "first" alone
+    store.record_async(["b"], target="t", attack="second")
+    store.record_async((), target="t", attack="PRINCE", kind="history")
+
+    release.set()
+    store.flush()
+
+    assert batches == [["first"], ["second", "PRINCE"]]
+    assert [row[0] for row in store.history("t")] == ["first", "second", "PRINCE"]
+
+
+def test_history_and_summary_wait_for_queued_runs(store, held_writer):
+    release, _, _ = held_writer
+    store.record_async(["a"], target="t", attack="Dictionary")
+    threading.Timer(0.05, release.set).start()
+
+    assert store.summary("t")["entries"] == 1
+
+
+def test_close_writes_everything_queued(tmp_path):
+    s = ac.CoverageStore(tmp_path / "cov.sqlite3")
+    for i in range(20):
+        s.record_async([f"k{i}"], target="t", attack=f"run{i}")
+    s.close()
+
+    reopened = ac.CoverageStore(tmp_path / "cov.sqlite3")
+    try:
+        assert len(reopened.history("t")) == 20
+        assert reopened.covered([f"k{i}" for i in range(20)]) == {
+            f"k{i}" for i in range(20)
+        }
+    finally:
+        reopened.close()
+
+
+def test_a_failed_write_does_not_stop_the_writer(store, monkeypatch):
+    real = ac.CoverageStore.record_runs
+    calls = []
+
+    def record_runs(self, runs):
+        calls.append(len(runs))
+        if len(calls) == 1:
+            raise RuntimeError("disk on fire")
+        return real(self, runs)
+
+    monkeypatch.setattr(ac.CoverageStore, "record_runs", record_runs)
+    store.record_async(["a"], target="t", attack="lost")
+    store.flush()
+    store.record_async(["b"], target="t", attack="kept")
+    store.flush()
+
+    assert store.covered(["a", "b"]) == {"b"}
+    assert [row[0] for row in store.history("t")] == ["kept"]
+
+
+def test_a_run_keeps_the_time_it_finished(store, held_writer):
+    release, _, _ = held_writer
+    store.record_async(["a"], target="t", attack="Dictionary")
+    finished = store._writer._queued[0][0].ran_at
+    time.sleep(1.1)
+    release.set()
+
+    assert store.history("t")[0][2] == finished
+
+
+# --- bloom prefilter -------------------------------------------------------
+
+
+def _keys(target, prefix, n):
+    return [ac.entry_key(target, "rule", "wl", f"{prefix}{i}") for i in range(n)]
+
+
+def _statements(store):
+    seen = []
+    store._connect().set_trace_callback(seen.append)
+    return seen
+
+
+def test_bloom_answers_an_unseen_run_without_querying(store):
+    store.record(_keys("t", "old", 500), target="t")
+    store.covered(["warm"], target="t")
+    seen = _statements(store)
+
+    assert store.covered(_keys("t", "new", 500), target="t") == set()
+
+    assert not any("covered.key = substr" in sql for sql in seen), seen
+
+
+def test_bloom_never_hides_a_recorded_key(store, tmp_path):
+    old = _keys("t", "old", 300)
+    store.record(old, target="t")
+    probe = old + _keys("t", "new", 300)
+    assert store.covered(probe, target="t") == set(old)
+
+    # Another instance, starting from the filter persisted on disk.
+    other = ac.CoverageStore(store._path)
+    try:
+        assert other._bloom_path("t").exists()
+        assert other.covered(probe, target="t") == set(old)
+    finally:
+        other.close()
+
+
+def test_bloom_folds_in_runs_recorded_by_another_instance(store):
+    first = _keys("t", "a", 100)
+    store.record(first, target="t")
+    assert store.covered(first, target="t") == set(first)
+
+    other = ac.CoverageStore(store._path)
+    try:
+        second = _keys("t", "b", 100)
+        other.record(second, target="t")
+    finally:
+        other.close()
+
+    assert store.covered(first + second, target="t") == set(first + second)
+
+
+def test_bloom_is_extended_by_this_instances_own_record(store):
+    store.covered(["warm"], target="t")
+    keys = _keys("t", "a", 50)
+    store.record(keys, target="t")
+    seen = _statements(store)
+
+    assert store.covered(keys, target="t") == set(keys)
+
+    assert not any("runs.id > ?" in sql for sql in seen), "nothing to fold in"
+
+
+def test_forgotten_target_rebuilds_a_stale_filter(store):
+    keys = _keys("t", "a", 50)
+    store.record(keys, target="t")
+    other = ac.CoverageStore(store._path)
+    try:
+        assert other.covered(keys, target="t") == set(keys)
+        store.forget_target("t")
+        assert not store._bloom_path("t").exists()
+        store.record(keys[:10], target="t")
+        # `other` still holds a filter stamped past the forgotten runs.
+        assert other.covered(keys, target="t") == set(keys[:10])
+    finally:
+        other.close()
+
+
+def test_corrupt_bloom_file_is_rebuilt(store):
+    keys = _keys("t", "a", 50)
+    store.record(keys, target="t")
+    store._bloom_path("t").parent.mkdir(parents=True, exist_ok=True)
+    store._bloom_path("t").write_bytes(b"HCBF garbage")
+
+    assert store.covered(keys, target="t") == set(keys)
+    loaded = ac._BloomFilter.from_bytes(store._bloom_path("t").read_bytes())
+    assert loaded is not None and loaded.count == 50
+
+
+def test_bloom_grows_past_its_capacity(store, monkeypatch):
+    monkeypatch.setattr(ac, "_BLOOM_MIN_CAPACITY", 8)
+    store.covered(["warm"], target="t")
+    keys = _keys("t", "a", 400)
+    for start in range(0, 400, 100):
+        store.record(keys[start : start + 100], target="t")
+
+    assert store.covered(keys, target="t") == set(keys)
+    assert store._blooms["t"].capacity >= len(keys)
+
+
+def test_bloom_is_written_once_per_session_not_per_run(store):
+    store.covered(["warm"], target="t")
+    path = store._bloom_path("t")
+    built = path.read_bytes()
+    keys = _keys("t", "a", 50)
+    for start in range(0, 50, 10):
+        store.record(keys[start : start + 10], target="t")
+
+    assert path.read_bytes() == built
+    store.close()
+    saved = ac._BloomFilter.from_bytes(path.read_bytes())
+    blobs = list(ac._pack_keys(keys))
+    assert saved.count == 50 and saved.filter(blobs) == blobs
+
+
+def test_bloom_resident_size_is_capped(monkeypatch):
+    monkeypatch.setattr(ac, "_BLOOM_MAX_SLOTS", 1 << 12)
+    bloom = ac._BloomFilter(10_000)
+    assert len(bloom._slots) == 1 << 12
+    added = [ac._key_blob(f"in{i}") for i in range(10_000)]
+    bloom.add(added)
+    assert bloom.filter(added) == added
+
+
+def test_bloom_false_positive_rate_is_low():
+    bloom = ac._BloomFilter(10_000)
+    added = [ac._key_blob(f"in{i}") for i in range(10_000)]
+    bloom.add(added)
+    assert bloom.filter(added) == added
+    assert len(bloom.filter([ac._key_blob(f"out{i}") for i in range(10_000)])) < 100
+
+
 # --- history ---------------------------------------------------------------
 
 
@@ -239,6 +643,251 @@ def test_forget_target_clears_only_that_target(store):
     assert store.history("A") == []
 
 
+# --- export / merge --------------------------------------------------------
+
+
+@pytest.fixture
+def node(tmp_path):
+    s = ac.CoverageStore(tmp_path / "node" / "cov.sqlite3")
+    yield s
+    s.close()
+
+
+def test_export_carries_one_target_to_another_store(store, node, tmp_path):
+    keys = _keys("t", "a", 300)
+    store.record(keys, target="t", kind="rule", attack="Dictionary")
+    store.log_run("t", "PRINCE", kind="history")
+    store.record(["other"], target="u")
+    out = tmp_path / "t.hccov"
+
+    assert store.export_target("t", out) == {
+        "runs": 2,
+        "entries": 300,
+        "fingerprints": 0,
+    }
+    merged = node.merge(out)
+
+    assert merged == {"target": "t", "runs": 2, "entries": 300, "fingerprints": 0}
+    assert node.covered(keys + ["other"]) == set(keys)
+    assert [row[0] for row in node.history("t")] == ["Dictionary", "PRINCE"]
+    assert node.history("u") == []
+
+
+def test_merge_is_idempotent(store, node, tmp_path):
+    store.record(_keys("t", "a", 50), target="t", attack="Dictionary")
+    out = tmp_path / "t.hccov"
+    store.export_target("t", out)
+
+    node.merge(out)
+    again = node.merge(out)
+    back = store.merge(out)
+
+    assert again is not None and again["runs"] == again["entries"] == 0
+    assert back is not None and back["runs"] == back["entries"] == 0
+    assert node.summary("t")["runs"] == store.summary("t")["runs"] == 1
+
+
+def test_merge_keeps_local_keys_and_adds_only_new_ones(store, node, tmp_path):
+    keys = _keys("t", "a", 100)
+    node.record(keys[:60], target="t", attack="Quick Crack")
+    store.record(keys[40:], target="t", attack="Dictionary")
+    out = tmp_path / "t.hccov"
+    store.export_target("t", out)
+    # Warm the filter, so the merge has to invalidate it.
+    assert node.covered(keys, target="t") == set(keys[:60])
+
+    merged = node.merge(out)
+
+    assert merged is not None and merged["entries"] == 40
+    assert node.covered(keys, target="t") == set(keys)
+    by_attack = {row[0]: row[1] for row in node.summary("t")["by_attack"]}
+    assert by_attack == {"Dictionary": 40, "Quick Crack": 60}
+
+
+def test_export_streams_keys_in_chunks(store, node, tmp_path, monkeypatch):
+    monkeypatch.setattr(ac, "_EXPORT_CHUNK_KEYS", 7)
+    keys = _keys("t", "a", 100)
+    store.record(keys, target="t")
+    out = tmp_path / "t.hccov"
+    store.export_target("t", out)
+
+    assert out.stat().st_size == (
+        ac._EXPORT_HEADER.size
+        + int.from_bytes(out.read_bytes()[8:12], "little")
+        + 100 * ac._KEY_BYTES
+    )
+    assert node.merge(out)["entries"] == 100
+    assert node.covered(keys) == set(keys)
+
+
+def test_merge_brings_fingerprints_without_overriding_local_ones(
+    store, node, tmp_path
+):
+    for s, digest in ((store, "remote"), (node, "local")):
+        s._connect().execute(
+            "INSERT INTO wordlist_fingerprints VALUES (?, 1, 1, ?)",
+            ("/lists/shared.txt", digest),
+        )
+        s._connect().execute(
+            "INSERT INTO wordlist_fingerprints VALUES (?, 1, 1, ?)",
+            (f"/lists/{digest}.txt", digest),
+        )
+        s._connect().commit()
+    out = tmp_path / "t.hccov"
+    store.export_target("t", out)
+
+    assert node.merge(out)["fingerprints"] == 1
+    rows = dict(
+        node._connect()
+        .execute("SELECT path, sha256 FROM wordlist_fingerprints")
+        .fetchall()
+    )
+    assert rows == {
+        "/lists/shared.txt": "local",
+        "/lists/local.txt": "local",
+        "/lists/remote.txt": "remote",
+    }
+
+
+@pytest.mark.parametrize(
+    "damage",
+    [
+        lambda raw: b"not an export at all",
+        lambda raw: raw[:-1],
+        lambda raw: raw + b"x",
+        lambda raw: raw[:4] + b"\x09" + raw[5:],
+        lambda raw: raw[:12] + b"[" + raw[13:],
+    ],
+    ids=["foreign", "truncated", "trailing", "version", "header"],
+)
+def test_a_damaged_export_merges_nothing(store, node, tmp_path, damage):
+    store.record(_keys("t", "a", 20), target="t", attack="Dictionary")
+    out = tmp_path / "t.hccov"
+    store.export_target("t", out)
+    out.write_bytes(damage(out.read_bytes()))
+
+    with pytest.raises(ValueError):
+        node.merge(out)
+    assert node.summary("t")["runs"] == 0
+
+
+def test_a_failed_export_leaves_no_file(store, tmp_path):
+    store.record(["a"], target="t")
+    with pytest.raises(OSError):
+        store.export_target("t", tmp_path / "missing" / "t.hccov")
+    assert list(tmp_path.glob("**/*.tmp")) == []
+
+
+def test_export_includes_runs_still_queued(store, held_writer, tmp_path):
+    release, _, _ = held_writer
+    store.record_async(["a", "b"], target="t", attack="Dictionary")
+    threading.Timer(0.05, release.set).start()
+    out = tmp_path / "t.hccov"
+
+    assert store.export_target("t", out)["entries"] == 2
+
+
+# --- maintenance -----------------------------------------------------------
+
+
+def _age(store, target, ran_at="2020-01-01T00:00:00+00:00"):
+    store._connect().execute(
+        "UPDATE runs SET ran_at = ? WHERE target = ?", (ran_at, target)
+    )
+    store._connect().commit()
+
+
+def _pragma(store, name):
+    return store._connect().execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def test_a_new_store_vacuums_incrementally(store):
+    store.record(["a"], target="t")
+    assert _pragma(store, "auto_vacuum") == 2
+
+
+def test_usage_splits_the_store_by_target(store):
+    store.record(_keys("big", "a", 3000), target="big", attack="Dictionary")
+    store.record(_keys("small", "a", 1000), target="small", attack="Dictionary")
+    store.log_run("small", "PRINCE")
+
+    usage = store.usage()
+
+    assert [row[:3] for row in usage["targets"]] == [
+        ("big", 3000, 1),
+        ("small", 1000, 2),
+    ]
+    big, small = usage["targets"][0][3], usage["targets"][1][3]
+    assert big == 3 * small or abs(big - 3 * small) <= 3
+    assert big + small <= usage["file_bytes"] - usage["free_bytes"]
+    assert usage["incremental"] is True
+
+
+def test_prune_forgets_only_targets_idle_for_too_long(store):
+    store.record(["old1", "old2"], target="old")
+    store.record(["new1"], target="new")
+    _age(store, "old")
+
+    assert store.stale_targets(30) == ["old"]
+    assert store.prune(30) == [("old", 2)]
+    assert store.covered(["old1", "old2", "new1"]) == {"new1"}
+    assert store.stale_targets(30) == []
+
+
+def test_a_target_with_a_recent_run_is_not_stale(store):
+    store.record(["a"], target="t")
+    _age(store, "t")
+    store.log_run("t", "PRINCE")
+    assert store.stale_targets(30) == []
+
+
+def test_vacuum_step_is_bounded_and_shrinks_the_file(store):
+    store.record(_keys("t", "a", 20_000), target="t")
+    store.forget_target("t")
+    free = _pragma(store, "freelist_count")
+    pages = _pragma(store, "page_count")
+    assert free > 10
+
+    assert store.vacuum_step(10) == 10
+    assert _pragma(store, "page_count") == pages - 10
+    assert store.vacuum_step(None) == free - 10
+    assert _pragma(store, "freelist_count") == 0
+    assert store.vacuum_step() == 0
+
+
+def test_vacuum_converts_a_store_made_without_incremental_mode(tmp_path):
+    path = tmp_path / "old.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.executescript(ac._SCHEMA)
+    conn.execute(f"PRAGMA user_version = {ac.SCHEMA_VERSION}")
+    conn.close()
+    old = ac.CoverageStore(path)
+    try:
+        old.record(_keys("t", "a", 5000), target="t")
+        old.forget_target("t")
+        assert _pragma(old, "auto_vacuum") == 0
+        assert old.vacuum_step() == 0
+
+        assert old.vacuum() is True
+        assert _pragma(old, "auto_vacuum") == 2
+        assert _pragma(old, "freelist_count") == 0
+    finally:
+        old.close()
+
+
+def test_the_writer_vacuums_between_attacks(store, monkeypatch):
+    monkeypatch.setattr(ac, "_VACUUM_STEP_PAGES", 5)
+    store.record(_keys("t", "a", 20_000), target="t")
+    store.forget_target("t")
+    free = _pragma(store, "freelist_count")
+
+    store.record_async(["b"], target="u")
+    store.flush()
+
+    # The insert may reuse a free page or two before the step runs.
+    assert free - 7 <= _pragma(store, "freelist_count") <= free - 5
+
+
 # --- indexing --------------------------------------------------------------
 
 
@@ -268,6 +917,17 @@ def test_membership_lookup_uses_the_primary_key_index(store):
     )
 
 
+def test_packed_probe_searches_the_primary_key(store):
+    store.record(["k1"], target="t")
+    plan = (
+        store._connect()
+        .execute("EXPLAIN QUERY PLAN " + ac._COVERED_IN_BLOB, (b"\x00" * 32,))
+        .fetchall()
+    )
+    detail = " ".join(row[3] for row in plan)
+    assert "SEARCH covered USING PRIMARY KEY" in detail, detail
+
+
 def test_forget_target_uses_the_run_index(store):
     store.record(["k1"], target="t")
     plan = (
@@ -314,7 +974,8 @@ def test_concurrent_writer_does_not_error(store, tmp_path):
         )
         rid = other.execute("SELECT last_insert_rowid()").fetchone()[0]
         other.execute(
-            "INSERT OR IGNORE INTO covered (key, run_id) VALUES (?,?)", ("k2", rid)
+            "INSERT OR IGNORE INTO covered (key, run_id) VALUES (?,?)",
+            (ac._key_blob("k2"), rid),
         )
         other.commit()
     finally:
@@ -477,8 +1138,9 @@ class TestEntryKeyMaskCanonicalization:
             "t", "mask", "", "0123456789,?1?1"
         )
 
-    def test_rule_entries_are_not_canonicalized(self):
-        # A rule has no such normalization and its text is significant.
+    def test_rule_entries_are_not_mask_canonicalized(self):
+        # A rule has its own canonical form (rulegen.canonical_rule); charset
+        # spellings mean nothing to it.
         assert ac.entry_key("t", "rule", "", "?d,?1?1") != ac.entry_key(
             "t", "rule", "", "0123456789,?1?1"
         )
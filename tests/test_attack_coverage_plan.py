@@ -1,5 +1,7 @@
 """Tests for coverage-driven run planning (skip / filter decisions)."""
 
+import hashlib
+
 import pytest
 
 from hate_crack import attack_coverage as ac
@@ -88,6 +90,46 @@ def test_same_rule_in_a_different_file_is_recognised(env):
     assert plan.filtered_entries == ["$2"]
 
 
+def test_equivalent_rule_spellings_share_a_key(env):
+    """`:$1`, `$1` and `$1 :` try the same candidates, so one covers the rest."""
+    spelled = env["tmp"] / "spelled.rule"
+    spelled.write_text(":$1\n$1 :\nc u\n")
+    covered = set(ac.plan_run(_spec(env), ac.set_lookup(set())).record_keys)
+
+    plan = ac.plan_run(_spec(env, rule_files=(str(spelled),)), ac.set_lookup(covered))
+
+    assert plan.skip is True
+    assert plan.covered_count == 3
+
+
+def test_a_canonical_rule_keeps_its_original_key():
+    """Keys recorded before rules were canonicalized still match."""
+    prefix = "t\x00rule\x00fp\x00\x00"
+    for rule in ("$1$2", "sa@", "c", "T0T2"):
+        raw = hashlib.sha256((prefix + rule).encode()).hexdigest()
+        assert ac.entry_key("t", "rule", "fp", rule) == raw
+
+
+def test_coverage_recorded_under_a_rules_raw_text_still_counts(env, _store):
+    """A store written before canonicalization keyed `c u` on its raw text."""
+    spelled = env["tmp"] / "spelled.rule"
+    spelled.write_text("c u\n$1 :\n$2\n")
+    target = ac.target_id(env["hashes"])
+    fp = _store.wordlist_fingerprint(env["wordlist"])
+    prefix = f"{target}\x00rule\x00{fp}\x00\x00"
+    legacy = {
+        hashlib.sha256((prefix + rule).encode()).hexdigest()
+        for rule in ("c u", "$1 :")
+    }
+    assert not legacy & {ac.entry_key(target, "rule", fp, r) for r in ("u", "$1")}
+
+    plan = ac.plan_run(_spec(env, rule_files=(str(spelled),)), ac.set_lookup(legacy))
+
+    assert plan.covered_count == 2
+    assert plan.filtered_entries == ["$2"]
+    assert plan.record_keys == [ac.entry_key(target, "rule", fp, "$2")]
+
+
 # --- the wordlist dimension ----------------------------------------------
 
 
@@ -296,3 +338,83 @@ def test_record_only_still_goes_inert_when_identity_is_unknown(env, tmp_path):
     plan = ac.plan_run(spec, ac.set_lookup(set()))
     assert plan.is_inert
     assert plan.record_keys == []
+
+
+# --- entry manifests ------------------------------------------------------
+
+
+def test_plan_keys_match_entry_key(env):
+    """Column-wise keying must reproduce entry_key exactly, or every store
+    recorded so far would stop matching."""
+    second = env["tmp"] / "wl2.txt"
+    second.write_text("charlie\n")
+    rules = env["tmp"] / "odd.rule"
+    rules.write_bytes(b"c\n$\xc3$\xa1\n$ \n")
+    spec = _spec(
+        env,
+        wordlists=(env["wordlist"], str(second)),
+        rule_files=(str(rules),),
+        variant="inc:1-4",
+    )
+    store = ac.get_store()
+    target = ac.target_id(env["hashes"])
+    fps = [store.wordlist_fingerprint(p) for p in spec.wordlists]
+
+    plan = ac.plan_run(spec, ac.set_lookup(set()))
+
+    expected = [
+        ac.entry_key(target, "rule", fp, entry, "inc:1-4")
+        for entry in ac.read_entries(str(rules))
+        for fp in fps
+    ]
+    assert plan.record_keys == expected
+
+
+def test_plan_mask_keys_match_entry_key(env):
+    masks = env["tmp"] / "m.hcmask"
+    masks.write_text("?d,?1?1?1\n?u?l?l\n")
+    spec = ac.CoverageSpec(
+        hash_file=env["hashes"], mask_files=(str(masks),), masks=("?a?a",)
+    )
+    target = ac.target_id(env["hashes"])
+
+    plan = ac.plan_run(spec, ac.set_lookup(set()))
+
+    entries = ["?d,?1?1?1", "?u?l?l", "?a?a"]
+    assert plan.record_keys == [ac.entry_key(target, "mask", "", e) for e in entries]
+
+
+def test_rule_content_is_parsed_once(env, monkeypatch):
+    """hcatDictionary plans the same ~38k rules once per wordlist, each time
+    from a freshly written temporary file."""
+    ac.clear_manifest_memo()
+    parses = []
+    real = ac._split_entries
+    monkeypatch.setattr(
+        ac, "_split_entries", lambda raw: parses.append(raw) or real(raw)
+    )
+
+    first = ac.plan_run(_spec(env), ac.set_lookup(set()))
+    copy = env["tmp"] / "hate_crack_combined_x.rule"
+    copy.write_bytes(open(env["rules"], "rb").read())
+    again = ac.plan_run(_spec(env, rule_files=(str(copy),)), ac.set_lookup(set()))
+    assert len(parses) == 1
+    assert again.record_keys == first.record_keys
+
+    with open(copy, "a") as handle:
+        handle.write("r\n")
+    changed = ac.plan_run(_spec(env, rule_files=(str(copy),)), ac.set_lookup(set()))
+    assert len(parses) == 2
+    assert changed.total_count == 4
+    ac.clear_manifest_memo()
+
+
+def test_manifest_memo_is_bounded(env, monkeypatch):
+    ac.clear_manifest_memo()
+    monkeypatch.setattr(ac, "_MANIFEST_MEMO_SIZE", 2)
+    for i in range(4):
+        rules = env["tmp"] / f"r{i}.rule"
+        rules.write_text(f"${i}\n")
+        ac.plan_run(_spec(env, rule_files=(str(rules),)), ac.set_lookup(set()))
+    assert len(ac._manifest_memo) == 2
+    ac.clear_manifest_memo()
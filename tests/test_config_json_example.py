@@ -64,6 +64,9 @@ EXPECTED_KEYS = {
     "restore_potfile_on_start",
     "rule_debug_mode_enabled",
     "coverage_enabled",
+    "potfile_index_enabled",
+    "spoonman_heavy_hitters",
+    "coverage_sampled_fingerprint_dirs",
 }
 
 
@@ -100,10 +100,10 @@ def test_env_homed_key_set_is_pinned():
     assert {entry.env for entry in ENV_KEYS} == EXPECTED_ENV_HOMED
 
 
-def test_key_counts_are_sixteen_and_forty_one():
+def test_key_counts_are_sixteen_and_forty_four():
     assert len(ENV_KEYS) == 16
-    assert len(JSON_KEYS) == 41
-    assert len(CONFIG_SCHEMA) == 57
+    assert len(JSON_KEYS) == 44
+    assert len(CONFIG_SCHEMA) == 60
 
 
 def test_every_key_has_exactly_one_home():
@@ -156,15 +156,15 @@ def test_type_counts_match_config_json_example_value_types():
         schema_type_counts[entry.type] = schema_type_counts.get(entry.type, 0) + 1
 
     # bool, int, float map straight across.
-    assert schema_type_counts.get("bool", 0) == json_type_counts.get("bool", 0) == 8
+    assert schema_type_counts.get("bool", 0) == json_type_counts.get("bool", 0) == 10
     assert schema_type_counts.get("int", 0) == json_type_counts.get("int", 0) == 9
     assert schema_type_counts.get("float", 0) == json_type_counts.get("float", 0) == 1
     # list splits into csv_list/charset; the two must sum to the JSON list count.
     list_derived = schema_type_counts.get("csv_list", 0) + schema_type_counts.get(
         "charset", 0
     )
-    assert list_derived == json_type_counts.get("list", 0) == 8
-    assert schema_type_counts.get("csv_list", 0) == 6
+    assert list_derived == json_type_counts.get("list", 0) == 9
+    assert schema_type_counts.get("csv_list", 0) == 7
     assert schema_type_counts.get("charset", 0) == 2
     # str splits into str/path; the two must sum to the JSON str count.
     str_and_path = schema_type_counts.get("str", 0) + schema_type_counts.get("path", 0)
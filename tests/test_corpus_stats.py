@@ -707,6 +707,16 @@ def test_summarize_caps_lines_and_marks_the_result_sampled(tmp_path):
     assert 9_000 <= stats["estimated_total"] <= 11_000
 
 
+def test_summarize_known_line_count_replaces_the_estimate(tmp_path):
+    """An exact count from the wordlist catalog is reported as-is."""
+    path = _two_region_corpus(tmp_path, 10_000)
+
+    stats = corpus_stats.summarize(path, max_lines=1_000, line_count=10_000)
+
+    assert stats["sampled"] is True
+    assert stats["estimated_total"] == 10_000
+
+
 def test_summarize_cap_samples_across_the_whole_file(tmp_path):
     """The capped sample must span the corpus, not take a head slice.
 
@@ -763,6 +773,97 @@ def test_summarize_reports_progress_while_sampling(tmp_path):
     assert monkeyed[-1] <= 1_000
 
 
+# --------------------------------------------------------------------------
+# summarize() across a process pool
+# --------------------------------------------------------------------------
+
+
+def _mixed_corpus(tmp_path, count):
+    """Ties, years, suffixes and a stray CR, so a merge out of order would show."""
+    path = tmp_path / "mixed.txt"
+    with open(path, "wb") as fh:
+        for i in range(count):
+            word = ("Alpha", "bravo", "CHARLIE", "d3lta")[i % 4]
+            fh.write(f"{word}{1990 + i % 40}{'!' * (i % 3)}\n".encode())
+            if i % 97 == 0:
+                fh.write(f"{word}\r".encode())
+    return str(path)
+
+
+@pytest.mark.parametrize("max_lines", [None, 1_000])
+def test_parallel_summarize_matches_a_single_process_pass(
+    tmp_path, monkeypatch, max_lines
+):
+    """Shards merge in file order, so every ranking comes out identical."""
+    path = _mixed_corpus(tmp_path, 5_000)
+    monkeypatch.setattr(corpus_stats, "_MIN_SHARD_BYTES", 1)
+    monkeypatch.setattr(corpus_stats, "_MIN_SHARD_LINES", 1)
+
+    single = corpus_stats.summarize(path, max_lines=max_lines, workers=1)
+    seen = []
+    parallel = corpus_stats.summarize(
+        path, max_lines=max_lines, workers=3, progress=seen.append
+    )
+
+    assert parallel == single
+    assert seen == sorted(seen)
+    assert seen[-1] == single["lines_scanned"]
+
+
+def test_sampled_anchor_slices_union_to_the_whole_sample(tmp_path):
+    path = _two_region_corpus(tmp_path, 10_000)
+    size = os.path.getsize(path)
+
+    whole = list(corpus_stats._iter_sampled_lines(path, size, 1_000))
+    parts = [
+        line
+        for first, last in ((0, 333), (333, 700), (700, 1_000))
+        for line in corpus_stats._iter_sampled_lines(path, size, 1_000, first, last)
+    ]
+
+    assert parts == whole
+
+
+# --------------------------------------------------------------------------
+# distinct-password count
+# --------------------------------------------------------------------------
+
+
+def test_distinct_count_is_exact_under_the_limit():
+    distinct = corpus_stats._DistinctCounter()
+    for i in range(1_000):
+        distinct.add(f"pw{i % 700}")
+
+    assert distinct.count() == 700
+    assert not distinct.estimated
+
+
+def test_distinct_count_is_a_bounded_estimate_past_the_limit(monkeypatch):
+    monkeypatch.setattr(corpus_stats, "_EXACT_DISTINCT_LIMIT", 500)
+    left = corpus_stats._DistinctCounter()
+    right = corpus_stats._DistinctCounter()
+    for i in range(30_000):
+        left.add(f"left{i}")
+        right.add(f"left{i + 20_000}")
+
+    assert left.estimated
+    assert len(left.exact) <= 500
+    assert abs(left.count() - 30_000) < 30_000 * 0.03
+    left.merge(right)
+    assert abs(left.count() - 50_000) < 50_000 * 0.03
+
+
+def test_estimated_distinct_count_is_marked_in_the_summary(tmp_path, monkeypatch):
+    monkeypatch.setattr(corpus_stats, "_EXACT_DISTINCT_LIMIT", 50)
+    path = _two_region_corpus(tmp_path, 1_000)
+
+    stats = corpus_stats.summarize(path)
+
+    assert stats["unique_estimated"] is True
+    assert abs(stats["unique"] - 1_000) < 50
+    assert f"(~{stats['unique']} distinct" in corpus_stats.format_summary(stats)
+
+
 def test_format_summary_does_not_claim_full_coverage_when_sampled(tmp_path):
     """A sampled summary must not tell the model the figures cover everything.
 
@@ -795,11 +896,126 @@ def test_corpus_context_passes_the_configured_cap(tmp_path, monkeypatch):
     seen = {}
     real = corpus_stats.summarize
 
-    def spy(p, progress=None, max_lines=None):
+    def spy(p, progress=None, max_lines=None, **kwargs):
         seen["max_lines"] = max_lines
-        return real(p, progress=progress, max_lines=max_lines)
+        return real(p, progress=progress, max_lines=max_lines, **kwargs)
 
     monkeypatch.setattr(hc_main._corpus_stats, "summarize", spy)
     hc_main._corpus_context(path, source_label="pattern source")
 
     assert seen["max_lines"] == 1_000
+
+
+# --------------------------------------------------------------------------
+# main._corpus_context — persistent profile cache
+# --------------------------------------------------------------------------
+
+
+def _count_summaries(monkeypatch):
+    calls = []
+    real = corpus_stats.summarize
+
+    def spy(*args, **kwargs):
+        calls.append(args[0])
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(hc_main._corpus_stats, "summarize", spy)
+    return calls
+
+
+def test_corpus_context_reuses_the_profile_of_identical_content(
+    tmp_path, monkeypatch, capsys
+):
+    monkeypatch.setattr(hc_main, "ollamaMaxSampleLines", 500)
+    first_path = _corpus(tmp_path, ["Alpha2024!", "Bravo2024"], name="a.txt")
+    copy_path = _corpus(tmp_path, ["Alpha2024!", "Bravo2024"], name="copy.txt")
+    calls = _count_summaries(monkeypatch)
+
+    first = hc_main._corpus_context(first_path)
+    capsys.readouterr()
+    # As a coverage run or `hate_crack wordlists index` would have.
+    hc_main._coverage.get_store().wordlist_fingerprint(copy_path)
+    again = hc_main._corpus_context(copy_path)
+
+    assert calls == [first_path]
+    assert again == first
+    out = capsys.readouterr().out
+    assert "cached profile" in out
+    assert "Analyzed all 2 passwords" in out
+
+
+def test_corpus_context_profiles_again_when_content_or_cap_changes(
+    tmp_path, monkeypatch
+):
+    path = _corpus(tmp_path, ["Alpha2024!", "Bravo2024"])
+    calls = _count_summaries(monkeypatch)
+    hc_main._corpus_context(path)
+
+    monkeypatch.setattr(hc_main, "hcatCorpusProfileMaxLines", 1)
+    hc_main._corpus_context(path)
+    with open(path, "a", encoding="latin-1") as fh:
+        fh.write("Charlie1\n")
+    context = hc_main._corpus_context(path)
+
+    assert len(calls) == 3
+    assert "Charlie1" in context["sample"]
+
+
+def test_corpus_context_hashes_a_first_seen_corpus_while_profiling_it(
+    tmp_path, monkeypatch
+):
+    import threading
+
+    path = _corpus(tmp_path, ["Alpha2024!", "Bravo2024"])
+    profiling = threading.Event()
+    real_hash = hc_main._coverage._sha256_file
+    real_summarize = corpus_stats.summarize
+    calls = []
+
+    def hash_once_profiling(p):
+        if not profiling.wait(5):
+            pytest.fail("hashed before the profile read began")
+        return real_hash(p)
+
+    def summarize(*args, **kwargs):
+        calls.append(args[0])
+        profiling.set()
+        return real_summarize(*args, **kwargs)
+
+    monkeypatch.setattr(hc_main._coverage, "_sha256_file", hash_once_profiling)
+    monkeypatch.setattr(hc_main._corpus_stats, "summarize", summarize)
+
+    first = hc_main._corpus_context(path)
+    again = hc_main._corpus_context(path)
+
+    assert calls == [path]
+    assert again == first
+
+
+def test_corpus_context_never_hashes_a_large_unknown_corpus(tmp_path, monkeypatch):
+    monkeypatch.setattr(hc_main, "CORPUS_PROFILE_HASH_MAX_BYTES", 0)
+    monkeypatch.setattr(
+        hc_main._coverage, "_sha256_file", lambda p: pytest.fail("hashed")
+    )
+    path = _corpus(tmp_path, ["Alpha2024!", "Bravo2024"])
+    calls = _count_summaries(monkeypatch)
+
+    hc_main._corpus_context(path)
+    hc_main._corpus_context(path)
+
+    assert len(calls) == 2
+
+
+def test_profile_cache_lookup_never_creates_the_database(tmp_path):
+    from hate_crack import corpus_profile_cache
+
+    db = tmp_path / "profiles" / "profiles.sqlite3"
+    cache = corpus_profile_cache.CorpusProfileCache(db)
+    try:
+        assert cache.lookup("0" * 64, 10, 500) is None
+        assert not db.exists()
+        assert cache.record("0" * 64, 10, 500, {"total": 1}, {"summary": "S"})
+        assert cache.lookup("0" * 64, 10, 500) == ({"total": 1}, {"summary": "S"})
+        assert cache.lookup("0" * 64, 11, 500) is None
+    finally:
+        cache.close()
@@ -168,6 +168,131 @@ def test_coverage_forget_runs_end_to_end(
     assert store.covered(["a", "b"]) == set()
 
 
+def test_export_then_merge_moves_coverage_between_stores(
+    main_module, store, hashes, tmp_path, monkeypatch, capsys
+):
+    target = ac.target_id(hashes)
+    store.record(["a", "b"], target=target, attack="Dictionary")
+    out = str(tmp_path / "target.hccov")
+    code = main_module._run_coverage_command(
+        _args(coverage_command="export", hashfile=hashes, output=out)
+    )
+    assert code == 0
+    assert "Exported 2 covered entries from 1 run" in capsys.readouterr().out
+
+    node = ac.CoverageStore(tmp_path / "node.sqlite3")
+    monkeypatch.setattr(ac, "get_store", lambda: node)
+    try:
+        monkeypatch.setattr(
+            main_module.sys, "argv", ["hate_crack", "coverage", "merge", out]
+        )
+        with pytest.raises(SystemExit) as excinfo:
+            main_module.main()
+        assert excinfo.value.code == 0
+        assert "Merged 2 new covered entries and 1 new run" in capsys.readouterr().out
+        assert node.covered(["a", "b"]) == {"a", "b"}
+    finally:
+        node.close()
+
+
+def test_merging_something_else_is_an_error(main_module, store, hashes, capsys):
+    code = main_module._run_coverage_command(
+        _args(coverage_command="merge", file=hashes)
+    )
+    assert code == 1
+    assert "not a coverage export" in capsys.readouterr().out
+
+
+def test_an_unwritable_export_is_an_error(main_module, store, hashes, tmp_path, capsys):
+    code = main_module._run_coverage_command(
+        _args(
+            coverage_command="export",
+            hashfile=hashes,
+            output=str(tmp_path / "missing" / "out.hccov"),
+        )
+    )
+    assert code == 1
+    assert "Cannot write" in capsys.readouterr().out
+
+
+def _maintain(**kw):
+    base = dict(coverage_command="maintain", prune_days=None, vacuum=False, yes=False)
+    return _args(**{**base, **kw})
+
+
+def _age(store, target):
+    store._connect().execute(
+        "UPDATE runs SET ran_at = '2020-01-01T00:00:00+00:00' WHERE target = ?",
+        (target,),
+    )
+    store._connect().commit()
+
+
+def test_maintain_reports_each_target(main_module, store, hashes, capsys):
+    target = ac.target_id(hashes)
+    store.record(["a", "b"], target=target, attack="Dictionary")
+
+    assert main_module._run_coverage_command(_maintain()) == 0
+    out = capsys.readouterr().out
+    assert "vacuum    : incremental" in out
+    assert f"{target[:16]}..." in out and "2      1" in out
+
+
+def test_maintain_prunes_idle_targets_after_confirming(
+    main_module, store, hashes, capsys
+):
+    target = ac.target_id(hashes)
+    store.record(["a"], target=target, attack="Dictionary")
+    store.record(["b"], target="recent", attack="Dictionary")
+    _age(store, target)
+
+    with patch("builtins.input", return_value="n"):
+        main_module._run_coverage_command(_maintain(prune_days=30))
+    assert "Left unchanged" in capsys.readouterr().out
+    assert store.covered(["a", "b"]) == {"a", "b"}
+
+    with patch("builtins.input", return_value="y"):
+        code = main_module._run_coverage_command(_maintain(prune_days=30))
+    assert code == 0
+    assert "Pruned 1 target (1 covered entry)" in capsys.readouterr().out
+    assert store.covered(["a", "b"]) == {"b"}
+
+
+def test_maintain_forgets_only_the_targets_it_listed(
+    main_module, store, hashes, capsys
+):
+    store.record(["a"], target="shown", attack="Dictionary")
+    store.record(["b"], target="later", attack="Dictionary")
+    _age(store, "shown")
+
+    def answer(prompt):
+        # Goes stale while the operator reads the list.
+        _age(store, "later")
+        return "y"
+
+    with patch("builtins.input", side_effect=answer):
+        main_module._run_coverage_command(_maintain(prune_days=30))
+
+    assert "Pruned 1 target (1 covered entry)" in capsys.readouterr().out
+    assert store.covered(["a", "b"]) == {"b"}
+
+
+def test_maintain_vacuum_runs_end_to_end(
+    main_module, store, hashes, monkeypatch, capsys
+):
+    store.record([f"k{i}" for i in range(5000)], target="old")
+    store.forget_target("old")
+    monkeypatch.setattr(
+        main_module.sys,
+        "argv",
+        ["hate_crack", "coverage", "maintain", "--prune-days", "30", "--vacuum"],
+    )
+    with pytest.raises(SystemExit) as excinfo:
+        main_module.main()
+    assert excinfo.value.code == 0
+    assert "(0.0 MB free)" in capsys.readouterr().out
+
+
 # --- the scripted skip exit code -------------------------------------------
 
 
@@ -0,0 +1,122 @@
+"""Unit tests for hate_crack.cracked_index — the incremental plaintext index."""
+
+import os
+
+os.environ["HATE_CRACK_SKIP_INIT"] = "1"
+from hate_crack import cracked_index  # noqa: E402
+from hate_crack.cracked_index import CrackedPlaintextIndex  # noqa: E402
+
+
+def _append(path, text):
+    with open(path, "ab") as f:
+        f.write(text.encode("utf-8"))
+
+
+def test_extracts_last_field_and_decodes_hex(tmp_path):
+    out = tmp_path / "hashes.txt.out"
+    hex_plain = "Sömmer2025!".encode("latin-1").hex()
+    out.write_text(
+        f"deadbeef:$HEX[{hex_plain}]\n"
+        "user::DOMAIN:1122:aabb:ccdd:Pass:word\n"
+        "no-colon-line\n"
+    )
+
+    index = CrackedPlaintextIndex(str(out))
+
+    assert index.plaintexts() == ["Sömmer2025!", "word"]
+
+
+def test_only_new_lines_are_decoded_after_a_refresh(tmp_path, monkeypatch):
+    out = tmp_path / "hashes.txt.out"
+    out.write_text("h1:first\nh2:second\n")
+    index = CrackedPlaintextIndex(str(out))
+    index.refresh()
+
+    decoded = []
+    real = cracked_index._plaintext_from_line
+
+    def spy(raw):
+        decoded.append(raw)
+        return real(raw)
+
+    monkeypatch.setattr(cracked_index, "_plaintext_from_line", spy)
+    _append(out, "h3:third\n")
+
+    assert CrackedPlaintextIndex(str(out)).plaintexts() == [
+        "first",
+        "second",
+        "third",
+    ]
+    assert decoded == [b"h3:third"]
+
+
+def test_plaintexts_since_checkpoint(tmp_path):
+    out = tmp_path / "hashes.txt.out"
+    out.write_text("h1:first\n")
+    index = CrackedPlaintextIndex(str(out))
+    index.refresh()
+    checkpoint = index.checkpoint()
+
+    _append(out, "h2:second\nh3:third\n")
+
+    assert index.plaintexts_since(checkpoint) == ["second", "third"]
+    assert index.plaintexts_since(index.checkpoint()) == []
+
+
+def test_partial_trailing_line_waits_for_its_newline(tmp_path):
+    out = tmp_path / "hashes.txt.out"
+    out.write_text("h1:first\nh2:sec")
+    index = CrackedPlaintextIndex(str(out))
+
+    assert index.plaintexts() == ["first"]
+
+    _append(out, "ond\n")
+
+    assert index.plaintexts() == ["first", "second"]
+
+
+def test_replaced_source_rebuilds_the_index(tmp_path):
+    """_run_hashcat_show swaps .out via os.replace; the old offset is void."""
+    out = tmp_path / "hashes.txt.out"
+    out.write_text("h1:first\nh2:second\n")
+    index = CrackedPlaintextIndex(str(out))
+    index.refresh()
+
+    replacement = tmp_path / "replacement"
+    replacement.write_text("h9:other\n")
+    os.replace(replacement, out)
+
+    assert index.plaintexts() == ["other"]
+
+
+def test_rewritten_prefix_rebuilds_the_index(tmp_path):
+    out = tmp_path / "hashes.txt.out"
+    out.write_text("h1:first\n")
+    index = CrackedPlaintextIndex(str(out))
+    index.refresh()
+
+    with open(out, "r+b") as f:
+        f.write(b"h1:FIRST\nh2:more\n")
+
+    assert index.plaintexts() == ["FIRST", "more"]
+
+
+def test_missing_source_clears_the_index(tmp_path):
+    out = tmp_path / "hashes.txt.out"
+    out.write_text("h1:first\n")
+    index = CrackedPlaintextIndex(str(out))
+    index.refresh()
+    out.unlink()
+
+    assert index.plaintexts() == []
+    assert not os.path.exists(index.index_path)
+
+
+def test_export_matches_the_working_file_layout(tmp_path):
+    out = tmp_path / "hashes.txt.out"
+    out.write_text("h1:first\nh2:second\n")
+    working = tmp_path / "hashes.txt.working"
+
+    CrackedPlaintextIndex(str(out)).export(str(working))
+
+    assert working.read_text() == "first\nsecond"
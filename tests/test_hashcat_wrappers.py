@@ -1,3 +1,5 @@
+import contextlib
+
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -526,70 +528,113 @@ class TestHcatRecycle:
 
         mock_popen.assert_not_called()
 
-    def test_popen_called_when_count_nonzero(self, main_module, tmp_path):
-        hash_file = str(tmp_path / "hashes.txt")
-        out_file = tmp_path / "hashes.txt.out"
-        out_file.write_text("hash1:password1\nhash2:password2\n")
-        mock_proc = _make_mock_proc()
-
-        with (
+    def _recycle_patches(self, main_module, mock_proc, rules=("best66.rule",)):
+        return (
             patch.object(main_module, "hcatBin", "hashcat"),
             patch.object(main_module, "hcatTuning", ""),
             patch.object(main_module, "hcatPotfilePath", ""),
-            patch.object(main_module, "hcatRules", ["best66.rule"]),
+            patch.object(main_module, "hcatRules", list(rules)),
             patch.object(
                 main_module, "generate_session_id", return_value="test_session"
             ),
             patch.object(
-                main_module, "get_rule_path", return_value="/fake/best66.rule"
-            ),
-            patch("hate_crack.main._write_delimited_field"),
-            patch(
-                "hate_crack.main.convert_hex", return_value=["password1", "password2"]
+                main_module, "get_rule_path", side_effect=lambda r: f"/fake/{r}"
             ),
             patch("hate_crack.main._add_debug_mode_for_rules", side_effect=lambda c: c),
-            patch("builtins.open", create=True) as mock_open,
-            patch(
-                "hate_crack.main.subprocess.Popen", return_value=mock_proc
-            ) as mock_popen,
-        ):
-            mock_open.return_value.__enter__ = MagicMock(return_value=MagicMock())
-            mock_open.return_value.__exit__ = MagicMock(return_value=False)
-            main_module.hcatRecycle("1000", hash_file, 5)
+            patch("hate_crack.main.subprocess.Popen", return_value=mock_proc),
+        )
+
+    def _run_recycle(self, main_module, hash_file, count, mock_proc, **kwargs):
+        patches = self._recycle_patches(main_module, mock_proc, **kwargs)
+        with contextlib.ExitStack() as stack:
+            entered = [stack.enter_context(p) for p in patches]
+            main_module.hcatRecycle("1000", hash_file, count)
+        return entered[-1]
+
+    def test_popen_called_when_count_nonzero(self, main_module, tmp_path):
+        hash_file = str(tmp_path / "hashes.txt")
+        out_file = tmp_path / "hashes.txt.out"
+        out_file.write_text("hash1:password1\nhash2:password2\n")
+
+        mock_popen = self._run_recycle(main_module, hash_file, 5, _make_mock_proc())
 
         assert mock_popen.call_count >= 1
+        working = (tmp_path / "hashes.txt.working").read_text().splitlines()
+        assert working == ["password1", "password2"]
 
     def test_rule_path_in_cmd_when_count_nonzero(self, main_module, tmp_path):
         hash_file = str(tmp_path / "hashes.txt")
-        mock_proc = _make_mock_proc()
+        (tmp_path / "hashes.txt.out").write_text("hash1:pass1\n")
 
-        with (
-            patch.object(main_module, "hcatBin", "hashcat"),
-            patch.object(main_module, "hcatTuning", ""),
-            patch.object(main_module, "hcatPotfilePath", ""),
-            patch.object(main_module, "hcatRules", ["best66.rule"]),
-            patch.object(
-                main_module, "generate_session_id", return_value="test_session"
-            ),
-            patch.object(
-                main_module, "get_rule_path", return_value="/fake/best66.rule"
-            ),
-            patch("hate_crack.main._write_delimited_field"),
-            patch("hate_crack.main.convert_hex", return_value=["pass1"]),
-            patch("hate_crack.main._add_debug_mode_for_rules", side_effect=lambda c: c),
-            patch("builtins.open", create=True) as mock_open,
-            patch(
-                "hate_crack.main.subprocess.Popen", return_value=mock_proc
-            ) as mock_popen,
-        ):
-            mock_open.return_value.__enter__ = MagicMock(return_value=MagicMock())
-            mock_open.return_value.__exit__ = MagicMock(return_value=False)
-            main_module.hcatRecycle("1000", hash_file, 3)
+        mock_popen = self._run_recycle(main_module, hash_file, 3, _make_mock_proc())
 
         cmd = mock_popen.call_args[0][0]
         assert "-r" in cmd
         assert "/fake/best66.rule" in cmd
 
+    def test_second_recycle_only_feeds_new_plaintexts(self, main_module, tmp_path):
+        hash_file = str(tmp_path / "hashes.txt")
+        out_file = tmp_path / "hashes.txt.out"
+        out_file.write_text("hash1:password1\nhash2:password2\n")
+        mock_proc = _make_mock_proc()
+        mock_proc.returncode = 1  # keyspace exhausted: a finished run
+
+        self._run_recycle(main_module, hash_file, 2, mock_proc)
+        with open(out_file, "a") as f:
+            f.write("hash3:password3\nhash4:password1\n")
+        mock_popen = self._run_recycle(main_module, hash_file, 2, mock_proc)
+
+        assert mock_popen.call_count == 1
+        working = (tmp_path / "hashes.txt.working").read_text().splitlines()
+        assert working == ["password3", "password1"]
+
+    def test_nothing_new_skips_hashcat(self, main_module, tmp_path):
+        hash_file = str(tmp_path / "hashes.txt")
+        (tmp_path / "hashes.txt.out").write_text("hash1:password1\n")
+        mock_proc = _make_mock_proc()
+        mock_proc.returncode = 1
+
+        self._run_recycle(main_module, hash_file, 1, mock_proc)
+        mock_popen = self._run_recycle(main_module, hash_file, 1, mock_proc)
+
+        mock_popen.assert_not_called()
+
+    def test_unfinished_run_is_offered_again(self, main_module, tmp_path):
+        """Only a run that exhausted its keyspace moves the rule's checkpoint."""
+        hash_file = str(tmp_path / "hashes.txt")
+        (tmp_path / "hashes.txt.out").write_text("hash1:password1\n")
+        mock_proc = _make_mock_proc()
+        mock_proc.returncode = 255
+
+        self._run_recycle(main_module, hash_file, 1, mock_proc)
+        mock_popen = self._run_recycle(main_module, hash_file, 1, mock_proc)
+
+        assert mock_popen.call_count == 1
+        working = (tmp_path / "hashes.txt.working").read_text().splitlines()
+        assert working == ["password1"]
+
+    def test_new_rule_file_gets_every_plaintext(self, main_module, tmp_path):
+        hash_file = str(tmp_path / "hashes.txt")
+        out_file = tmp_path / "hashes.txt.out"
+        out_file.write_text("hash1:password1\n")
+        mock_proc = _make_mock_proc()
+        mock_proc.returncode = 1
+
+        self._run_recycle(main_module, hash_file, 1, mock_proc, rules=("a.rule",))
+        with open(out_file, "a") as f:
+            f.write("hash2:password2\n")
+        mock_popen = self._run_recycle(
+            main_module, hash_file, 1, mock_proc, rules=("a.rule", "b.rule")
+        )
+
+        cmds = [c[0][0] for c in mock_popen.call_args_list]
+        assert [cmd[cmd.index("-r") + 1] for cmd in cmds] == [
+            "/fake/a.rule",
+            "/fake/b.rule",
+        ]
+        working = (tmp_path / "hashes.txt.working").read_text().splitlines()
+        assert working == ["password1", "password2"]
+
 
 class TestHcatTopMask:
     def test_decodes_hex_wrapped_plaintext_before_statsgen(self, main_module, tmp_path):
@@ -959,6 +959,100 @@ class TestHashviewAPI:
         assert "Hashview rejected 1 plaintext" in out
         assert ntlm_newline in out
 
+    def _newline_hex_lines(self, count):
+        """``count`` NTLM lines whose plaintext holds a CR/LF, so each one is
+        sent as a verbatim $HEX[...] token."""
+        lines, hashes = [], []
+        for i in range(count):
+            raw = f"Synthetic-Break-{i:04d}".encode() + b"\n"
+            digest = _digest_for_type("1000", raw)
+            lines.append(f"{digest}:$HEX[{raw.hex()}]\n".encode())
+            hashes.append(digest)
+        return lines, hashes
+
+    def test_upload_bisects_hex_lines_instead_of_resending_the_batch(
+        self, api, tmp_path
+    ):
+        """A Hashview that rejects every $HEX[...] line must not cost one
+        re-upload of the full batch per rejection: the clean lines go up in a
+        single request and the suspect lines are isolated and bisected."""
+        suspect, suspect_hashes = self._newline_hex_lines(16)
+        clean = [
+            f"{_synth_digest('1000', f'Synthetic-Clean-{i}')}:Synthetic-Clean-{i}\n"
+            for i in range(50)
+        ]
+        cracked_file = tmp_path / "cracked.txt"
+        cracked_file.write_bytes(b"".join(suspect) + "".join(clean).encode())
+
+        bodies = []
+
+        def fake_post(url, data=None, headers=None, timeout=None):
+            bodies.append(data)
+            response = Mock()
+            response.raise_for_status = Mock()
+            first = data.split(b"\n", 1)[0]
+            if b"$HEX[" in first:
+                bad_hash = first.split(b":", 1)[0].decode()
+                response.json.return_value = {
+                    "type": "Error",
+                    "msg": f"Plaintext for hash {bad_hash}, was found to be invalid.",
+                }
+            else:
+                response.json.return_value = {"msg": "OK"}
+            return response
+
+        api.session.post.side_effect = fake_post
+
+        result = api.upload_cracked_hashes(str(cracked_file), hash_type="1000")
+
+        assert result["uploaded"] == 50
+        assert result["skipped"] == 16
+        clean_bodies = [b for b in bodies if b"Synthetic-Clean" in b]
+        # No request ever mixes the clean batch with a suspect line, and the
+        # suspect lines cost a bounded number of small requests.
+        assert len(clean_bodies) == 1
+        assert b"$HEX[" not in clean_bodies[0]
+        assert len(bodies) <= 2 * len(suspect) + 1
+        lines_sent = sum(b.count(b"\n") + 1 for b in bodies)
+        assert lines_sent < 16 * 16
+
+    def test_upload_hex_lines_accepted_in_one_request_by_hex_aware_server(
+        self, api, tmp_path
+    ):
+        suspect, _ = self._newline_hex_lines(5)
+        cracked_file = tmp_path / "cracked.txt"
+        cracked_file.write_bytes(b"".join(suspect))
+        ok = Mock()
+        ok.json.return_value = {"msg": "OK"}
+        ok.raise_for_status = Mock()
+        api.session.post.return_value = ok
+
+        result = api.upload_cracked_hashes(str(cracked_file), hash_type="1000")
+
+        assert api.session.post.call_count == 1
+        assert result["uploaded"] == 5
+        assert result["skipped"] == 0
+
+    def test_upload_rejection_naming_an_absent_hash_terminates(self, api, tmp_path):
+        """An error naming a hash that is not in the batch still narrows the
+        batch down, rather than re-sending it unchanged."""
+        suspect, _ = self._newline_hex_lines(3)
+        cracked_file = tmp_path / "cracked.txt"
+        cracked_file.write_bytes(b"".join(suspect))
+        error = Mock()
+        error.json.return_value = {
+            "type": "Error",
+            "msg": f"Plaintext for hash {'0' * 32}, was found to be invalid.",
+        }
+        error.raise_for_status = Mock()
+        api.session.post.return_value = error
+
+        result = api.upload_cracked_hashes(str(cracked_file), hash_type="1000")
+
+        assert result["uploaded"] == 0
+        assert result["skipped"] == 3
+        assert api.session.post.call_count == 5
+
     def test_upload_surfaces_client_counts(self, api, tmp_path):
         """upload_cracked_hashes reports uploaded/skipped even when the server
         returns a bare OK with no counts of its own."""
@@ -87,7 +87,83 @@ class TestHcatSpoonman:
         monkeypatch.setattr(main_module, "hcatHashType", "1000")
         monkeypatch.setattr(main_module, "pwdump_format", False)
         main_module.cleanup()
-        assert not os.path.exists(hash_file + ".spoonman")
+        # Only the incremental state outlives the session; see the test below.
+        assert os.listdir(hash_file + ".spoonman") == [
+            main_module.SPOONMAN_STATE_DIR
+        ]
+
+    def test_next_session_resumes_from_the_state_cleanup_kept(
+        self, main_module, tmp_path, corpus, monkeypatch, capsys
+    ):
+        hash_file = self._hash_file(tmp_path)
+        self._run(main_module, tmp_path, corpus, monkeypatch)
+        monkeypatch.setattr(main_module, "hcatHashFile", hash_file)
+        monkeypatch.setattr(main_module, "hcatHashFileOrig", hash_file)
+        monkeypatch.setattr(main_module, "hcatHashType", "1000")
+        monkeypatch.setattr(main_module, "pwdump_format", False)
+        main_module.cleanup()
+        cache_dir = hash_file + ".spoonman"
+        assert not os.path.exists(os.path.join(cache_dir, "basewords.txt"))
+
+        calls = []
+        real_usable = rulegen.usable_plaintext
+
+        def counting(*args, **kwargs):
+            calls.append(args[0])
+            return real_usable(*args, **kwargs)
+
+        monkeypatch.setattr(rulegen, "usable_plaintext", counting)
+        capsys.readouterr()
+        quick = self._run(main_module, tmp_path, corpus, monkeypatch)
+
+        assert "Folding 0 appended bytes" in capsys.readouterr().out
+        assert calls == []
+        quick.assert_called_once()
+        with open(_wordlists(quick)[0], encoding="latin-1") as handle:
+            assert {"password", "summer"} <= set(handle.read().split())
+
+    def test_interrupted_derivation_resumes_and_survives_cleanup(
+        self, main_module, tmp_path, corpus, monkeypatch, capsys
+    ):
+        hash_file = self._hash_file(tmp_path)
+        monkeypatch.setattr(rulegen, "_PRUNE_CHECK_INTERVAL", 1)
+        monkeypatch.setattr(rulegen, "_CHECKPOINT_SECONDS", 0)
+        calls = []
+        real_usable = rulegen.usable_plaintext
+
+        def interrupt_pass_two(*args, **kwargs):
+            calls.append(args[0])
+            if len(calls) == 5:
+                raise KeyboardInterrupt
+            return real_usable(*args, **kwargs)
+
+        monkeypatch.setattr(rulegen, "usable_plaintext", interrupt_pass_two)
+        with pytest.raises(KeyboardInterrupt):
+            self._run(main_module, tmp_path, corpus, monkeypatch)
+        checkpoint = os.path.join(
+            hash_file + ".spoonman", main_module.SPOONMAN_CHECKPOINT_DIR
+        )
+        assert os.listdir(checkpoint)
+
+        monkeypatch.setattr(main_module, "hcatHashFile", hash_file)
+        monkeypatch.setattr(main_module, "hcatHashFileOrig", hash_file)
+        monkeypatch.setattr(main_module, "hcatHashType", "1000")
+        monkeypatch.setattr(main_module, "pwdump_format", False)
+        main_module.cleanup()
+        assert os.listdir(hash_file + ".spoonman") == [
+            main_module.SPOONMAN_CHECKPOINT_DIR
+        ]
+
+        calls.clear()
+        capsys.readouterr()
+        quick = self._run(main_module, tmp_path, corpus, monkeypatch)
+
+        assert "Resuming derivation" in capsys.readouterr().out
+        # Pass 1 was finished and pass 2 had counted its first password, so
+        # only the last two lines are read again.
+        assert calls == ["password", "Summer2026"]
+        quick.assert_called_once()
+        assert not os.path.exists(checkpoint)
 
     def test_missing_corpus_reports_and_does_not_run_hashcat(
         self, main_module, tmp_path, monkeypatch, capsys
@@ -387,6 +463,36 @@ class TestSpoonmanCacheProvenance:
         assert "Reusing derived" in capsys.readouterr().out
         assert quick.call_args[0][2].endswith("rules.top75.rule")
 
+    def test_switching_to_heavy_hitters_regenerates(
+        self, main_module, tmp_path, corpus, capsys
+    ):
+        self._run(main_module, tmp_path, corpus)
+        capsys.readouterr()
+
+        with patch.object(main_module, "spoonman_heavy_hitters", True):
+            with patch(
+                "hate_crack.rulegen.generate", wraps=main_module._rulegen.generate
+            ) as generate:
+                self._run(main_module, tmp_path, corpus)
+
+        assert "different counting mode" in capsys.readouterr().out
+        assert generate.call_args.kwargs["heavy_hitters"] is True
+
+    def test_appended_corpus_folds_in_only_the_new_lines(
+        self, main_module, tmp_path, corpus, capsys
+    ):
+        self._run(main_module, tmp_path, corpus)
+        capsys.readouterr()
+        with open(corpus, "a", encoding="latin-1") as handle:
+            handle.write("quibblefox\nquibblefox7\n")
+
+        again = self._run(main_module, tmp_path, corpus)
+
+        out = capsys.readouterr().out
+        assert "the corpus has changed" in out
+        assert "Folding" in out
+        assert {"quibblefox", "password", "summer"} <= self._basewords(again)
+
     def test_provenance_records_the_corpus_it_derived_from(
         self, main_module, tmp_path, corpus
     ):
@@ -435,6 +541,38 @@ class TestHcatSpoonmanGzip:
         for word in words:
             assert all(0x20 <= ord(c) <= 0x7E for c in word), word
 
+    def test_interrupted_derivation_of_a_gzip_corpus_resumes(
+        self, main_module, tmp_path, monkeypatch, capsys
+    ):
+        """The corpus is decompressed to a fresh temporary file on every run,
+        so a checkpoint keyed on that file would never match the next one."""
+        corpus = self._gzip_corpus(tmp_path)
+        monkeypatch.setattr(rulegen, "_PRUNE_CHECK_INTERVAL", 1)
+        monkeypatch.setattr(rulegen, "_CHECKPOINT_SECONDS", 0)
+        calls = []
+        real_usable = rulegen.usable_plaintext
+
+        def interrupt_pass_two(*args, **kwargs):
+            calls.append(args[0])
+            if len(calls) == 4:
+                raise KeyboardInterrupt
+            return real_usable(*args, **kwargs)
+
+        monkeypatch.setattr(rulegen, "usable_plaintext", interrupt_pass_two)
+        with patch.object(main_module, "hcatQuickDictionary"):
+            with pytest.raises(KeyboardInterrupt):
+                main_module.hcatSpoonman("1000", self._hash_file(tmp_path), corpus)
+
+        calls.clear()
+        capsys.readouterr()
+        with patch.object(main_module, "hcatQuickDictionary") as quick:
+            main_module.hcatSpoonman("1000", self._hash_file(tmp_path), corpus)
+
+        assert "Resuming derivation" in capsys.readouterr().out
+        # Only pass 2's last line is read again.
+        assert len(calls) == 1
+        quick.assert_called_once()
+
     def test_leet_restoration_is_enabled_and_actually_restores(
         self, main_module, tmp_path
     ):
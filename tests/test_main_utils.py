@@ -332,6 +332,46 @@ class TestRunHashcatShow:
 
         assert any("--potfile-path=/my/potfile" in arg for arg in captured_cmd)
 
+    def test_potfile_index_answers_without_hashcat(self, main_module, tmp_path):
+        potfile = tmp_path / "hashcat.potfile"
+        potfile.write_text("8846f7eaee8fb117ad06bdd830b7586c:password\n")
+        hash_file = tmp_path / "h.txt"
+        hash_file.write_text("8846F7EAEE8FB117AD06BDD830B7586C\n")
+        output = tmp_path / "out.txt"
+
+        with (
+            patch("hate_crack.main.subprocess.run") as mock_run,
+            patch.object(main_module, "hcatPotfilePath", str(potfile)),
+            patch.object(main_module, "hcatUsernamePrefix", False),
+            patch.object(main_module, "potfile_index_enabled", True),
+            patch(
+                "hate_crack.potfile_index._index_dir", return_value=tmp_path / "idx"
+            ),
+        ):
+            main_module._run_hashcat_show("1000", str(hash_file), str(output))
+
+        mock_run.assert_not_called()
+        assert output.read_text() == "8846f7eaee8fb117ad06bdd830b7586c:password\n"
+
+    def test_potfile_index_defers_to_hashcat_for_salted_modes(
+        self, main_module, tmp_path
+    ):
+        mock_result = self._make_mock_result(b"abc:password\n")
+        output = tmp_path / "out.txt"
+
+        with (
+            patch(
+                "hate_crack.main.subprocess.run", return_value=mock_result
+            ) as mock_run,
+            patch.object(main_module, "hcatBin", "hashcat"),
+            patch.object(main_module, "hcatPotfilePath", ""),
+            patch.object(main_module, "potfile_index_enabled", True),
+        ):
+            main_module._run_hashcat_show("5600", "/tmp/h.txt", str(output))
+
+        mock_run.assert_called_once()
+        assert output.read_text() == "abc:password\n"
+
 
 class TestDedupNetntlmByUsername:
     def test_no_duplicates_no_output_file(self, tmp_path):
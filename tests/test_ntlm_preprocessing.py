@@ -1,5 +1,6 @@
 """Tests for NTLM/NetNTLM hash preprocessing helpers (issues #27 and #28)."""
 
+import os
 import sys
 import importlib
 
@@ -258,6 +259,32 @@ class TestDedupNetntlmByUsername:
         for line in lines:
             assert "\r" not in line
 
+    def test_single_pass_leaves_no_temp_file(self, tmp_path, main_module):
+        hash_file = tmp_path / "netntlm.txt"
+        hash_file.write_text(
+            "user1::DOMAIN:challenge1:response1:blob1\n"
+            "user1::DOMAIN:challenge2:response2:blob2\n"
+        )
+        output_file = tmp_path / "dedup.txt"
+        main_module._dedup_netntlm_by_username(str(hash_file), str(output_file))
+        assert output_file.exists()
+        assert not (tmp_path / "dedup.txt.tmp").exists()
+
+    def test_no_duplicates_leaves_existing_output_alone(self, tmp_path, main_module):
+        hash_file = tmp_path / "netntlm.txt"
+        hash_file.write_text("user1::DOMAIN:challenge1:response1:blob1\n")
+        output_file = tmp_path / "dedup.txt"
+        output_file.write_text("previous\n")
+        main_module._dedup_netntlm_by_username(str(hash_file), str(output_file))
+        assert output_file.read_text() == "previous\n"
+        assert not (tmp_path / "dedup.txt.tmp").exists()
+
+    def test_username_key_is_case_insensitive(self, main_module):
+        assert main_module._username_key("Alice") == main_module._username_key(
+            "ALICE"
+        )
+        assert main_module._username_key("alice") != main_module._username_key("bob")
+
 
 class TestWriteFieldSortedUnique:
     """Test _write_field_sorted_unique helper for extracting hash fields."""
@@ -575,6 +602,106 @@ class TestPwdumpFilterPipeline:
         assert "e52cac67419a9a224a3b108f3fa6cb6d" in lm_hashes
 
 
+class TestScanPwdump:
+    """_scan_pwdump must reproduce the old multi-pass pipeline in one pass."""
+
+    DUMP = (
+        "Administrator:500:aad3b435b51404eeaad3b435b51404ee:"
+        "31d6cfe0d16ae931b73c59d7e0c089c0:::\n"
+        "WS01$:1001:aad3b435b51404eeaad3b435b51404ee:"
+        "a4f49c406510bdcab6824ee7c30fd852:::\n"
+        "\n"
+        "alice:1102:e52cac67419a9a224a3b108f3fa6cb6d:"
+        "8846f7eaee8fb117ad06bdd830b7586c:::\r\n"
+        "bob:1103:aad3b435b51404eeaad3b435b51404ee:"
+        "a4f49c406510bdcab6824ee7c30fd852:::\n"
+        "SRV02$:1002:aad3b435b51404eeaad3b435b51404ee:"
+        "b4b9b02e6f09a9bd760f388b67351e2b:::\n"
+        "malformed-line\n"
+    )
+
+    def _legacy(self, main_module, tmp_path, source):
+        nt = tmp_path / "legacy.nt"
+        lm = tmp_path / "legacy.lm"
+        main_module._write_field_sorted_unique(str(source), str(nt), 4)
+        main_module._write_field_sorted_unique(str(source), str(lm), 3)
+        return nt.read_text(), lm.read_text()
+
+    def test_matches_legacy_pipeline_with_filtering(self, tmp_path, main_module):
+        dump = tmp_path / "dump.txt"
+        dump.write_text(self.DUMP, newline="")
+        legacy_filtered = tmp_path / "legacy.filtered"
+        removed = main_module._filter_computer_accounts(
+            str(dump), str(legacy_filtered)
+        )
+        legacy_nt, legacy_lm = self._legacy(main_module, tmp_path, legacy_filtered)
+
+        filtered = tmp_path / "dump.txt.filtered"
+        scan = main_module._scan_pwdump(str(dump), str(filtered))
+        nt_out = tmp_path / "scan.nt"
+        lm_out = tmp_path / "scan.lm"
+        main_module._write_sorted_lines(str(nt_out), scan.nt_hashes(False))
+        main_module._write_sorted_lines(str(lm_out), scan.lm_hashes(False))
+
+        assert scan.computer_accounts == removed == 2
+        assert scan.filtered_path == str(filtered)
+        assert filtered.read_text() == legacy_filtered.read_text()
+        assert nt_out.read_text() == legacy_nt
+        assert lm_out.read_text() == legacy_lm
+
+    def test_matches_legacy_pipeline_without_filtering(self, tmp_path, main_module):
+        dump = tmp_path / "dump.txt"
+        dump.write_text(self.DUMP.replace("\r\n", "\n"))
+        legacy_nt, legacy_lm = self._legacy(main_module, tmp_path, dump)
+
+        scan = main_module._scan_pwdump(str(dump), str(tmp_path / "unused"))
+        nt_out = tmp_path / "scan.nt"
+        lm_out = tmp_path / "scan.lm"
+        main_module._write_sorted_lines(str(nt_out), scan.nt_hashes(True))
+        main_module._write_sorted_lines(str(lm_out), scan.lm_hashes(True))
+
+        assert nt_out.read_text() == legacy_nt
+        assert lm_out.read_text() == legacy_lm
+
+    def test_hash_shared_by_user_and_computer_survives_filtering(
+        self, tmp_path, main_module
+    ):
+        """WS01$ and bob share an NT hash; dropping WS01$ must keep bob's."""
+        dump = tmp_path / "dump.txt"
+        dump.write_text(self.DUMP)
+
+        scan = main_module._scan_pwdump(str(dump), str(tmp_path / "f"))
+
+        assert "a4f49c406510bdcab6824ee7c30fd852" in scan.nt_hashes(False)
+        assert "b4b9b02e6f09a9bd760f388b67351e2b" not in scan.nt_hashes(False)
+        assert "b4b9b02e6f09a9bd760f388b67351e2b" in scan.nt_hashes(True)
+
+    def test_no_computer_accounts_writes_no_copy(self, tmp_path, main_module):
+        dump = tmp_path / "dump.txt"
+        dump.write_text(
+            "".join(
+                line + "\n"
+                for line in self.DUMP.splitlines()
+                if not line.split(":", 1)[0].endswith("$")
+            )
+        )
+        filtered = tmp_path / "dump.txt.filtered"
+
+        scan = main_module._scan_pwdump(str(dump), str(filtered))
+
+        assert scan.computer_accounts == 0
+        assert scan.filtered_path == str(dump)
+        assert not filtered.exists()
+        assert "8846f7eaee8fb117ad06bdd830b7586c" in scan.nt_hashes(False)
+
+    def test_missing_file(self, tmp_path, main_module):
+        scan = main_module._scan_pwdump(
+            str(tmp_path / "nope.txt"), str(tmp_path / "out")
+        )
+        assert scan.computer_accounts == 0
+        assert scan.nt_hashes(True) == set()
+
+
 class TestE2EPreprocessingFlow:
     """End-to-end tests that simulate the actual main() preprocessing flow.
 
@@ -590,7 +717,7 @@ class TestE2EPreprocessingFlow:
         Replicates the exact flow from main.py:
         1. Read first line, detect pwdump format
         2. Count computer accounts, prompt to filter
-        3. Extract NT and LM hashes via _write_field_sorted_unique
+        3. Extract NT and LM hashes from the same _scan_pwdump pass
         4. Return the final hcatHashFile path and metadata
 
         Args:
@@ -621,26 +748,27 @@ class TestE2EPreprocessingFlow:
         if re.search(r"[a-f0-9A-F]{32}:[a-f0-9A-F]{32}:::", hcatHashFileLine):
             pwdump_format = True
 
-            # Count and optionally filter computer accounts
-            computer_count = main_module._count_computer_accounts(hcatHashFile)
-            if computer_count > 0:
+            # One pass counts, filters and deduplicates (same as main.py)
+            speculative_path = f"{hcatHashFile}.filtered"
+            scan = main_module._scan_pwdump(hcatHashFile, speculative_path)
+            include_computers = True
+            if scan.computer_accounts > 0:
                 filter_choice = next(input_iter, "Y")
                 if filter_choice.upper() == "Y":
-                    filtered_path = f"{hcatHashFile}.filtered"
-                    main_module._filter_computer_accounts(hcatHashFile, filtered_path)
+                    filtered_path = scan.filtered_path
                     hcatHashFile = filtered_path
+                    include_computers = False
+            if include_computers and os.path.exists(speculative_path):
+                os.remove(speculative_path)
 
-            # Extract NT hashes (field 4) - same as main.py line 3726
-            main_module._write_field_sorted_unique(
-                hcatHashFile, f"{hcatHashFile}.nt", 4
-            )
-            # Extract LM hashes (field 3) - same as main.py line 3728
-            main_module._write_field_sorted_unique(
-                hcatHashFile, f"{hcatHashFile}.lm", 3
+            main_module._write_sorted_lines(
+                f"{hcatHashFile}.nt", scan.nt_hashes(include_computers)
             )
+            lm_hashes = scan.lm_hashes(include_computers)
+            main_module._write_sorted_lines(f"{hcatHashFile}.lm", lm_hashes)
 
-            # Check for LM hashes (same logic as main.py lines 3729-3735)
-            lm_count = main_module.lineCount(hcatHashFile + ".lm")
+            # Check for LM hashes (same logic as main.py)
+            lm_count = len(lm_hashes)
             if (
                 lm_count == 1
                 and hcatHashFileLine.split(":")[2].lower()
@@ -11,6 +11,7 @@ Covers:
 
 from __future__ import annotations
 
+import gzip
 import os
 from contextlib import contextmanager
 from types import SimpleNamespace
@@ -234,6 +235,47 @@ def test_stride_cap_one(env) -> None:
     assert _sample_count(env, 10, 1) == 1
 
 
+def test_sample_matches_even_spacing_in_one_read(env, monkeypatch) -> None:
+    """One read of the file still yields an in-order spread over all of it."""
+    wl = env.tmp_path / "spread.txt"
+    _make_large_wordlist(wl, 1000)
+    reads = []
+    real_iter = hc_main._plaintext.iter_usable_plaintexts
+    monkeypatch.setattr(
+        hc_main._plaintext,
+        "iter_usable_plaintexts",
+        lambda fh, **kw: reads.append(fh) or real_iter(fh, **kw),
+    )
+
+    sampled = hc_main._sample_plaintext_file(str(wl), 10)
+
+    assert len(reads) == 1
+    indices = [int(w.replace("word", "")) for w in sampled]
+    assert len(set(indices)) == 10
+    assert indices == sorted(indices)
+    assert indices[0] == 0
+    assert indices[-1] >= 900
+
+
+def test_gzipped_file_is_sampled_without_decompressing_to_disk(
+    env, monkeypatch
+) -> None:
+    wl = env.tmp_path / "big.txt.gz"
+    with gzip.open(wl, "wt") as f:
+        f.write("\n".join(f"word{i:06d}" for i in range(1000)) + "\n")
+    monkeypatch.setattr(
+        hc_main.tempfile,
+        "NamedTemporaryFile",
+        mock.Mock(side_effect=AssertionError("decompressed to disk")),
+    )
+
+    sampled = hc_main._sample_plaintext_file(str(wl), 10)
+    plain = env.tmp_path / "big.txt"
+    _make_large_wordlist(plain, 1000)
+
+    assert sampled == hc_main._sample_plaintext_file(str(plain), 10)
+
+
 # ---------------------------------------------------------------------------
 # Invalid-cap guard — zero/negative ollamaMaxSampleLines falls back to 500
 # ---------------------------------------------------------------------------
@@ -1,5 +1,6 @@
 """Unit tests for hate_crack.plaintext — recovering the password from a line."""
 
+import io
 import os
 
 import pytest
@@ -238,6 +239,60 @@ def test_keep_whitespace_is_keyword_only():
         plaintext.usable_plaintext("token1", True)
 
 
+# --------------------------------------------------------------------------
+# usable_plaintexts / iter_usable_plaintexts
+# --------------------------------------------------------------------------
+
+# Every branch of usable_plaintext(), plus the line endings and whitespace a
+# text-mode read treats specially.
+MIXED_CORPUS = (
+    f"Alpha2024!\n  indented \r\n\n   \n{NTLM}:token1\r"
+    f"{LM}:{NTLM}:frag:ment\n12:30\n$HEX[68656c6c6f]\n {NTLM}: token1 \n"
+    f"$HEX[zz]\n\x85nel\xa0\n{NTLM}:\nlast line"
+).encode("latin-1")
+
+
+def _one_line_at_a_time(data, keep):
+    lines = io.TextIOWrapper(io.BytesIO(data), encoding="latin-1")
+    found = (plaintext.usable_plaintext(line, keep_whitespace=keep) for line in lines)
+    return [pw for pw in found if pw]
+
+
+@pytest.mark.parametrize("keep", [False, True])
+@pytest.mark.parametrize(
+    "data",
+    [MIXED_CORPUS, b"alpha\n  beta \r\n\n\tgamma\rdelta", b"", b"\n\r\n"],
+)
+def test_batch_matches_the_single_line_function(data, keep):
+    assert plaintext.usable_plaintexts(data, keep_whitespace=keep) == (
+        _one_line_at_a_time(data, keep)
+    )
+
+
+@pytest.mark.parametrize("block", [1, 2, 3, 7, 64])
+@pytest.mark.parametrize("keep", [False, True])
+def test_iter_carries_lines_across_blocks(block, keep, monkeypatch):
+    """A CRLF or a line split by the block boundary must not change a thing."""
+    monkeypatch.setattr(plaintext, "READ_BLOCK", block)
+    data = MIXED_CORPUS + b"\rcr\rterminated\r\r\n"
+
+    found = list(
+        plaintext.iter_usable_plaintexts(io.BytesIO(data), keep_whitespace=keep)
+    )
+
+    assert found == _one_line_at_a_time(data, keep)
+
+
+def test_iter_decodes_with_the_given_encoding():
+    data = "café\nnaïve\n".encode("utf-8") + b"\xffbad\n"
+
+    found = plaintext.iter_usable_plaintexts(
+        io.BytesIO(data), encoding="utf-8", errors="ignore"
+    )
+
+    assert list(found) == ["café", "naïve", "bad"]
+
+
 # --------------------------------------------------------------------------
 # looks_like_hash_line
 # --------------------------------------------------------------------------
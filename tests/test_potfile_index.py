@@ -0,0 +1,116 @@
+"""Unit tests for hate_crack.potfile_index — the in-process `--show` engine."""
+
+import hashlib
+import os
+
+os.environ["HATE_CRACK_SKIP_INIT"] = "1"
+from hate_crack import potfile_index  # noqa: E402
+from hate_crack.potfile_index import PotfileIndex  # noqa: E402
+
+MD5_A = hashlib.md5(b"alpha").hexdigest()
+MD5_B = hashlib.md5(b"bravo").hexdigest()
+MD5_C = hashlib.md5(b"charlie").hexdigest()
+
+
+def _index(tmp_path, potfile):
+    return PotfileIndex(str(potfile), db_path=tmp_path / "index.sqlite3")
+
+
+def _append(path, text):
+    with open(path, "ab") as f:
+        f.write(text.encode("utf-8"))
+
+
+def test_show_returns_cracked_hashes_in_hash_list_order(tmp_path):
+    pot = tmp_path / "hashcat.potfile"
+    pot.write_text(f"{MD5_B}:bravo\n{MD5_A}:alpha\n")
+    hashes = tmp_path / "hashes.txt"
+    hashes.write_text(f"{MD5_A.upper()}\n{MD5_C}\n{MD5_B}\n{MD5_A}\nnot-a-hash\n")
+
+    lines = _index(tmp_path, pot).show("0", str(hashes))
+
+    assert lines == [f"{MD5_A}:alpha", f"{MD5_B}:bravo"]
+
+
+def test_plaintext_with_colons_is_kept_whole(tmp_path):
+    pot = tmp_path / "hashcat.potfile"
+    pot.write_text(f"{MD5_A}:a:b:c\n")
+    hashes = tmp_path / "hashes.txt"
+    hashes.write_text(f"{MD5_A}\n")
+
+    assert _index(tmp_path, pot).show("0", str(hashes)) == [f"{MD5_A}:a:b:c"]
+
+
+def test_only_appended_lines_are_read_after_the_first_refresh(tmp_path):
+    pot = tmp_path / "hashcat.potfile"
+    pot.write_text(f"{MD5_A}:alpha\n{MD5_B}:bravo\n")
+    index = _index(tmp_path, pot)
+    assert index.refresh() == 2
+
+    _append(pot, f"{MD5_C}:charlie\n")
+
+    assert index.refresh() == 1
+    assert index.refresh() == 0
+    assert index.lookup([bytes.fromhex(MD5_C)]) == {bytes.fromhex(MD5_C): b"charlie"}
+
+
+def test_partial_trailing_line_waits_for_its_newline(tmp_path):
+    pot = tmp_path / "hashcat.potfile"
+    pot.write_text(f"{MD5_A}:alpha\n{MD5_B}:bra")
+    hashes = tmp_path / "hashes.txt"
+    hashes.write_text(f"{MD5_A}\n{MD5_B}\n")
+    index = _index(tmp_path, pot)
+
+    assert index.show("0", str(hashes)) == [f"{MD5_A}:alpha"]
+
+    _append(pot, "vo\n")
+
+    assert index.show("0", str(hashes)) == [f"{MD5_A}:alpha", f"{MD5_B}:bravo"]
+
+
+def test_rewritten_potfile_rebuilds_the_index(tmp_path):
+    pot = tmp_path / "hashcat.potfile"
+    pot.write_text(f"{MD5_A}:alpha\n")
+    hashes = tmp_path / "hashes.txt"
+    hashes.write_text(f"{MD5_A}\n{MD5_B}\n")
+    index = _index(tmp_path, pot)
+    index.refresh()
+
+    replacement = tmp_path / "replacement"
+    replacement.write_text(f"{MD5_B}:bravo\n")
+    os.replace(replacement, pot)
+
+    assert index.show("0", str(hashes)) == [f"{MD5_B}:bravo"]
+
+
+def test_lm_needs_both_halves(tmp_path):
+    pot = tmp_path / "hashcat.potfile"
+    pot.write_text(
+        "e52cac67419a9a22:PASSWOR\n"
+        "4a3b108f3fa6cb6d:D\n"
+        "1111111111111111:$HEX[41]\n"
+        "2222222222222222:B\n"
+    )
+    hashes = tmp_path / "hashes.lm"
+    hashes.write_text(
+        "e52cac67419a9a224a3b108f3fa6cb6d\n"
+        "e52cac67419a9a223333333333333333\n"
+        "11111111111111112222222222222222\n"
+    )
+
+    lines = _index(tmp_path, pot).show("3000", str(hashes))
+
+    assert lines == [
+        "e52cac67419a9a224a3b108f3fa6cb6d:PASSWORD",
+        "11111111111111112222222222222222:$HEX[4142]",
+    ]
+
+
+def test_unsupported_mode_and_missing_potfile_defer_to_hashcat(tmp_path):
+    hashes = tmp_path / "hashes.txt"
+    hashes.write_text(f"{MD5_A}\n")
+    index = _index(tmp_path, tmp_path / "missing.potfile")
+
+    assert not potfile_index.supports_mode("5600")
+    assert index.show("5600", str(hashes)) is None
+    assert index.show("0", str(hashes)) is None
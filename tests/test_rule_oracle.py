@@ -116,3 +116,32 @@ def test_the_escape_is_what_hashcat_decodes_it_to(tmp_path):
     assert _candidates(tmp_path, "zorptangle", "$\\x0d") == b"zorptangle\r\n"
     # And an ordinary byte spelled the same way, to show the decode is general.
     assert _candidates(tmp_path, "zorptangle", "$\\x41") == b"zorptangleA\n"
+
+
+# Spellings canonical_rule() folds together, each the kind of rewrite it makes.
+# Coverage keys and rule-file dedup both trust that the folded rule tries the
+# same candidate, so hashcat has to agree for every one of them.
+_EQUIVALENT = [
+    ":$1 :",
+    "p1",
+    "D0",
+    "i0X",
+    "*31",
+    "*22$a",
+    "ulc",
+    "T0T2T0T1",
+    "rr$1",
+    "{}k*12*12k",
+    "$\\x41",
+]
+
+
+@_requires_hashcat
+@pytest.mark.parametrize("rule", _EQUIVALENT)
+def test_hashcat_agrees_a_rule_and_its_canonical_form_match(tmp_path, rule):
+    canonical = rulegen.canonical_rule(rule)
+    assert canonical != rule
+    for i, word in enumerate(["a", "Ab", "hello World", "zorp tangle9"]):
+        assert _candidates(tmp_path, word, rule, name=f"raw{i}") == _candidates(
+            tmp_path, word, canonical, name=f"canon{i}"
+        ), (rule, canonical, word)
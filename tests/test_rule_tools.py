@@ -5,6 +5,7 @@ from unittest.mock import MagicMock, patch
 from hate_crack.attacks import (
     rule_cleanup_and_optimize_handler,
     rule_cleanup_handler,
+    rule_dedupe_handler,
     rule_optimize_handler,
     rule_tools_submenu,
 )
@@ -14,6 +15,7 @@ def _make_ctx():
     ctx = MagicMock()
     ctx.rules_cleanup.return_value = True
     ctx.rules_optimize.return_value = True
+    ctx.rules_dedupe.return_value = (3, 2)
     ctx.rulesDirectory = "/tmp/rules"
     return ctx
 
@@ -199,6 +201,53 @@ class TestRuleCleanupAndOptimize:
         assert "[+] Done." in capsys.readouterr().out
 
 
+class TestRuleDedupeHandler:
+    def test_calls_rules_dedupe_with_correct_paths(self, tmp_path):
+        ctx = _make_ctx()
+        infile = tmp_path / "test.rule"
+        infile.write_text("$1\n:$1\n")
+        outfile = tmp_path / "dedupe.rule"
+        ctx.select_file_with_autocomplete.return_value = str(outfile)
+        with patch("builtins.input", side_effect=[str(infile)]):
+            rule_dedupe_handler(ctx)
+        ctx.rules_dedupe.assert_called_once_with(str(infile), str(outfile))
+
+    def test_rejects_nonexistent_infile(self, tmp_path):
+        ctx = _make_ctx()
+        with patch("builtins.input", return_value="/nonexistent.rule"):
+            rule_dedupe_handler(ctx)
+        ctx.rules_dedupe.assert_not_called()
+
+    def test_rejects_empty_outfile(self, tmp_path):
+        ctx = _make_ctx()
+        infile = tmp_path / "test.rule"
+        infile.write_text("l\n")
+        ctx.select_file_with_autocomplete.return_value = ""
+        with patch("builtins.input", side_effect=[str(infile)]):
+            rule_dedupe_handler(ctx)
+        ctx.rules_dedupe.assert_not_called()
+
+    def test_prints_counts_on_success(self, tmp_path, capsys):
+        ctx = _make_ctx()
+        infile = tmp_path / "test.rule"
+        infile.write_text("l\n")
+        ctx.select_file_with_autocomplete.return_value = str(tmp_path / "out.rule")
+        with patch("builtins.input", side_effect=[str(infile)]):
+            rule_dedupe_handler(ctx)
+        out = capsys.readouterr().out
+        assert "[+] Done. Kept 3 rules, dropped 2 duplicates." in out
+
+    def test_prints_failure_on_error(self, tmp_path, capsys):
+        ctx = _make_ctx()
+        ctx.rules_dedupe.return_value = None
+        infile = tmp_path / "test.rule"
+        infile.write_text("l\n")
+        ctx.select_file_with_autocomplete.return_value = str(tmp_path / "out.rule")
+        with patch("builtins.input", side_effect=[str(infile)]):
+            rule_dedupe_handler(ctx)
+        assert "[!] Deduplication failed." in capsys.readouterr().out
+
+
 class TestRuleToolsSubmenu:
     def test_dispatches_to_cleanup(self):
         ctx = _make_ctx()
@@ -242,6 +291,15 @@ class TestRuleToolsSubmenu:
             rule_tools_submenu(ctx)
         ctx.analyze_rules.assert_called_once_with()
 
+    def test_dispatches_to_dedupe(self):
+        ctx = _make_ctx()
+        with (
+            patch("hate_crack.attacks.rule_dedupe_handler") as mock_fn,
+            patch("hate_crack.menu.interactive_menu", side_effect=["6", "99"]),
+        ):
+            rule_tools_submenu(ctx)
+        mock_fn.assert_called_once_with(ctx)
+
     def test_exits_on_99(self):
         ctx = _make_ctx()
         with patch("hate_crack.menu.interactive_menu", return_value="99"):
@@ -1,4 +1,4 @@
-"""Tests for rules_cleanup and rules_optimize subprocess wrappers in main.py."""
+"""Tests for the rules_cleanup, rules_optimize and rules_dedupe wrappers in main.py."""
 
 from unittest.mock import MagicMock, patch
 
@@ -133,3 +133,32 @@ class TestRulesOptimizeWrapper:
         assert cmd[0].endswith(expected_suffix), (
             f"Expected path ending with {expected_suffix}, got {cmd[0]}"
         )
+
+
+class TestRulesDedupeWrapper:
+    def test_drops_equivalent_rules_in_place(self, tmp_path):
+        main = _load_main()
+        infile = tmp_path / "input.rule"
+        infile.write_bytes(b"# top\r\nc\r\n:$1\r\n$1\r\n\r\n$1 :\r\nu\r\n")
+        outfile = tmp_path / "output.rule"
+
+        result = main.rules_dedupe(str(infile), str(outfile))
+
+        assert result == (3, 2)
+        assert outfile.read_bytes() == b"# top\nc\n:$1\n\nu\n"
+
+    def test_keeps_bytes_that_are_not_utf8(self, tmp_path):
+        main = _load_main()
+        infile = tmp_path / "input.rule"
+        infile.write_bytes(b"$\xe9\n:$\xe9\n$1\n")
+        outfile = tmp_path / "output.rule"
+
+        assert main.rules_dedupe(str(infile), str(outfile)) == (2, 1)
+        assert outfile.read_bytes() == b"$\xe9\n$1\n"
+
+    def test_returns_none_on_missing_input(self, tmp_path):
+        main = _load_main()
+        outfile = tmp_path / "output.rule"
+
+        assert main.rules_dedupe(str(tmp_path / "missing.rule"), str(outfile)) is None
+        assert not outfile.exists()
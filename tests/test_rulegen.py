@@ -1,5 +1,9 @@
 """Tests for hate_crack.rulegen (Spoonman Attack derivation, #169)."""
 
+import gzip
+import os
+import pickle
+import random
 from collections import Counter
 
 import pytest
@@ -135,6 +139,186 @@ class TestOp:
         assert rulegen.apply_rule("test", "^Ao1B$!") == "ABest!"
 
 
+def _case(s, fn):
+    return "".join(fn(ch) if ch.isascii() and ch.isalpha() else ch for ch in s)
+
+
+def _title(s, sep):
+    lowered = _case(s, str.lower)
+    return "".join(
+        _case(ch, str.upper) if i == 0 or lowered[i - 1] == sep else ch
+        for i, ch in enumerate(lowered)
+    )
+
+
+def _model(word, rule):
+    """hashcat's documented semantics for every op :func:`canonical_rule` sees.
+
+    Wider than :func:`rulegen.apply_rule`, which models only what derive()
+    emits. Used to check that a rule and its canonical form agree on every
+    word; test_rule_oracle.py asks hashcat itself.
+    """
+    s = word
+    for op, args in rulegen.parse_rule(rule):
+        n = rulegen.POS.index(args[0]) if args and op not in "$^es" else None
+        if op == "l":
+            s = _case(s, str.lower)
+        elif op == "u":
+            s = _case(s, str.upper)
+        elif op == "c":
+            s = _case(s[:1], str.upper) + _case(s[1:], str.lower)
+        elif op == "C":
+            s = _case(s[:1], str.lower) + _case(s[1:], str.upper)
+        elif op == "t":
+            s = _case(s, str.swapcase)
+        elif op == "T" and n < len(s):
+            s = s[:n] + _case(s[n], str.swapcase) + s[n + 1 :]
+        elif op == "E":
+            s = _title(s, " ")
+        elif op == "e":
+            s = _title(s, args[0])
+        elif op == "r":
+            s = s[::-1]
+        elif op == "{":
+            s = s[1:] + s[:1]
+        elif op == "}":
+            s = s[-1:] + s[:-1]
+        elif op == "k" and len(s) >= 2:
+            s = s[1] + s[0] + s[2:]
+        elif op == "K" and len(s) >= 2:
+            s = s[:-2] + s[-1] + s[-2]
+        elif op == "*":
+            m = rulegen.POS.index(args[1])
+            if n < len(s) and m < len(s):
+                chars = list(s)
+                chars[n], chars[m] = chars[m], chars[n]
+                s = "".join(chars)
+        elif op == "d":
+            s = s + s
+        elif op == "p":
+            s = s * (n + 1)
+        elif op == "D" and n < len(s):
+            s = s[:n] + s[n + 1 :]
+        elif op == "[":
+            s = s[1:]
+        elif op == "]":
+            s = s[:-1]
+        elif op == "$":
+            s = s + args[0]
+        elif op == "^":
+            s = args[0] + s
+        elif op == "i" and n <= len(s):
+            s = s[:n] + args[1] + s[n:]
+        elif op == "o" and n < len(s):
+            s = s[:n] + args[1] + s[n + 1 :]
+        elif op == "s":
+            s = s.replace(args[0], args[1])
+        elif op == "'":
+            s = s[:n]
+    return s
+
+
+class TestParseRule:
+    def test_splits_ops_and_decodes_arguments(self):
+        assert rulegen.parse_rule("c $\\x41 i3x") == [
+            ("c", ()),
+            ("$", ("A",)),
+            ("i", ("3", "x")),
+        ]
+
+    def test_a_space_argument_is_not_a_separator(self):
+        assert rulegen.parse_rule("$ $1") == [("$", (" ",)), ("$", ("1",))]
+
+    @pytest.mark.parametrize("rule", ["Q", "$", "i3", "Ta", "c\t"])
+    def test_rejects_what_hashcat_rejects(self, rule):
+        assert rulegen.parse_rule(rule) is None
+
+
+class TestCanonicalRule:
+    @pytest.mark.parametrize(
+        "spellings",
+        [
+            [":$1", "$1", "$1 :", " $1", ":: $1 ::"],
+            ["$\\x41", "$A"],
+            ["$\\x0A", "$\\x0a"],
+            ["p1", "d"],
+            ["D0", "["],
+            ["i0X", "^X"],
+            ["*20", "*02"],
+            ["*11$a", "$a"],
+            ["ul", "T0l", "tcl", "l"],
+            ["T3c", "c"],
+            ["e-", "ue-"],
+            ["rr", "tt", "kk", "KK", "{}", "}{", "*12*12", "rttr", ":"],
+            ["T2T0", "T0T2", "T0T1T2T1"],
+            ["T0T2T0", "T2"],
+        ],
+    )
+    def test_equivalent_spellings_share_a_form(self, spellings):
+        forms = {rulegen.canonical_rule(rule) for rule in spellings}
+        assert len(forms) == 1, forms
+
+    @pytest.mark.parametrize(
+        ("a", "b"),
+        [
+            ("$1$2", "$2$1"),
+            ("lT0", "T0l"),
+            ("T0", "T1"),
+            ("r$1r", "^1"),  # equal, but not a rewrite this makes
+            ("$ ", "$"),
+        ],
+    )
+    def test_different_rules_keep_different_forms(self, a, b):
+        assert rulegen.canonical_rule(a) != rulegen.canonical_rule(b)
+
+    @pytest.mark.parametrize("rule", ["$1$2", "sa@", "c", "T0T2", "^x]", "$ "])
+    def test_a_canonical_rule_is_its_own_form(self, rule):
+        assert rulegen.canonical_rule(rule) == rule
+
+    @pytest.mark.parametrize(
+        "rule",
+        [
+            "Q:",  # unknown op
+            "M:",  # memory op hashcat will not run
+            ":$",  # argument runs off the end
+            "$\r:",  # raw CR: hashcat rejects the line
+            ":" * (rulegen.MAX_RULE_FUNCTIONS + 1) + "$1",  # over the limit
+            "$\\ x41",  # joined up, the backslash would become an escape
+        ],
+    )
+    def test_what_hashcat_would_not_run_as_written_is_left_alone(self, rule):
+        assert rulegen.canonical_rule(rule) == rule
+
+    def test_random_rules_agree_with_their_form_on_every_word(self):
+        rng = random.Random(0)
+        tokens = (
+            ": l u c C t E e- r { } k K d [ ] $1 ^a $\\x41 T0 T1 T3 *01 *10 *22 "
+            "p1 p2 D0 D1 i0X i2Y o1Z sab '3"
+        ).split() + [" ", "$ "]
+        words = ["", "a", "Ab", "hello World", "pa-ss wOrd", "XYZ123", "bab"]
+        for _ in range(3000):
+            rule = "".join(rng.choice(tokens) for _ in range(rng.randint(1, 7)))
+            canonical = rulegen.canonical_rule(rule)
+            for word in words:
+                assert _model(word, canonical) == _model(word, rule), (
+                    rule,
+                    canonical,
+                    word,
+                )
+
+
+class TestDedupeRules:
+    def test_keeps_the_first_spelling_in_place(self):
+        kept, dropped = rulegen.dedupe_rules(["c", ":$1", "u", "$1", "$1 :", "$2"])
+        assert kept == ["c", ":$1", "u", "$2"]
+        assert dropped == 2
+
+    def test_comments_and_blank_lines_are_kept(self):
+        kept, dropped = rulegen.dedupe_rules(["# best", "", "$1", "# best", "$1"])
+        assert kept == ["# best", "", "$1", "# best"]
+        assert dropped == 1
+
+
 class TestDeriveShapes:
     def test_all_lowercase_needs_no_case_op(self):
         assert rulegen.derive("password") == ("password", ":")
@@ -2230,3 +2414,549 @@ class TestGenerateLeetRestore:
         assert result["pruned"] is True
         assert result["basewords_count"] <= 5
         assert result["selfcheck_failures"] == []
+
+
+class TestShardedScan:
+    """`generate(workers=N)` splits the corpus across a process pool."""
+
+    # Repeats and ties in both counters, leet forms that need pass 1's
+    # attestation, and every CR/LF arrangement text mode treats specially.
+    # All synthetic.
+    CORPUS = (
+        b"quibblefox\nQu1bblefox\r\nquibblefox\nmirthbell1\n"
+        b"vorblesnick\r\rvorblesn1ck\nvorblesnick!\nzanter\rwick\n"
+        + b"".join(b"tail%czulu%d\n" % (97 + i % 26, i) for i in range(60))
+        + b"alpha\r\r\nbravo\nalpha\nlast-no-newline"
+    )
+
+    def _corpus(self, tmp_path, data=None):
+        path = tmp_path / "corpus.txt"
+        path.write_bytes(self.CORPUS if data is None else data)
+        return str(path)
+
+    def _outputs(self, outdir):
+        return {p.name: p.read_bytes() for p in sorted(outdir.iterdir())}
+
+    def test_shard_ranges_are_newline_aligned_and_cover_the_file(self, tmp_path):
+        corpus = self._corpus(tmp_path)
+        ranges = rulegen.shard_ranges(corpus, 7)
+
+        assert len(ranges) == 7
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == len(self.CORPUS)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end == start
+            assert self.CORPUS[start - 1 : start] == b"\n"
+
+    def test_range_lines_split_like_text_mode(self, tmp_path):
+        corpus = self._corpus(tmp_path)
+        with open(corpus, encoding="latin-1") as fh:
+            expected = list(fh)
+
+        lines = []
+        for start, end in rulegen.shard_ranges(corpus, 5):
+            with rulegen.corpus_lines(corpus, start, end) as fh:
+                lines.extend(fh)
+
+        assert lines == expected
+
+    @pytest.mark.parametrize("leet_restore", [True, False])
+    def test_sharded_output_is_identical_to_single_process(
+        self, tmp_path, monkeypatch, leet_restore
+    ):
+        monkeypatch.setattr(rulegen, "_MIN_SHARD_BYTES", 1)
+        merges = []
+        real_merge = rulegen._merge_scans
+        monkeypatch.setattr(
+            rulegen,
+            "_merge_scans",
+            lambda scans, bound: merges.append(bound) or real_merge(scans, bound),
+        )
+        corpus = self._corpus(tmp_path)
+        single = rulegen.generate(
+            corpus,
+            str(tmp_path / "single"),
+            print_fn=lambda *a: None,
+            leet_restore=leet_restore,
+            baseword_caps=(3,),
+            workers=1,
+        )
+        sharded = rulegen.generate(
+            corpus,
+            str(tmp_path / "sharded"),
+            print_fn=lambda *a: None,
+            leet_restore=leet_restore,
+            baseword_caps=(3,),
+            workers=4,
+        )
+
+        assert merges, "the sharded run must actually have used the pool"
+        assert not single["pruned"]
+        assert self._outputs(tmp_path / "single") == self._outputs(
+            tmp_path / "sharded"
+        )
+        for key in ("total", "leet_restored", "milestones", "unwritable_basewords"):
+            assert single[key] == sharded[key], key
+
+    def test_keys_held_across_the_pool_stay_within_max_unique(
+        self, tmp_path, monkeypatch
+    ):
+        """Shards split ``max_unique`` between them and the merge re-prunes
+        after every shard, so no step holds more than the one budget."""
+        monkeypatch.setattr(rulegen, "_MIN_SHARD_BYTES", 1)
+        monkeypatch.setattr(rulegen, "_PRUNE_CHECK_INTERVAL", 1)
+        # The same 40 keys in every quarter of the file, so each shard alone
+        # would overflow the bound if it were given all of it.
+        words = [b"zq%c%cfox" % (97 + i % 26, 97 + i // 26) for i in range(40)]
+        corpus = self._corpus(tmp_path, b"".join(w + b"\n" for w in words * 4))
+        bound = 12
+        shards = []
+        merged = []
+        real_merge = rulegen._merge_scans
+        real_prune = rulegen._prune
+
+        def merge(scans, max_unique):
+            scans = list(scans)
+            shards.append([len(scan.base_counts) for scan in scans])
+            return real_merge(scans, max_unique)
+
+        def prune(counter, max_unique):
+            result = real_prune(counter, max_unique)
+            merged.append(len(counter))
+            return result
+
+        monkeypatch.setattr(rulegen, "_merge_scans", merge)
+        monkeypatch.setattr(rulegen, "_prune", prune)
+        result = rulegen.generate(
+            corpus,
+            str(tmp_path / "out"),
+            print_fn=lambda *a: None,
+            max_unique=bound,
+            workers=4,
+            leet_restore=False,
+        )
+
+        assert shards and len(shards[0]) == 4
+        # Each shard checks its bound before a line, so it may end one key
+        # past its share of the budget.
+        assert sum(shards[0]) <= bound + len(shards[0])
+        assert merged and max(merged) <= bound
+        assert result["pruned"] is True
+        assert result["basewords_count"] <= bound
+
+    def test_merge_reapplies_the_bound(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(rulegen, "_MIN_SHARD_BYTES", 1)
+        monkeypatch.setattr(rulegen, "_PRUNE_CHECK_INTERVAL", 5)
+        result = rulegen.generate(
+            self._corpus(tmp_path),
+            str(tmp_path / "out"),
+            print_fn=lambda *a: None,
+            max_unique=6,
+            workers=3,
+        )
+
+        assert result["pruned"] is True
+        assert result["basewords_count"] <= 6
+        assert result["rules_count"] <= 6
+        assert result["selfcheck_failures"] == []
+
+
+class TestHeavyHitters:
+    """`generate(heavy_hitters=True)` counts with a bounded Misra-Gries sketch."""
+
+    def _stream(self, n=3000, seed=7):
+        rng = random.Random(seed)
+        # Zipf-ish: a handful of hot keys over a long tail.
+        return [f"k{int(rng.paretovariate(0.8))}" for _ in range(n)]
+
+    def _sketch(self, stream, capacity, every=50):
+        sketch = rulegen._HeavyHitters()
+        for i, key in enumerate(stream, start=1):
+            sketch[key] += 1
+            if i % every == 0:
+                rulegen._prune(sketch, capacity)
+        rulegen._prune(sketch, capacity)
+        return sketch
+
+    def _assert_bounds(self, sketch, stream, capacity):
+        truth = Counter(stream)
+        assert len(sketch) <= capacity
+        assert 0 < sketch.floor <= len(stream) / (capacity + 1)
+        for key, value in sketch.items():
+            assert value - sketch.floor <= truth[key] <= value, key
+        for key, hits in truth.items():
+            if hits > sketch.floor:
+                assert key in sketch, key
+
+    def test_sketch_counts_are_bracketed_by_the_floor(self):
+        stream = self._stream()
+        self._assert_bounds(self._sketch(stream, 20), stream, 20)
+
+    def test_merged_sketches_keep_the_bound_and_survive_pickling(self):
+        stream = self._stream()
+        left = self._sketch(stream[:1700], 20)
+        right = pickle.loads(pickle.dumps(self._sketch(stream[1700:], 20)))
+        assert right.floor > 0
+
+        rulegen._merge_counts(left, right)
+        rulegen._prune(left, 20)
+
+        self._assert_bounds(left, stream, 20)
+
+    def _corpus(self, tmp_path):
+        words = ["alpha1", "Bravo", "charlie!", "delta99"]
+        lines = [words[i % 4] for i in range(60)]
+        lines += [f"tail{chr(97 + i % 26)}{i}" for i in range(80)]
+        path = tmp_path / "corpus.txt"
+        path.write_text("\n".join(lines) + "\n", encoding="latin-1")
+        return str(path), lines
+
+    def test_unpruned_sketch_output_matches_exact_counting(self, tmp_path):
+        corpus, _ = self._corpus(tmp_path)
+        exact = rulegen.generate(
+            corpus, str(tmp_path / "exact"), print_fn=lambda *a: None, workers=1
+        )
+        sketch = rulegen.generate(
+            corpus,
+            str(tmp_path / "sketch"),
+            print_fn=lambda *a: None,
+            workers=1,
+            heavy_hitters=True,
+        )
+
+        assert sketch["rule_count_error"] == 0
+        for name in ("basewords.txt", "rules.full.rule", "rules.top95.rule"):
+            exact_bytes = (tmp_path / "exact" / name).read_bytes()
+            assert (tmp_path / "sketch" / name).read_bytes() == exact_bytes
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_overflowing_sketch_reports_guaranteed_cut_off_bounds(
+        self, tmp_path, monkeypatch, workers
+    ):
+        monkeypatch.setattr(rulegen, "_PRUNE_CHECK_INTERVAL", 10)
+        monkeypatch.setattr(rulegen, "_MIN_SHARD_BYTES", 1)
+        corpus, lines = self._corpus(tmp_path)
+        result = rulegen.generate(
+            corpus,
+            str(tmp_path / "out"),
+            print_fn=lambda *a: None,
+            max_unique=6,
+            leet_restore=False,
+            workers=workers,
+            heavy_hitters=True,
+        )
+
+        assert result["pruned"] is True
+        assert result["rule_count_error"] > 0
+        assert result["rules_count"] <= 6
+        truth = Counter(rulegen.derive(pw)[1] for pw in lines)
+        for target, (low, high) in result["cover_bounds"].items():
+            with open(result["capped_rules"][target], encoding="latin-1") as f:
+                covered = sum(truth[rule] for rule in f.read().splitlines())
+            assert low <= covered <= high, target
+        with open(result["coverage"], encoding="latin-1") as f:
+            report = f.read()
+        assert "heavy-hitter counting (max_unique=6)" in report
+        assert "rules.top50.rule: between" in report
+
+    def test_sharded_error_stays_within_the_documented_bound(
+        self, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(rulegen, "_PRUNE_CHECK_INTERVAL", 10)
+        monkeypatch.setattr(rulegen, "_MIN_SHARD_BYTES", 1)
+        merges = []
+        real_merge = rulegen._merge_scans
+        monkeypatch.setattr(
+            rulegen,
+            "_merge_scans",
+            lambda scans, bound: merges.append(bound) or real_merge(scans, bound),
+        )
+        corpus, lines = self._corpus(tmp_path)
+        result = rulegen.generate(
+            corpus,
+            str(tmp_path / "out"),
+            print_fn=lambda *a: None,
+            max_unique=6,
+            leet_restore=False,
+            workers=4,
+            heavy_hitters=True,
+        )
+
+        assert merges, "the sharded run must actually have used the pool"
+        # Four shards of 6 // 4 keys each, merged and re-pruned under 6.
+        bound = len(lines) / (6 // 4 + 1)
+        assert result["rule_count_error"] > 0
+        assert result["rule_count_error"] <= bound
+        assert result["baseword_count_error"] <= bound
+
+    def test_merging_shards_of_a_smaller_budget_keeps_their_bound(self):
+        stream = self._stream()
+        quarters = [stream[i : i + 750] for i in range(0, 3000, 750)]
+        merged = self._sketch(quarters[0], 5)
+        for quarter in quarters[1:]:
+            rulegen._merge_counts(merged, self._sketch(quarter, 5))
+            rulegen._prune(merged, 20)
+            assert len(merged) <= 20
+
+        truth = Counter(stream)
+        assert 0 < merged.floor <= len(stream) / (5 + 1)
+        for key, value in merged.items():
+            assert value - merged.floor <= truth[key] <= value, key
+        for key, hits in truth.items():
+            if hits > merged.floor:
+                assert key in merged, key
+
+
+class TestCheckpointing:
+    """`generate(checkpoint_dir=...)` resumes an interrupted derivation."""
+
+    CORPUS = TestShardedScan.CORPUS
+
+    def _corpus(self, tmp_path):
+        path = tmp_path / "corpus.txt"
+        path.write_bytes(self.CORPUS)
+        return str(path)
+
+    def _outputs(self, outdir):
+        return {
+            p.name: p.read_bytes()
+            for p in sorted(outdir.iterdir())
+            if p.name != "coverage.txt"
+        }
+
+    def _interrupt_after(self, monkeypatch, calls):
+        real = rulegen.usable_plaintext
+        seen = []
+
+        def interrupt(*args, **kwargs):
+            seen.append(args[0])
+            if len(seen) == calls:
+                raise KeyboardInterrupt
+            return real(*args, **kwargs)
+
+        monkeypatch.setattr(rulegen, "usable_plaintext", interrupt)
+        return seen
+
+    @pytest.mark.parametrize("leet_restore", [True, False])
+    def test_resumed_run_matches_an_uninterrupted_one(
+        self, tmp_path, monkeypatch, leet_restore
+    ):
+        monkeypatch.setattr(rulegen, "_PRUNE_CHECK_INTERVAL", 7)
+        monkeypatch.setattr(rulegen, "_CHECKPOINT_SECONDS", 0)
+        corpus = self._corpus(tmp_path)
+        checkpoint = tmp_path / "ckpt"
+        options = dict(
+            print_fn=lambda *a: None,
+            leet_restore=leet_restore,
+            max_unique=8,
+            workers=1,
+        )
+        clean = rulegen.generate(corpus, str(tmp_path / "clean"), **options)
+        assert clean["pruned"], "the resume must also restore the prune cadence"
+
+        lines = sum(1 for _ in open(corpus, encoding="latin-1"))
+        interrupt_at = lines + 40 if leet_restore else 40
+        self._interrupt_after(monkeypatch, interrupt_at)
+        with pytest.raises(KeyboardInterrupt):
+            rulegen.generate(
+                corpus, str(tmp_path / "out"), checkpoint_dir=str(checkpoint), **options
+            )
+        monkeypatch.undo()
+        monkeypatch.setattr(rulegen, "_PRUNE_CHECK_INTERVAL", 7)
+        seen = self._interrupt_after(monkeypatch, 0)
+
+        messages = []
+        options["print_fn"] = messages.append
+        resumed = rulegen.generate(
+            corpus, str(tmp_path / "out"), checkpoint_dir=str(checkpoint), **options
+        )
+
+        assert any("Resuming derivation" in m for m in messages)
+        assert 0 < len(seen) < lines - 30
+        assert self._outputs(tmp_path / "out") == self._outputs(tmp_path / "clean")
+        for key in ("total", "pruned_basewords", "pruned_rule_hits", "milestones"):
+            assert resumed[key] == clean[key], key
+        assert not checkpoint.exists()
+
+    def test_sharded_checkpoints_resume(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(rulegen, "_MIN_SHARD_BYTES", 1)
+        corpus = self._corpus(tmp_path)
+        checkpoint = tmp_path / "ckpt"
+        options = dict(print_fn=lambda *a: None, workers=3)
+        rulegen.generate(corpus, str(tmp_path / "clean"), **options)
+
+        real_merge = rulegen._merge_scans
+        merges = []
+
+        def fail_second_merge(scans, bound):
+            merges.append(bound)
+            if len(merges) == 2:
+                raise KeyboardInterrupt
+            return real_merge(scans, bound)
+
+        monkeypatch.setattr(rulegen, "_merge_scans", fail_second_merge)
+        with pytest.raises(KeyboardInterrupt):
+            rulegen.generate(
+                corpus, str(tmp_path / "out"), checkpoint_dir=str(checkpoint), **options
+            )
+        names = sorted(os.listdir(checkpoint))
+        assert sum(n.startswith("attest.") for n in names) == 3
+        assert sum(n.startswith("derive.") for n in names) == 3
+        monkeypatch.setattr(rulegen, "_merge_scans", real_merge)
+        # Every range finished before the interrupt, so nothing is read again.
+        monkeypatch.setattr(
+            rulegen, "usable_plaintext", lambda *a, **k: pytest.fail("reread")
+        )
+        monkeypatch.setattr(rulegen, "ProcessPoolExecutor", _InlineExecutor)
+
+        rulegen.generate(
+            corpus, str(tmp_path / "out"), checkpoint_dir=str(checkpoint), **options
+        )
+
+        assert self._outputs(tmp_path / "out") == self._outputs(tmp_path / "clean")
+
+    def test_checkpoints_for_a_changed_corpus_are_discarded(self, tmp_path):
+        corpus = self._corpus(tmp_path)
+        checkpoint = tmp_path / "ckpt"
+        key = rulegen._checkpoint_key(corpus, workers=1)
+        rulegen._prepare_checkpoints(str(checkpoint), key)
+        (checkpoint / "derive.0-10.ckpt").write_bytes(b"stale")
+        assert rulegen._prepare_checkpoints(str(checkpoint), key)
+
+        with open(corpus, "ab") as f:
+            f.write(b"appended\n")
+
+        assert not rulegen._prepare_checkpoints(
+            str(checkpoint), rulegen._checkpoint_key(corpus, workers=1)
+        )
+        assert os.listdir(checkpoint) == [rulegen.CHECKPOINT_MANIFEST]
+
+    def test_checkpoint_loader_refuses_foreign_types(self, tmp_path):
+        path = str(tmp_path / "evil.ckpt")
+        with gzip.open(path, "wb") as f:
+            pickle.dump((rulegen._CHECKPOINT_VERSION, None, 0, 0, os.getcwd), f)
+
+        assert rulegen._load_checkpoint(path, None) is None
+
+
+class TestIncremental:
+    """`generate(state_dir=...)` folds an appended tail into the last run."""
+
+    CORPUS = TestShardedScan.CORPUS
+
+    def _outputs(self, outdir):
+        return {p.name: p.read_bytes() for p in sorted(outdir.iterdir())}
+
+    def _split(self, tmp_path):
+        cut = self.CORPUS.index(b"\n", len(self.CORPUS) // 2) + 1
+        head, tail = self.CORPUS[:cut], self.CORPUS[cut:]
+        path = tmp_path / "corpus.txt"
+        path.write_bytes(head)
+        return str(path), tail
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_appended_corpus_matches_a_full_derivation(
+        self, tmp_path, monkeypatch, workers
+    ):
+        monkeypatch.setattr(rulegen, "_MIN_SHARD_BYTES", 1)
+        monkeypatch.setattr(rulegen, "ProcessPoolExecutor", _InlineExecutor)
+        corpus, tail = self._split(tmp_path)
+        state = str(tmp_path / "state")
+        options = dict(print_fn=lambda *a: None, leet_restore=False, workers=workers)
+        first = rulegen.generate(corpus, str(tmp_path / "a"), state_dir=state, **options)
+        assert first["incremental_from"] is None
+        with open(corpus, "ab") as f:
+            f.write(tail)
+        read = []
+        real = rulegen.usable_plaintext
+
+        def record(*args, **kwargs):
+            read.append(args[0])
+            return real(*args, **kwargs)
+
+        monkeypatch.setattr(rulegen, "usable_plaintext", record)
+        messages = []
+        options["print_fn"] = messages.append
+        folded = rulegen.generate(
+            corpus, str(tmp_path / "b"), state_dir=state, **options
+        )
+        monkeypatch.setattr(rulegen, "usable_plaintext", real)
+        full = rulegen.generate(corpus, str(tmp_path / "c"), **options)
+
+        assert folded["incremental_from"] == len(self.CORPUS) - len(tail)
+        assert any("Folding" in m for m in messages)
+        assert len(read) == len(tail.splitlines())
+        assert self._outputs(tmp_path / "b") == self._outputs(tmp_path / "c")
+        assert folded["total"] == full["total"]
+
+    def test_rewritten_prefix_derives_from_scratch(self, tmp_path):
+        corpus, tail = self._split(tmp_path)
+        state = str(tmp_path / "state")
+        options = dict(print_fn=lambda *a: None, workers=1)
+        rulegen.generate(corpus, str(tmp_path / "a"), state_dir=state, **options)
+        with open(corpus, "r+b") as f:
+            f.write(b"X")
+        with open(corpus, "ab") as f:
+            f.write(tail)
+
+        again = rulegen.generate(
+            corpus, str(tmp_path / "b"), state_dir=state, **options
+        )
+        rulegen.generate(corpus, str(tmp_path / "c"), **options)
+
+        assert again["incremental_from"] is None
+        assert self._outputs(tmp_path / "b") == self._outputs(tmp_path / "c")
+
+    def test_unterminated_last_line_derives_from_scratch(self, tmp_path):
+        corpus, tail = self._split(tmp_path)
+        with open(corpus, "ab") as f:
+            f.write(b"quibble")
+        state = str(tmp_path / "state")
+        options = dict(print_fn=lambda *a: None, workers=1)
+        rulegen.generate(corpus, str(tmp_path / "a"), state_dir=state, **options)
+        with open(corpus, "ab") as f:
+            f.write(b"fox\n" + tail)
+
+        again = rulegen.generate(
+            corpus, str(tmp_path / "b"), state_dir=state, **options
+        )
+
+        # The appended bytes finished a line the last run had already counted.
+        assert again["incremental_from"] is None
+
+    def test_state_for_other_options_is_not_folded(self, tmp_path):
+        corpus, tail = self._split(tmp_path)
+        state = str(tmp_path / "state")
+        rulegen.generate(
+            corpus, str(tmp_path / "a"), state_dir=state, print_fn=lambda *a: None
+        )
+        with open(corpus, "ab") as f:
+            f.write(tail)
+
+        again = rulegen.generate(
+            corpus,
+            str(tmp_path / "b"),
+            state_dir=state,
+            ascii_only=True,
+            print_fn=lambda *a: None,
+        )
+
+        assert again["incremental_from"] is None
+
+
+class _InlineExecutor:
+    """ProcessPoolExecutor stand-in that runs tasks in this process, so a
+    monkeypatched module is what the tasks see."""
+
+    def __init__(self, max_workers=None, initializer=None, initargs=()):
+        if initializer is not None:
+            initializer(*initargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def map(self, fn, tasks):
+        return map(fn, list(tasks))
@@ -333,6 +333,67 @@ def test_line_count_and_write_helpers(tmp_path, monkeypatch):
     assert out_unique.read_text().splitlines() == ["2", "b"]
 
 
+def test_line_count_counts_only_appended_bytes(tmp_path, monkeypatch):
+    monkeypatch.setenv("HATE_CRACK_SKIP_INIT", "1")
+    from hate_crack import main as main_module
+
+    monkeypatch.setattr(main_module, "_line_counts", {})
+    out = tmp_path / "hashes.txt.out"
+    out.write_text("h1:a\nh2:b\n")
+    assert main_module.lineCount(str(out)) == 2
+
+    counted_from = []
+    real = main_module._count_newlines
+
+    def spy(f, start, end):
+        counted_from.append(start)
+        return real(f, start, end)
+
+    monkeypatch.setattr(main_module, "_count_newlines", spy)
+    size = out.stat().st_size
+    with open(out, "a") as f:
+        f.write("h3:c\n")
+
+    assert main_module.lineCount(str(out)) == 3
+    assert main_module.lineCount(str(out)) == 3
+    assert counted_from == [size]
+
+
+def test_line_count_recounts_a_rewritten_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("HATE_CRACK_SKIP_INIT", "1")
+    from hate_crack import main as main_module
+
+    monkeypatch.setattr(main_module, "_line_counts", {})
+    out = tmp_path / "hashes.txt.out"
+    out.write_text("h1:a\nh2:b\n")
+    assert main_module.lineCount(str(out)) == 2
+
+    out.write_text("h1:a\n\n\n")
+    assert main_module.lineCount(str(out)) == 3
+    out.write_text("x\n")
+    assert main_module.lineCount(str(out)) == 1
+
+
+def test_line_count_recounts_an_in_place_edit_of_the_same_size(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setenv("HATE_CRACK_SKIP_INIT", "1")
+    from hate_crack import main as main_module
+
+    monkeypatch.setattr(main_module, "_line_counts", {})
+    out = tmp_path / "wordlist.txt"
+    # Longer than the tail lineCount compares, so the edit is outside it.
+    out.write_bytes(b"a\n" * 3000)
+    assert main_module.lineCount(str(out)) == 3000
+
+    mtime = out.stat().st_mtime_ns
+    with open(out, "r+b") as f:
+        f.write(b"aaaa")
+    os.utime(out, ns=(mtime + 5_000_000_000, mtime + 5_000_000_000))
+
+    assert main_module.lineCount(str(out)) == 2998
+
+
 def test_write_delimited_field_last_field_handles_embedded_colons(
     tmp_path, monkeypatch
 ):
@@ -0,0 +1,181 @@
+"""Tests for the persistent wordlist catalog and its consumers."""
+
+import gzip
+import hashlib
+import os
+import types
+
+import pytest
+
+from hate_crack import attack_coverage as ac
+from hate_crack import wordlist_catalog as wc
+from hate_crack.attacks import _wordlist_entry_label
+
+
+@pytest.fixture
+def catalog(tmp_path, monkeypatch):
+    c = wc.WordlistCatalog(tmp_path / "catalog" / "catalog.sqlite3")
+    monkeypatch.setattr(wc, "get_catalog", lambda: c)
+    yield c
+    c.close()
+
+
+@pytest.fixture
+def main_module(hc_module):
+    return hc_module._main
+
+
+def _write(path, data):
+    path.write_bytes(data)
+    return str(path)
+
+
+# --- scan ------------------------------------------------------------------
+
+
+def test_scan_records_lines_lengths_and_content_hash(tmp_path):
+    data = b"alpha\r\nbravo12\n\nlast"
+    path = _write(tmp_path / "wl.txt", data)
+
+    info = wc.scan(path)
+
+    assert info.lines == 3
+    assert info.size == len(data)
+    assert not info.gzip
+    assert info.sha256 == hashlib.sha256(data).hexdigest()
+    assert info.lengths == {5: 1, 7: 1, 0: 1, 4: 1}
+    assert info.longer_than(4) == 2
+
+
+def test_scan_pairs_crlf_split_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(wc, "_READ_CHUNK", 4)
+    path = _write(tmp_path / "wl.txt", b"abc\r\nxy\r\n")
+
+    assert wc.scan(path).lengths == {3: 1, 2: 1}
+
+
+def test_scan_counts_decompressed_lines_but_hashes_disk_bytes(tmp_path):
+    compressed = gzip.compress(b"one\ntwo\nthree\n")
+    path = _write(tmp_path / "wl.txt", compressed)
+
+    info = wc.scan(path)
+
+    assert info.gzip
+    assert info.lines == 3
+    assert info.lengths == {3: 2, 5: 1}
+    assert info.sha256 == hashlib.sha256(compressed).hexdigest()
+
+
+# --- store -----------------------------------------------------------------
+
+
+def test_lookup_serves_only_current_entries(catalog, tmp_path):
+    path = _write(tmp_path / "wl.txt", b"alpha\n")
+    assert catalog.record(wc.scan(path))
+    assert catalog.lookup(path).lines == 1
+
+    os.utime(path, ns=(0, 0))
+
+    assert catalog.lookup(path) is None
+
+
+def test_lookup_never_creates_the_database(tmp_path):
+    db = tmp_path / "catalog" / "catalog.sqlite3"
+    c = wc.WordlistCatalog(db)
+    path = _write(tmp_path / "wl.txt", b"alpha\n")
+
+    assert c.lookup(path) is None
+    assert not db.exists()
+
+
+def test_index_paths_skips_current_entries_and_reports_failures(catalog, tmp_path):
+    a = _write(tmp_path / "a.txt", b"a\nb\n")
+    b = _write(tmp_path / "b.txt", b"c\n")
+    catalog.record(wc.scan(a))
+
+    indexed, current, failed = catalog.index_paths(
+        [a, b, str(tmp_path / "missing.txt")], workers=2
+    )
+
+    assert (indexed, current, failed) == (1, 1, 1)
+    assert catalog.lookup(b).lines == 1
+
+
+def test_iter_wordlist_files_skips_dotfiles_and_excluded(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / ".hidden").mkdir()
+    for rel in ("a.txt", "sub/b.txt", ".hidden/c.txt", ".d.txt", "x.7z"):
+        (tmp_path / rel).write_text("w\n")
+
+    found = wc.iter_wordlist_files(str(tmp_path), exclude_extensions={".7z"})
+
+    assert found == [str(tmp_path / "a.txt"), str(tmp_path / "sub" / "b.txt")]
+
+
+# --- consumers -------------------------------------------------------------
+
+
+def test_coverage_fingerprint_reuses_catalog_hash(catalog, tmp_path, monkeypatch):
+    path = _write(tmp_path / "wl.txt", b"alpha\n")
+    catalog.record(wc.scan(path))
+    monkeypatch.setattr(ac, "_sha256_file", lambda p: pytest.fail("rehashed"))
+    store = ac.CoverageStore(tmp_path / "cov.sqlite3")
+    try:
+        expected = hashlib.sha256(b"alpha\n").hexdigest()
+        assert store.wordlist_fingerprint(path) == expected
+    finally:
+        store.close()
+
+
+def test_keyspace_guard_and_over_long_count_read_the_catalog(
+    main_module, catalog, tmp_path, monkeypatch
+):
+    left = _write(tmp_path / "left.txt", b"a\nb\n")
+    right = _write(tmp_path / "right.txt", b"x" * 40 + b"\nshort\n")
+    catalog.record(wc.scan(left))
+    catalog.record(wc.scan(right))
+    monkeypatch.setattr(main_module, "lineCount", lambda p: pytest.fail("recount"))
+
+    assert main_module._fingerprint_keyspace_guard(left, right, "t", 4)
+    assert not main_module._fingerprint_keyspace_guard(left, right, "t", 3)
+    assert main_module._count_over_long_basewords(right) == 1
+
+
+def test_uncatalogued_gzip_wordlist_counts_as_the_catalog_would(
+    main_module, catalog, tmp_path
+):
+    plain = b"".join(b"word%d\n" % i for i in range(500))
+    path = _write(tmp_path / "wl.txt", gzip.compress(plain))
+    assert main_module.lineCount(path) != 500
+
+    uncatalogued = main_module._wordlist_line_count(path)
+    catalog.record(wc.scan(path))
+
+    assert uncatalogued == main_module._wordlist_line_count(path) == 500
+
+
+def test_wordlist_entries_carry_catalog_line_counts(main_module, catalog, tmp_path):
+    wordlists = tmp_path / "wordlists"
+    (wordlists / "dir").mkdir(parents=True)
+    path = _write(wordlists / "rockyou.txt", b"a\n" * 1500)
+    _write(wordlists / "other.txt", b"b\n")
+    catalog.record(wc.scan(path))
+
+    entries = main_module.list_wordlist_entries(str(wordlists))
+
+    labels = [_wordlist_entry_label(i, e) for i, e in enumerate(entries, start=1)]
+    assert labels == ["1) dir/", "2) other.txt", "3) rockyou.txt (1.5K)"]
+
+
+def test_wordlists_index_command(main_module, catalog, tmp_path, capsys):
+    wordlists = tmp_path / "wordlists"
+    wordlists.mkdir()
+    _write(wordlists / "a.txt", b"a\n")
+    args = types.SimpleNamespace(
+        wordlists_command="index", wordlist_dir=str(wordlists), workers=1
+    )
+
+    assert main_module._run_wordlists_command(args) == 0
+    assert "1 indexed, 0 already current, 0 failed" in capsys.readouterr().out
+    assert main_module._run_wordlists_command(args) == 0
+    assert "0 indexed, 1 already current" in capsys.readouterr().out
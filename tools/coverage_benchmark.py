@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Benchmark coverage membership queries with and without the Bloom prefilter.
+
+Builds a coverage store holding one Dictionary attack's worth of keys -- the
+d3ad0ne+T0XlC pair (~38k rules) over five wordlists, ~191k keys, the scenario
+the attack_coverage module docstring sizes the store by -- and times three
+probes of that size against it:
+
+- ``unseen``: a sixth wordlist's keys, none of them covered. The common case
+  before a new attack, and the one the filter answers without SQLite.
+- ``repeat``: the recorded keys again, all covered. Every key has to be
+  confirmed by the database, so the filter only adds its own cost here.
+- ``mixed``: half of each.
+
+``plain`` is ``covered(keys)``; ``bloom`` is ``covered(keys, target=...)`` with
+the filter already loaded. Both must return the same set; the benchmark checks
+that before reporting.
+
+Usage:
+    python tools/coverage_benchmark.py
+    python tools/coverage_benchmark.py --rules 10000 --wordlists 3 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("HATE_CRACK_SKIP_INIT", "1")
+
+from hate_crack import attack_coverage as ac  # noqa: E402
+
+DEFAULT_RULES = 38_200
+DEFAULT_WORDLISTS = 5
+TARGET = "0" * 64
+
+
+def keys_for(rules, wordlist):
+    fp = f"{wordlist:064x}"
+    return [ac.entry_key(TARGET, "rule", fp, f"$r{i}") for i in range(rules)]
+
+
+def time_best(func, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rules",
+        type=int,
+        default=DEFAULT_RULES,
+        help=f"rule lines per wordlist (default: {DEFAULT_RULES:,})",
+    )
+    parser.add_argument(
+        "--wordlists",
+        type=int,
+        default=DEFAULT_WORDLISTS,
+        help=f"wordlists in the recorded run (default: {DEFAULT_WORDLISTS})",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="runs per probe; best is kept"
+    )
+    args = parser.parse_args()
+
+    recorded = []
+    for wordlist in range(args.wordlists):
+        recorded += keys_for(args.rules, wordlist)
+    unseen = []
+    for wordlist in range(args.wordlists, 2 * args.wordlists):
+        unseen += keys_for(args.rules, wordlist)
+    half = len(recorded) // 2
+    probes = {
+        "unseen": unseen,
+        "repeat": recorded,
+        "mixed": recorded[:half] + unseen[half:],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ac.CoverageStore(os.path.join(tmp, ac.DB_FILENAME))
+        start = time.perf_counter()
+        store.record(recorded, target=TARGET, kind="rule", attack="Dictionary")
+        print(
+            f"recorded {len(recorded):,} keys in "
+            f"{time.perf_counter() - start:.2f}s"
+        )
+        start = time.perf_counter()
+        store.covered(unseen[:1], target=TARGET)
+        print(f"bloom filter built in {time.perf_counter() - start:.2f}s")
+
+        ok = True
+        for label, keys in probes.items():
+            before, expected = time_best(lambda: store.covered(keys), args.repeat)
+            after, got = time_best(
+                lambda: store.covered(keys, target=TARGET), args.repeat
+            )
+            if got != expected:
+                print(f"{label}: MISMATCH -- the filter changed the answer")
+                ok = False
+                continue
+            print(
+                f"{label:<7} {len(keys):>9,} keys  "
+                f"plain {before * 1000:>8.1f} ms  "
+                f"bloom {after * 1000:>8.1f} ms  "
+                f"({before / after:.1f}x)"
+            )
+        store.close()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
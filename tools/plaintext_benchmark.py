@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Benchmark per-line vs. batched plaintext recovery from a corpus.
+
+Compares reading a corpus the way the readers always have -- a text-mode file
+and one ``usable_plaintext`` call per line -- with the bytes-level batch API,
+``iter_usable_plaintexts``. Both must yield the same passwords; the benchmark
+checks that before reporting lines/s for each.
+
+With no path it builds two synthetic corpora and times both: a plain wordlist
+(no colons, the batch fast path) and cracked hashcat output (``hash:plain`` on
+every line, where the hash prefix still has to be undone).
+
+Usage:
+    python tools/plaintext_benchmark.py                    # synthetic corpora
+    python tools/plaintext_benchmark.py rockyou.txt        # a real corpus
+    python tools/plaintext_benchmark.py --lines 5000000 --repeat 5
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from hate_crack.plaintext import iter_usable_plaintexts, usable_plaintext  # noqa: E402
+
+DEFAULT_LINES = 2_000_000
+WORDS = ["password", "summer", "dragon", "monkey", "letmein", "shadow", "acme"]
+
+
+def per_line(path):
+    with open(path, encoding="latin-1") as fh:
+        return [pw for pw in map(usable_plaintext, fh) if pw]
+
+
+def batched(path):
+    with open(path, "rb") as fh:
+        return list(iter_usable_plaintexts(fh))
+
+
+def make_corpus(directory, lines, cracked):
+    """Write a synthetic corpus of *lines* passwords; return its path."""
+    rng = random.Random(0)
+    name = "cracked.out" if cracked else "wordlist.txt"
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="latin-1") as fh:
+        for i in range(lines):
+            word = rng.choice(WORDS)
+            pw = f"{word.capitalize() if i % 3 else word}{rng.randrange(10000)}"
+            if i % 5 == 0:
+                pw += "!"
+            if cracked:
+                digest = hashlib.md5(pw.encode()).hexdigest()
+                fh.write(f"{digest}:{pw}\n")
+            else:
+                fh.write(pw + "\n")
+    return path
+
+
+def time_best(func, path, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def count_lines(path):
+    with open(path, "rb") as fh:
+        return sum(chunk.count(b"\n") for chunk in iter(lambda: fh.read(1 << 20), b""))
+
+
+def bench(label, path, repeat):
+    lines = count_lines(path)
+    before, expected = time_best(per_line, path, repeat)
+    after, got = time_best(batched, path, repeat)
+    if got != expected:
+        print(f"{label}: MISMATCH -- batch yielded different passwords")
+        return False
+    print(
+        f"{label:<10} {lines:>12,} lines  "
+        f"per-line {lines / before:>12,.0f} lines/s  "
+        f"batched {lines / after:>12,.0f} lines/s  "
+        f"({before / after:.1f}x)"
+    )
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="corpus files (default: synthetic)")
+    parser.add_argument(
+        "--lines",
+        type=int,
+        default=DEFAULT_LINES,
+        help=f"lines per synthetic corpus (default: {DEFAULT_LINES:,})",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="runs per reader; best is kept"
+    )
+    args = parser.parse_args()
+
+    ok = True
+    if args.paths:
+        for path in args.paths:
+            ok &= bench(os.path.basename(path), path, args.repeat)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            for cracked in (False, True):
+                path = make_corpus(tmp, args.lines, cracked)
+                label = "cracked" if cracked else "wordlist"
+                ok &= bench(label, path, args.repeat)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())